@@ -0,0 +1,433 @@
+"""
+Headless asyncio prediction server with request micro-batching.
+
+Run from the app directory:
+    python -m api.prediction_server --model poultry_model.pwm --port 8502
+
+Endpoints:
+    POST /predict  JSON object of feature values -> {"prediction": float}
+    GET  /stats    Throughput, latency percentiles and batch sizes
+    GET  /health   {"status": "ok"}
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+import numpy as np
+from config.settings import (
+    MODEL_SAVE_PATH,
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_MAX_BATCH_SIZE,
+    SERVER_MAX_LATENCY_MS
+)
+from models.artifact import ModelArtifact
+from models.inference import CompiledPredictor
+from models.registry import ModelRegistry
+
+MAX_HEADER_BYTES = 64 * 1024
+# Stream buffer limit; above MAX_HEADER_BYTES so oversized headers get a 413 rather than a reset
+STREAM_LIMIT = 2 * MAX_HEADER_BYTES
+MAX_BODY_BYTES = 1024 * 1024
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+def load_predictor(model_name: str = None, directory: str = MODEL_SAVE_PATH) -> CompiledPredictor:
+    """
+    Load a saved model from the model directory as a compiled predictor.
+
+    Args:
+        model_name (str): File name in the directory (default: most recently trained model)
+        directory (str): Model directory
+    """
+    registry = ModelRegistry(directory)
+    if model_name is None:
+        records = registry.list_models(sort_by='mtime')
+        if not records:
+            raise FileNotFoundError(f"No saved models found in {directory}")
+        model_name = records[0]['name']
+
+    saved = registry.load(model_name)
+    if isinstance(saved, ModelArtifact):
+        return saved.predictor
+    if isinstance(saved, dict) and 'data_processor' in saved:
+        return CompiledPredictor.from_model(saved['model'], saved['data_processor'])
+    raise ValueError("Model file does not include a fitted DataProcessor")
+
+
+class LatencyTracker:
+    """Request latencies, batch sizes and throughput over a sliding window."""
+
+    def __init__(self, window: int = 10_000):
+        """Keep the last window latencies and batch sizes."""
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+
+    def record_batch(self, size: int) -> None:
+        """Record the size of a predicted batch."""
+        self.batch_sizes.append(size)
+
+    def record_request(self, latency: float, ok: bool = True) -> None:
+        """Record the latency of one request in seconds."""
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+        self.latencies.append(latency)
+
+    def summary(self) -> dict:
+        """Throughput, latency percentiles in milliseconds and mean batch size."""
+        elapsed = time.perf_counter() - self.started
+        latencies_ms = np.array(self.latencies) * 1000
+        percentiles = (
+            np.percentile(latencies_ms, [50, 90, 95, 99]).tolist()
+            if len(latencies_ms) else [None] * 4
+        )
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'uptime_s': elapsed,
+            'throughput_rps': self.requests / elapsed if elapsed > 0 else 0.0,
+            'latency_ms': dict(zip(['p50', 'p90', 'p95', 'p99'], percentiles)),
+            'mean_batch_size': float(np.mean(self.batch_sizes)) if self.batch_sizes else None,
+            'batches': len(self.batch_sizes)
+        }
+
+
+class MicroBatcher:
+    """
+    Gathers concurrent single-row requests into vectorized batches.
+
+    A batch is predicted as soon as max_batch_size rows are waiting or the
+    first waiting row has been queued for max_latency seconds, whichever
+    comes first.
+    """
+
+    def __init__(self, predictor, max_batch_size: int = SERVER_MAX_BATCH_SIZE,
+                 max_latency: float = SERVER_MAX_LATENCY_MS / 1000, tracker: LatencyTracker = None):
+        """Initialize the batcher; call start() from a running event loop."""
+        if max_batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.tracker = tracker or LatencyTracker()
+        self._queue = None
+        self._task = None
+
+    def start(self) -> None:
+        """Start the background batching task."""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the batching task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def predict(self, row, group=None) -> float:
+        """Queue one feature row (and its group, for per-group models) and wait for its prediction."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((np.asarray(row, dtype=np.float64), group, future))
+        return await future
+
+    async def _run(self) -> None:
+        """Collect queued rows into batches and predict them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_latency
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                self._predict_batch(batch)
+            except Exception:
+                # Retry row by row so one failing request cannot fail the others
+                for item in batch:
+                    try:
+                        self._predict_batch([item])
+                    except Exception as e:
+                        if not item[2].done():
+                            item[2].set_exception(e)
+
+    def _predict_batch(self, batch) -> None:
+        """Predict a list of queued (row, group, future) items and resolve their futures."""
+        rows = np.vstack([row for row, _, _ in batch])
+        if getattr(self.predictor, 'group_column', None):
+            predictions = self.predictor.predict(rows, [group for _, group, _ in batch])
+        else:
+            predictions = self.predictor.predict(rows)
+
+        self.tracker.record_batch(len(batch))
+        for (_, _, future), prediction in zip(batch, predictions):
+            if not future.done():
+                future.set_result(float(prediction))
+
+
+class PredictionServer:
+    """Minimal HTTP/1.1 JSON server in front of a MicroBatcher."""
+
+    def __init__(self, predictor, host: str = SERVER_HOST, port: int = SERVER_PORT,
+                 max_batch_size: int = SERVER_MAX_BATCH_SIZE,
+                 max_latency_ms: float = SERVER_MAX_LATENCY_MS):
+        """Initialize the server; port 0 picks a free port."""
+        self.predictor = predictor
+        self.host = host
+        self.port = port
+        self.tracker = LatencyTracker()
+        self.batcher = MicroBatcher(
+            predictor,
+            max_batch_size=max_batch_size,
+            max_latency=max_latency_ms / 1000,
+            tracker=self.tracker
+        )
+        self._server = None
+
+    async def start(self) -> None:
+        """Start listening and batching."""
+        self.batcher.start()
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=STREAM_LIMIT
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop accepting connections and stop the batcher."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+
+    async def serve_forever(self) -> None:
+        """Start the server and run until cancelled."""
+        await self.start()
+        print(f"Prediction server listening on http://{self.host}:{self.port}")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    def parse_features(self, payload) -> list:
+        """Validate a JSON object of feature values and order it like the model features."""
+        if not isinstance(payload, dict):
+            raise ValueError("Request body must be a JSON object of feature values")
+        missing_cols = [col for col in self.predictor.feature_columns if col not in payload]
+        if missing_cols:
+            raise ValueError(f"Missing required feature columns: {missing_cols}")
+        try:
+            row = [float(payload[col]) for col in self.predictor.feature_columns]
+        except (TypeError, ValueError):
+            raise ValueError("Feature values must be numbers")
+        if not np.all(np.isfinite(row)):
+            raise ValueError("Feature values must be finite numbers")
+        return row
+
+    def parse_group(self, payload):
+        """Group label of a request for per-group models, or None for single models."""
+        group_column = getattr(self.predictor, 'group_column', None)
+        if group_column is None:
+            return None
+        if group_column not in payload:
+            raise ValueError(f"Missing group column: {group_column}")
+        group = payload[group_column]
+        if isinstance(group, bool) or not isinstance(group, (str, int, float)):
+            raise ValueError(f"Group label must be a string or a number: {group_column}")
+        if isinstance(group, float) and not np.isfinite(group):
+            raise ValueError(f"Group label must be finite: {group_column}")
+        return group
+
+    async def _handle_connection(self, reader, writer) -> None:
+        """Serve requests on one connection, honouring keep-alive."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 413, {'error': 'Headers too large'}, keep_alive=False)
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if len(head) > MAX_HEADER_BYTES:
+                    await self._respond(writer, 413, {'error': 'Headers too large'}, keep_alive=False)
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, path, version = lines[0].split(' ', 2)
+                except ValueError:
+                    await self._respond(writer, 400, {'error': 'Malformed request line'}, keep_alive=False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        key, value = line.split(':', 1)
+                        headers[key.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {'error': 'Invalid Content-Length'}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': 'Request body too large'}, keep_alive=False)
+                    break
+                try:
+                    body = await reader.readexactly(length) if length else b''
+                except asyncio.IncompleteReadError:
+                    await self._respond(writer, 400, {'error': 'Request body shorter than Content-Length'},
+                                        keep_alive=False)
+                    break
+
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                status, payload = await self._dispatch(method, path, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> tuple:
+        """Route a request and return (status, JSON payload)."""
+        path = path.split('?', 1)[0]
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/stats':
+            return 200, self.tracker.summary()
+        if path != '/predict':
+            return 404, {'error': f"Unknown path: {path}"}
+        if method != 'POST':
+            return 405, {'error': 'Use POST for /predict'}
+
+        start = time.perf_counter()
+        try:
+            payload = json.loads(body or b'null')
+            row = self.parse_features(payload)
+            group = self.parse_group(payload)
+            prediction = await self.batcher.predict(row, group)
+        except ValueError as e:
+            self.tracker.record_request(time.perf_counter() - start, ok=False)
+            return 400, {'error': str(e)}
+        except Exception as e:
+            self.tracker.record_request(time.perf_counter() - start, ok=False)
+            return 500, {'error': str(e)}
+        self.tracker.record_request(time.perf_counter() - start)
+        return 200, {'prediction': prediction}
+
+    @staticmethod
+    async def _respond(writer, status: int, payload: dict, keep_alive: bool) -> None:
+        """Write a JSON response."""
+        body = json.dumps(payload).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + body
+        )
+        await writer.drain()
+
+
+class PredictionClient:
+    """Keep-alive HTTP client for the prediction server, for tests and local tools."""
+
+    def __init__(self, host: str = SERVER_HOST, port: int = SERVER_PORT):
+        """Initialize a client for host and port; connects on first use."""
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+
+    async def request(self, method: str, path: str, payload=None) -> tuple:
+        """Send one request and return (status, decoded JSON body)."""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self._writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+        )
+        await self._writer.drain()
+
+        head = await self._reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split(' ')[1])
+        headers = {
+            key.strip().lower(): value.strip()
+            for key, value in (line.split(':', 1) for line in lines[1:] if ':' in line)
+        }
+        data = await self._reader.readexactly(int(headers.get('content-length', 0)))
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, json.loads(data) if data else None
+
+    async def predict(self, features: dict) -> float:
+        """Request a prediction for one row of feature values."""
+        status, payload = await self.request('POST', '/predict', features)
+        if status != 200:
+            raise ValueError(payload.get('error', f"Request failed with status {status}"))
+        return payload['prediction']
+
+    async def stats(self) -> dict:
+        """Fetch the server's throughput and latency statistics."""
+        return (await self.request('GET', '/stats'))[1]
+
+    async def close(self) -> None:
+        """Close the connection."""
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._reader = self._writer = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve poultry weight predictions over HTTP")
+    parser.add_argument('--model', default=None, help="Model file name in the model directory (default: newest)")
+    parser.add_argument('--model-dir', default=MODEL_SAVE_PATH, help="Model directory")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--max-batch-size', type=int, default=SERVER_MAX_BATCH_SIZE)
+    parser.add_argument('--max-latency-ms', type=float, default=SERVER_MAX_LATENCY_MS)
+    args = parser.parse_args()
+
+    server = PredictionServer(
+        load_predictor(args.model, args.model_dir),
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_latency_ms=args.max_latency_ms
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
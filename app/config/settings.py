@@ -25,14 +25,39 @@ FEATURE_COLUMNS = [
 
 TARGET_COLUMN = 'Weight'
 
+# Number of CSV rows read per chunk in chunked (out-of-core) processing
+CHUNK_SIZE = 100_000
+
 # Model settings
 TEST_SIZE = 0.2
 RANDOM_STATE = 42
 POLYNOMIAL_DEGREE = 2
+GROUP_MIN_ROWS = 50  # Groups with fewer training rows use the global model in grouped training
+ENSEMBLE_SIZE = 50  # Bootstrap replicas in ensemble training
+COMPACT_METRICS_RTOL = 1e-4  # Largest relative change of a metric accepted from float32 training data
 
 # File paths
 MODEL_SAVE_PATH = "models/saved_models"
 TEMP_DATA_PATH = "temp/data"
+DATASET_STORE_PATH = "temp/datasets"
+BATCH_OUTPUT_MAX_AGE_S = 24 * 3600  # Batch prediction outputs older than this are deleted
+
+# Cache settings
+DATASET_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Memory budget of the shared dataset cache
+DATASET_CACHE_MAX_ENTRIES = 32  # Entry limit of the shared dataset cache, whatever their size
+MODEL_CACHE_SIZE = 4  # Number of loaded models kept in memory by the model registry
+DATASET_STORE_MAX_BYTES = 4 * 1024 * 1024 * 1024  # Disk budget of the memory-mapped dataset store
+DATASET_STORE_BATCH_BYTES = 64 * 1024 * 1024  # Size of the record batches CSV files are streamed into the store in
+
+# Prediction server settings
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8502
+SERVER_MAX_BATCH_SIZE = 64  # Largest number of requests predicted together
+SERVER_MAX_LATENCY_MS = 5.0  # Longest a request waits for others to join its batch
+
+# Profiling settings
+PROFILING_ENABLED = False  # Record stage timings from the start of each session
+PROFILE_MAX_RECORDS = 1000  # Stage records kept per session
 
 # Visualization settings
 THEME_COLORS = {
@@ -43,4 +68,7 @@ THEME_COLORS = {
 }
 
 PLOT_HEIGHT = 500
-PLOT_WIDTH = 800
\ No newline at end of file
+PLOT_WIDTH = 800
+PLOT_MAX_POINTS = 5_000  # Larger line series are downsampled and larger scatter plots use WebGL
+HISTOGRAM_BINS = 50  # Bins of distribution plots, computed server-side
+DENSITY_BINS = 100  # Bins per axis of density heatmaps
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 import streamlit as st
 from config.settings import APP_NAME, APP_ICON, LAYOUT
+from utils.profiling import performance_panel
 
 # Configure the Streamlit page
 st.set_page_config(
@@ -9,6 +10,7 @@ st.set_page_config(
     page_icon=APP_ICON,
     layout=LAYOUT
 )
+performance_panel("Home")
 
 # Main page header
 st.title("🐔 Poultry Weight Predictor")
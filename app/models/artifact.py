@@ -0,0 +1,246 @@
+import json
+import os
+import struct
+import numpy as np
+from config.settings import FEATURE_COLUMNS
+from models.inference import CompiledPredictor, GroupedCompiledPredictor
+from models.model_utils import SufficientStatistics
+
+ARTIFACT_MAGIC = b'PWMODEL1'
+ARTIFACT_VERSION = 1
+ARTIFACT_EXTENSION = '.pwm'
+ARRAY_ALIGNMENT = 64
+
+# Layout: magic (8 bytes) | header length (uint64, little endian) | JSON header |
+# padding | arrays, each starting on a 64-byte boundary relative to the data section.
+
+
+def _align(offset: int) -> int:
+    """Round offset up to the next array alignment boundary."""
+    return -(-offset // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+
+class ModelArtifact:
+    """
+    A model stored as flat arrays plus a small JSON header.
+
+    Holds the scaler mean and scale, the polynomial term exponents, the
+    regression coefficients and intercept (for scaled features) and free-form
+    metadata. Loading needs only NumPy, never unpickles anything and can
+    memory-map the arrays straight from the file.
+    """
+
+    def __init__(self, arrays: dict, metadata: dict = None, feature_columns: list = FEATURE_COLUMNS):
+        """Initialize from a dictionary of named arrays."""
+        missing = [name for name in ('scaler_mean', 'scaler_scale', 'powers', 'coef', 'intercept')
+                   if name not in arrays]
+        if missing:
+            raise ValueError(f"Model artifact is missing arrays: {missing}")
+        self.arrays = arrays
+        self.metadata = metadata or {}
+        self.feature_columns = list(feature_columns)
+        self._predictor = None
+
+    @classmethod
+    def from_model(cls, model, data_processor, metadata: dict = None):
+        """Extract the arrays of a trained model and its fitted DataProcessor."""
+        if not model.is_trained:
+            raise ValueError("Model needs to be trained before saving")
+        if not data_processor.is_fitted:
+            raise ValueError("Scaler not fitted yet. Run preprocess_data first.")
+
+        regressor = model.model.named_steps['regressor']
+        scaler = data_processor.scaler
+        arrays = {
+            'scaler_mean': np.asarray(scaler.mean_, dtype=np.float64),
+            'scaler_scale': np.asarray(scaler.scale_, dtype=np.float64),
+            'powers': np.asarray(model.model.named_steps['poly'].powers_, dtype=np.int64),
+            'coef': np.asarray(regressor.coef_, dtype=np.float64),
+            'intercept': np.array([regressor.intercept_], dtype=np.float64)
+        }
+
+        # Covariance factor and residual variance for prediction intervals
+        uncertainty = getattr(model, 'uncertainty', None)
+        if uncertainty is not None:
+            arrays['uncertainty_factor'] = np.asarray(uncertainty['factor'], dtype=np.float64)
+            arrays['uncertainty_x_mean'] = np.asarray(uncertainty['x_mean'], dtype=np.float64)
+            arrays['uncertainty_scalars'] = np.array(
+                [uncertainty['residual_variance'], uncertainty['dof'], uncertainty['n_samples']],
+                dtype=np.float64
+            )
+
+        # Keep the accumulated statistics so incremental updates can resume
+        statistics = model.statistics
+        if statistics is not None:
+            for name, value in statistics.to_dict().items():
+                arrays[f'statistics_{name}'] = np.atleast_1d(np.asarray(value, dtype=np.float64))
+
+        feature_columns = list(getattr(scaler, 'feature_names_in_', FEATURE_COLUMNS))
+        return cls(arrays, metadata=metadata, feature_columns=feature_columns)
+
+    @classmethod
+    def from_grouped_model(cls, model, data_processor, metadata: dict = None):
+        """
+        Extract the arrays of a trained GroupedPoultryWeightPredictor and its fitted DataProcessor.
+
+        All groups share one artifact: 'coef' holds one row per group plus a
+        last row for the global model, 'intercept' one value per row and
+        'groups' the group labels. The grouping column is kept in the metadata.
+        """
+        if not model.is_trained:
+            raise ValueError("Model needs to be trained before saving")
+        if not data_processor.is_fitted:
+            raise ValueError("Scaler not fitted yet. Run preprocess_data first.")
+
+        scaler = data_processor.scaler
+        arrays = {
+            'scaler_mean': np.asarray(scaler.mean_, dtype=np.float64),
+            'scaler_scale': np.asarray(scaler.scale_, dtype=np.float64),
+            'powers': np.asarray(model.powers, dtype=np.int64),
+            'coef': np.asarray(model.coef, dtype=np.float64),
+            'intercept': np.asarray(model.intercept, dtype=np.float64),
+            'groups': np.asarray(model.groups, dtype=str)
+        }
+        metadata = {**(metadata or {}), 'group_column': model.group_column}
+        feature_columns = list(getattr(scaler, 'feature_names_in_', FEATURE_COLUMNS))
+        return cls(arrays, metadata=metadata, feature_columns=feature_columns)
+
+    @property
+    def is_grouped(self) -> bool:
+        """Whether the artifact holds one model per group."""
+        return 'groups' in self.arrays
+
+    @property
+    def predictor(self) -> CompiledPredictor:
+        """Fused evaluator built from the stored arrays."""
+        if self._predictor is None and self.is_grouped:
+            self._predictor = GroupedCompiledPredictor.from_scaled_parameters(
+                self.arrays['powers'],
+                self.arrays['coef'],
+                self.arrays['intercept'],
+                self.arrays['scaler_mean'],
+                self.arrays['scaler_scale'],
+                self.arrays['groups'],
+                self.metadata['group_column'],
+                feature_columns=self.feature_columns
+            )
+        if self._predictor is None:
+            self._predictor = CompiledPredictor.from_scaled_parameters(
+                self.arrays['powers'],
+                self.arrays['coef'],
+                float(self.arrays['intercept'][0]),
+                self.arrays['scaler_mean'],
+                self.arrays['scaler_scale'],
+                feature_columns=self.feature_columns,
+                uncertainty=self.uncertainty_dict()
+            )
+        return self._predictor
+
+    def save(self, path: str) -> str:
+        """Write the artifact to path."""
+        layout = {}
+        offset = 0
+        arrays = {}
+        for name, array in self.arrays.items():
+            array = np.ascontiguousarray(array)
+            arrays[name] = array
+            offset = _align(offset)
+            layout[name] = {
+                'dtype': array.dtype.str,
+                'shape': list(array.shape),
+                'offset': offset
+            }
+            offset += array.nbytes
+
+        header = json.dumps({
+            'format_version': ARTIFACT_VERSION,
+            'feature_columns': self.feature_columns,
+            'metadata': self.metadata,
+            'arrays': layout
+        }, default=str).encode('utf-8')
+        data_start = _align(len(ARTIFACT_MAGIC) + 8 + len(header))
+
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(ARTIFACT_MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            for name, array in arrays.items():
+                f.seek(data_start + layout[name]['offset'])
+                f.write(array.tobytes())
+        return path
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """
+        Read an artifact written by save().
+
+        Args:
+            path (str): Artifact file path
+            mmap (bool): Memory-map the arrays instead of reading them into memory
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model file not found: {path}")
+
+        with open(path, 'rb') as f:
+            if f.read(len(ARTIFACT_MAGIC)) != ARTIFACT_MAGIC:
+                raise ValueError("Loaded file is not a valid model artifact")
+            (header_length,) = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_length).decode('utf-8'))
+            if header.get('format_version') != ARTIFACT_VERSION:
+                raise ValueError(f"Unsupported model artifact version: {header.get('format_version')}")
+            data_start = _align(len(ARTIFACT_MAGIC) + 8 + header_length)
+            if not mmap:
+                f.seek(data_start)
+                buffer = np.frombuffer(f.read(), dtype=np.uint8)
+
+        if mmap:
+            buffer = np.memmap(path, dtype=np.uint8, mode='r', offset=data_start)
+
+        arrays = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape'], dtype=np.int64))
+            start = spec['offset']
+            raw = buffer[start:start + count * dtype.itemsize]
+            arrays[name] = raw.view(dtype).reshape(spec['shape'])
+
+        return cls(arrays, metadata=header['metadata'], feature_columns=header['feature_columns'])
+
+    def uncertainty_dict(self):
+        """
+        Saved covariance factor and residual variance as in SufficientStatistics.uncertainty.
+
+        Artifacts written before intervals were stored compute them from
+        their saved statistics; without either, None is returned.
+        """
+        if 'uncertainty_factor' not in self.arrays:
+            statistics = self.statistics_dict()
+            if statistics is None:
+                return None
+            return SufficientStatistics.from_dict(statistics).uncertainty(
+                self.arrays['coef'], float(self.arrays['intercept'][0])
+            )
+        residual_variance, dof, n_samples = (float(value) for value in self.arrays['uncertainty_scalars'])
+        return {
+            'factor': self.arrays['uncertainty_factor'],
+            'x_mean': self.arrays['uncertainty_x_mean'],
+            'residual_variance': residual_variance,
+            'dof': dof,
+            'n_samples': n_samples
+        }
+
+    def statistics_dict(self):
+        """Saved sufficient statistics as a dict for SufficientStatistics.from_dict, if any."""
+        if 'statistics_xx' not in self.arrays:
+            return None
+        return {
+            'n_samples': float(self.arrays['statistics_n_samples'][0]),
+            'x_mean': self.arrays['statistics_x_mean'],
+            'y_mean': float(self.arrays['statistics_y_mean'][0]),
+            'xx': self.arrays['statistics_xx'],
+            'xy': self.arrays['statistics_xy'],
+            'yy': float(self.arrays['statistics_yy'][0])
+        }
@@ -0,0 +1,181 @@
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from config.settings import BATCH_OUTPUT_MAX_AGE_S, CHUNK_SIZE, TEMP_DATA_PATH
+from utils.statistics import StreamingStatistics
+
+PREDICTION_COLUMN = 'Predicted_Weight'
+OUTPUT_PREFIX = 'predictions_'
+# Output columns for each bound returned by predict_interval
+INTERVAL_COLUMNS = {
+    'confidence_lower': 'Confidence_Lower',
+    'confidence_upper': 'Confidence_Upper',
+    'prediction_lower': 'Prediction_Lower',
+    'prediction_upper': 'Prediction_Upper'
+}
+
+
+def remove_stale_outputs(directory: str = TEMP_DATA_PATH, max_age_s: float = BATCH_OUTPUT_MAX_AGE_S) -> int:
+    """
+    Delete temporary prediction outputs not modified for max_age_s seconds.
+
+    Outputs of sessions that ended without discarding their result are
+    otherwise never removed.
+
+    Returns:
+        int: Number of files deleted
+    """
+    if not os.path.isdir(directory):
+        return 0
+    cutoff = time.time() - max_age_s
+    removed = 0
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name.startswith(OUTPUT_PREFIX) and name.endswith('.csv'):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+class BatchPredictionEngine:
+    """
+    Chunked batch prediction over CSV files of any size.
+
+    Input rows are read, predicted and appended to an output CSV one chunk
+    at a time, while a preview and running summary statistics are kept in
+    memory. Peak memory depends on the chunk size, not the file size. The
+    engine has no Streamlit dependency and works with any predictor exposing
+    predict() and feature_columns, such as CompiledPredictor. Predictors with
+    a group_column, such as GroupedCompiledPredictor, also get each row's group.
+    With an interval_level, the bounds of predict_interval are added as
+    INTERVAL_COLUMNS.
+    """
+
+    def __init__(self, predictor, chunksize: int = CHUNK_SIZE, preview_rows: int = 100,
+                 interval_level: float = None):
+        """
+        Initialize the engine.
+
+        Args:
+            predictor: Object with predict(DataFrame) and feature_columns
+            chunksize (int): Number of rows read per chunk
+            preview_rows (int): Number of result rows kept for display
+            interval_level (float): Confidence level of the interval columns (default: none)
+        """
+        if chunksize < 1:
+            raise ValueError("Chunk size must be a positive integer")
+        if interval_level is not None and not getattr(predictor, 'has_intervals', False):
+            raise ValueError("This predictor does not support prediction intervals")
+        self.predictor = predictor
+        self.chunksize = chunksize
+        self.preview_rows = preview_rows
+        self.interval_level = interval_level
+
+    def run(self, source, output_path: str = None, progress_callback=None) -> dict:
+        """
+        Predict every row of a CSV and write the results incrementally.
+
+        Rows with missing or non-numeric feature values get a NaN prediction
+        and are counted as invalid instead of aborting the whole file.
+
+        Args:
+            source: Path or file-like object of the input CSV
+            output_path (str): Output CSV path (default: a new temporary file)
+            progress_callback (callable): Called with the number of rows done after each chunk
+
+        Returns:
+            dict: Output path, row counts, preview DataFrame and summary statistics
+        """
+        if output_path is None:
+            os.makedirs(TEMP_DATA_PATH, exist_ok=True)
+            handle, output_path = tempfile.mkstemp(prefix=OUTPUT_PREFIX, suffix='.csv', dir=TEMP_DATA_PATH)
+            os.close(handle)
+        else:
+            output_dir = os.path.dirname(output_path)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+
+        feature_columns = list(self.predictor.feature_columns)
+        group_column = getattr(self.predictor, 'group_column', None)
+        required_columns = feature_columns + ([group_column] if group_column else [])
+        statistics = StreamingStatistics([PREDICTION_COLUMN])
+        previews = []
+        preview_count = 0
+        rows = 0
+        invalid_rows = 0
+        chunks = 0
+
+        try:
+            with open(output_path, 'w', newline='') as output:
+                for chunk in pd.read_csv(source, chunksize=self.chunksize):
+                    if chunk.empty:
+                        continue
+                    missing_cols = [col for col in required_columns if col not in chunk.columns]
+                    if missing_cols:
+                        raise ValueError(f"Missing required columns: {', '.join(missing_cols)}")
+
+                    features = chunk[feature_columns]
+                    non_numeric = [
+                        col for col in feature_columns
+                        if not pd.api.types.is_numeric_dtype(features[col])
+                    ]
+                    if non_numeric:
+                        features = features.copy()
+                        for col in non_numeric:
+                            features[col] = pd.to_numeric(features[col], errors='coerce')
+
+                    if group_column:
+                        predictions = self.predictor.predict(features, chunk[group_column])
+                        chunk[PREDICTION_COLUMN] = predictions
+                    elif self.interval_level is not None:
+                        result = self.predictor.predict_interval(features, self.interval_level)
+                        predictions = result['prediction']
+                        chunk[PREDICTION_COLUMN] = predictions
+                        for key, column in INTERVAL_COLUMNS.items():
+                            chunk[column] = result[key]
+                    else:
+                        predictions = self.predictor.predict(features)
+                        chunk[PREDICTION_COLUMN] = predictions
+
+                    valid = np.isfinite(predictions)
+                    invalid_rows += int((~valid).sum())
+                    # Invalid rows have NaN predictions, which the statistics skip
+                    statistics.update(predictions)
+
+                    chunk.to_csv(output, header=chunks == 0, index=False)
+                    rows += len(chunk)
+                    chunks += 1
+
+                    if preview_count < self.preview_rows:
+                        previews.append(chunk.head(self.preview_rows - preview_count))
+                        preview_count += len(previews[-1])
+
+                    if progress_callback is not None:
+                        progress_callback(rows)
+        except Exception:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+
+        if rows == 0:
+            os.remove(output_path)
+            raise ValueError("Input data cannot be empty")
+
+        return {
+            'output_path': output_path,
+            'rows': rows,
+            'invalid_rows': invalid_rows,
+            'chunks': chunks,
+            'preview': pd.concat(previews, ignore_index=True),
+            'statistics': {
+                'count': int(statistics.count[0]),
+                **statistics.result()[PREDICTION_COLUMN]
+            }
+        }
+
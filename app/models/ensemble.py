@@ -0,0 +1,239 @@
+import os
+import numpy as np
+import pandas as pd
+from config.settings import POLYNOMIAL_DEGREE, ENSEMBLE_SIZE, RANDOM_STATE
+from models.model_utils import (
+    STATISTICS_BLOCK_SIZE,
+    SharedArray,
+    create_process_pool,
+    design_statistics,
+    expand_polynomial,
+    polynomial_powers,
+    shard_bounds,
+    term_names
+)
+
+
+def bootstrap_counts(n_samples: int, seed) -> np.ndarray:
+    """How often each row is drawn in one bootstrap resample of n_samples rows."""
+    rng = np.random.default_rng(seed)
+    return np.bincount(rng.integers(0, n_samples, n_samples), minlength=n_samples)
+
+
+def fit_replicas(X, y, powers, seeds) -> list:
+    """
+    Fit one bootstrap replica per seed.
+
+    A resample is expressed as integer row weights, so the data is never
+    copied: the weighted statistics of the design equal those of the
+    resampled rows. Rows left out of a resample score the replica.
+
+    Returns:
+        list: (coef, intercept, out-of-bag sse, out-of-bag rows, out-of-bag sst) per seed
+    """
+    results = []
+    for seed in seeds:
+        counts = bootstrap_counts(len(y), seed)
+        coef, intercept = design_statistics(X, y, powers, sample_weight=counts).solve()
+
+        oob = np.flatnonzero(counts == 0)
+        sse = 0.0
+        for start in range(0, len(oob), STATISTICS_BLOCK_SIZE):
+            rows = oob[start:start + STATISTICS_BLOCK_SIZE]
+            residuals = y[rows] - (expand_polynomial(X[rows], powers) @ coef + intercept)
+            sse += float(residuals @ residuals)
+        sst = float(np.sum((y[oob] - y[oob].mean()) ** 2)) if len(oob) else 0.0
+        results.append((coef, float(intercept), sse, len(oob), sst))
+    return results
+
+
+def replica_worker(x_descriptor, y_descriptor, powers, seeds) -> list:
+    """Process-pool worker: fit_replicas on the shared training data."""
+    x_shm, X = SharedArray.attach(x_descriptor)
+    y_shm, y = SharedArray.attach(y_descriptor)
+    try:
+        return fit_replicas(X, y, powers, seeds)
+    finally:
+        del X, y
+        x_shm.close()
+        y_shm.close()
+
+
+class BootstrapEnsemble:
+    """
+    Bagged ensemble of polynomial regressions for robustness reporting.
+
+    The training data is copied into shared memory once and the bootstrap
+    replicas are fitted in a process pool; each worker receives only the
+    shared-memory descriptors and a batch of seeds. Replicas are seeded
+    from one SeedSequence, so the ensemble does not depend on n_jobs.
+
+    The replica coefficients are stacked into one matrix. Since every
+    replica is linear in the same design, the ensemble mean is the model
+    with the averaged coefficients, and all replica predictions come from
+    a single matrix product per block of rows.
+    """
+
+    def __init__(self, degree=POLYNOMIAL_DEGREE, n_estimators: int = ENSEMBLE_SIZE,
+                 random_state: int = RANDOM_STATE):
+        """Initialize an untrained ensemble of n_estimators bootstrap replicas."""
+        if n_estimators < 2:
+            raise ValueError("An ensemble needs at least two replicas")
+        self.degree = degree
+        self.n_estimators = n_estimators
+        self.random_state = random_state
+        self.powers = None
+        self.coef = None
+        self.intercept = None
+        self.summary = None
+
+    @property
+    def is_trained(self):
+        """Check if the ensemble is trained."""
+        return self.coef is not None
+
+    def train(self, X_train, y_train, n_jobs=None):
+        """
+        Fit the bootstrap replicas.
+
+        Args:
+            X_train: Scaled feature matrix; float32 input (compact mode) is
+                shared as float32 and expanded to float64 block by block
+            y_train: Target values
+            n_jobs (int): Number of worker processes (default: all cores)
+        """
+        if X_train is None or y_train is None:
+            raise ValueError("Training data cannot be None")
+        if len(X_train) == 0 or len(y_train) == 0:
+            raise ValueError("Training data cannot be empty")
+        if len(X_train) != len(y_train):
+            raise ValueError("Training features and target have different lengths")
+
+        try:
+            X = np.asarray(X_train)
+            if X.dtype != np.float32:
+                X = X.astype(np.float64, copy=False)
+            y = np.asarray(y_train, dtype=np.float64).ravel()
+            print(f"Training {self.n_estimators} bootstrap replicas with data shapes:", X.shape, y.shape)
+
+            powers = polynomial_powers(X.shape[1], self.degree)
+            seeds = np.random.SeedSequence(self.random_state).spawn(self.n_estimators)
+            n_jobs = min(n_jobs or os.cpu_count() or 1, self.n_estimators)
+            if n_jobs == 1:
+                results = fit_replicas(X, y, powers, seeds)
+            else:
+                with SharedArray(X) as shared_X, SharedArray(y) as shared_y:
+                    with create_process_pool(n_jobs) as pool:
+                        futures = [
+                            pool.submit(
+                                replica_worker,
+                                shared_X.descriptor,
+                                shared_y.descriptor,
+                                powers,
+                                seeds[start:stop]
+                            )
+                            for start, stop in shard_bounds(self.n_estimators, n_jobs)
+                        ]
+                        results = [result for future in futures for result in future.result()]
+
+            coef, intercept, sse, oob_rows, sst = zip(*results)
+            sse, oob_rows, sst = np.array(sse), np.array(oob_rows), np.array(sst)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                self.summary = pd.DataFrame({
+                    'replica': np.arange(self.n_estimators),
+                    'oob_rows': oob_rows,
+                    'oob_rmse': np.sqrt(sse / oob_rows),
+                    'oob_r2': np.where(sst > 0, 1 - sse / sst, np.nan)
+                })
+            self.powers = powers
+            self.coef = np.vstack(coef)
+            self.intercept = np.array(intercept)
+            print("Bootstrap ensemble trained successfully")
+            return self
+        except Exception as e:
+            print(f"Error during ensemble training: {str(e)}")
+            raise
+
+    @property
+    def mean_coef(self) -> np.ndarray:
+        """Coefficients of the ensemble mean model."""
+        return self.coef.mean(axis=0)
+
+    @property
+    def mean_intercept(self) -> float:
+        """Intercept of the ensemble mean model."""
+        return float(self.intercept.mean())
+
+    def predict(self, X, return_std: bool = False):
+        """
+        Predict with the ensemble mean, from scaled features.
+
+        Args:
+            X: Scaled feature matrix
+            return_std (bool): Also return the standard deviation of the
+                replica predictions for every row
+
+        Returns:
+            np.ndarray, or tuple (mean, std) if return_std
+        """
+        if not self.is_trained:
+            raise ValueError("Model needs to be trained before making predictions")
+        if X is None or len(X) == 0:
+            raise ValueError("Input data cannot be empty")
+        X = np.asarray(X)
+
+        mean = np.empty(len(X))
+        std = np.empty(len(X)) if return_std else None
+        for start in range(0, len(X), STATISTICS_BLOCK_SIZE):
+            stop = start + STATISTICS_BLOCK_SIZE
+            design = expand_polynomial(X[start:stop], self.powers)
+            if return_std:
+                replicas = design @ self.coef.T + self.intercept
+                mean[start:stop] = replicas.mean(axis=1)
+                std[start:stop] = replicas.std(axis=1, ddof=1)
+            else:
+                mean[start:stop] = design @ self.mean_coef + self.mean_intercept
+        return (mean, std) if return_std else mean
+
+    def evaluate(self, X_test, y_test):
+        """
+        Evaluate the ensemble mean and the spread of its replicas.
+
+        Returns:
+            tuple: (metrics dict, predictions, standard deviation of the replica predictions)
+        """
+        y = np.asarray(y_test, dtype=np.float64).ravel()
+        y_pred, y_std = self.predict(X_test, return_std=True)
+        mse = float(np.mean((y - y_pred) ** 2))
+        total = float(np.sum((y - y.mean()) ** 2))
+        metrics = {
+            'mse': mse,
+            'rmse': float(np.sqrt(mse)),
+            'r2': 1 - mse * len(y) / total if total > 0 else float('nan'),
+            'mean_prediction_std': float(y_std.mean())
+        }
+        return metrics, y_pred, y_std
+
+    def coefficient_summary(self, feature_names) -> pd.DataFrame:
+        """
+        Mean, standard deviation and 95% bootstrap range of every coefficient.
+
+        Terms are named like PolynomialFeatures.get_feature_names_out, most
+        uncertain relative to their size first.
+        """
+        if not self.is_trained:
+            raise ValueError("Model needs to be trained before summarizing coefficients")
+        names = term_names(self.powers, feature_names)
+        lower, upper = np.percentile(self.coef, [2.5, 97.5], axis=0)
+        summary = pd.DataFrame({
+            'term': names,
+            'mean': self.coef.mean(axis=0),
+            'std': self.coef.std(axis=0, ddof=1),
+            'lower': lower,
+            'upper': upper
+        })
+        # The bias column is absorbed by the intercept and always zero
+        summary = summary[self.powers.sum(axis=1) > 0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            relative = summary['std'] / summary['mean'].abs()
+        return summary.iloc[np.argsort(-relative.to_numpy(), kind='stable')].reset_index(drop=True)
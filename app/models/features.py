@@ -0,0 +1,99 @@
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+from config.settings import POLYNOMIAL_DEGREE
+from models.model_utils import (
+    STATISTICS_BLOCK_SIZE,
+    expansion_plan,
+    parse_term,
+    run_expansion,
+    selected_powers,
+    term_names
+)
+
+
+class SelectivePolynomialFeatures(TransformerMixin, BaseEstimator):
+    """
+    Polynomial features restricted to a chosen set of terms.
+
+    A drop-in replacement for PolynomialFeatures in the model pipeline:
+    it exposes powers_, n_output_features_ and get_feature_names_out, so
+    compiled predictors, artifacts and incremental training work unchanged.
+    Only the selected terms are materialized: each term is one product of
+    a lower-order term and a feature column, and lower-order terms that are
+    not selected only exist as temporaries for one block of rows.
+
+    Args:
+        degree (int): Highest total degree of a term
+        interaction_only (bool): Keep only products of distinct features
+        max_power: Highest power of any single feature, as one int, one int
+            per feature, or a dict from feature name to int
+        terms (list): Explicit terms to keep, as exponent rows or names like
+            'Int Temp^2 Feed Intake'
+        feature_names (list): Names used to resolve dicts and term names
+            (default: the column names of the fitted DataFrame)
+    """
+
+    def __init__(self, degree=POLYNOMIAL_DEGREE, interaction_only=False, max_power=None, terms=None,
+                 feature_names=None):
+        self.degree = degree
+        self.interaction_only = interaction_only
+        self.max_power = max_power
+        self.terms = terms
+        self.feature_names = feature_names
+
+    def fit(self, X, y=None):
+        """Select the terms for the columns of X."""
+        n_features = np.shape(X)[1]
+        names = self.feature_names
+        if names is None and hasattr(X, 'columns'):
+            names = [str(col) for col in X.columns]
+        if names is not None and len(names) != n_features:
+            raise ValueError(f"Expected {n_features} feature names, got {len(names)}")
+
+        max_power = self.max_power
+        if isinstance(max_power, dict):
+            if names is None:
+                raise ValueError("Feature names are needed to set maximum powers by name")
+            unknown = [name for name in max_power if name not in names]
+            if unknown:
+                raise ValueError(f"Unknown features in maximum powers: {unknown}")
+            max_power = [max_power.get(name, self.degree) for name in names]
+
+        terms = self.terms
+        if terms is not None:
+            if any(isinstance(term, str) for term in terms):
+                if names is None:
+                    raise ValueError("Feature names are needed to select terms by name")
+                terms = [parse_term(term, names) if isinstance(term, str) else term for term in terms]
+            terms = np.asarray(terms, dtype=np.int64).reshape(-1, n_features)
+
+        self.powers_ = selected_powers(
+            n_features, self.degree, self.interaction_only, max_power, terms
+        )
+        self.n_features_in_ = n_features
+        self.n_output_features_ = len(self.powers_)
+        self._feature_names = names
+        self._steps, self._n_columns = expansion_plan(self.powers_)
+        return self
+
+    def transform(self, X):
+        """Design matrix of the selected terms, computed block by block."""
+        check_is_fitted(self, 'powers_')
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected a feature matrix with {self.n_features_in_} columns")
+
+        design = np.empty((len(X), self.n_output_features_), dtype=np.float64)
+        for start in range(0, len(X), STATISTICS_BLOCK_SIZE):
+            block = X[start:start + STATISTICS_BLOCK_SIZE].astype(np.float64, copy=False)
+            work = run_expansion(block, self._steps, self._n_columns)
+            design[start:start + len(block)] = work[:, :self.n_output_features_]
+        return design
+
+    def get_feature_names_out(self, input_features=None):
+        """Names of the selected terms, like PolynomialFeatures.get_feature_names_out."""
+        check_is_fitted(self, 'powers_')
+        if input_features is None:
+            input_features = self._feature_names or [f"x{i}" for i in range(self.n_features_in_)]
+        return np.asarray(term_names(self.powers_, input_features), dtype=object)
@@ -0,0 +1,242 @@
+import os
+import numpy as np
+import pandas as pd
+from config.settings import POLYNOMIAL_DEGREE, GROUP_MIN_ROWS
+from models.model_utils import (
+    STATISTICS_BLOCK_SIZE,
+    SufficientStatistics,
+    SharedArray,
+    create_process_pool,
+    design_statistics,
+    expand_polynomial,
+    polynomial_powers,
+    shard_statistics
+)
+
+
+def _integral_label(value):
+    """An integral float as an int, so 3.0 and 3 give the same label."""
+    if isinstance(value, (float, np.floating)) and np.isfinite(value) and float(value).is_integer():
+        return int(value)
+    return value
+
+
+def group_labels(groups) -> np.ndarray:
+    """
+    Group labels as strings, so labels read back from a CSV file or an artifact compare equal.
+
+    Integral floats are written as integers: a house column read as float
+    (e.g. because it has missing values) gives "3", like an integer column.
+    """
+    values = pd.Series(groups).to_numpy()
+    if values.dtype.kind == 'f':
+        labels = pd.Series(values).astype(str).to_numpy()
+        integral = np.isfinite(values) & (values == np.round(values)) & (np.abs(values) < 2 ** 63)
+        labels[integral] = values[integral].astype(np.int64).astype(str)
+        return labels
+    if values.dtype == object:
+        values = pd.Series(values).map(_integral_label).to_numpy()
+    return pd.Series(values).astype(str).to_numpy()
+
+
+def partition_by_group(groups) -> tuple:
+    """
+    Order rows so that every group forms one contiguous block.
+
+    Returns:
+        tuple: (order, labels, bounds) where order is the stable row permutation
+        that sorts rows by group, labels the sorted distinct group labels
+        (as strings) and bounds the (start, stop) rows of each group after sorting
+    """
+    codes, labels = pd.factorize(group_labels(groups), sort=True)
+    order = np.argsort(codes, kind='stable')
+    stops = np.cumsum(np.bincount(codes, minlength=len(labels)))
+    starts = stops - np.bincount(codes, minlength=len(labels))
+    return order, np.asarray(labels, dtype=str), list(zip(starts.tolist(), stops.tolist()))
+
+
+class GroupedPoultryWeightPredictor:
+    """
+    One polynomial regression per group, e.g. per house or flock.
+
+    Training sorts the rows by group, so each group is a contiguous slice
+    of a single shared-memory copy of the data, and reduces every group to
+    its own Gram statistics in a process pool. Merging those statistics
+    gives the global model for free. It is used for groups with fewer than
+    min_group_size training rows and for groups unseen during training.
+
+    The coefficients of all groups are stacked into one matrix whose last
+    row is the global model, so prediction routes rows to their group's
+    coefficients with one gather and a row-wise dot product instead of a
+    loop over rows or groups.
+    """
+
+    def __init__(self, group_column: str, degree=POLYNOMIAL_DEGREE, min_group_size: int = GROUP_MIN_ROWS):
+        """Initialize an untrained model for the given grouping column."""
+        if min_group_size < 1:
+            raise ValueError("Minimum group size must be a positive integer")
+        self.group_column = group_column
+        self.degree = degree
+        self.min_group_size = min_group_size
+        self.powers = None
+        self.groups = None
+        self.coef = None
+        self.intercept = None
+        self.group_statistics = None
+        self.summary = None
+
+    @property
+    def is_trained(self):
+        """Check if the model is trained."""
+        return self.coef is not None
+
+    def train(self, X_train, y_train, groups, n_jobs=None):
+        """
+        Train one model per group.
+
+        Args:
+            X_train: Scaled feature matrix
+            y_train: Target values
+            groups: Group label of every row
+            n_jobs (int): Number of worker processes (default: all cores)
+        """
+        if X_train is None or y_train is None or groups is None:
+            raise ValueError("Training data cannot be None")
+        if len(X_train) == 0 or len(y_train) == 0:
+            raise ValueError("Training data cannot be empty")
+        if not len(X_train) == len(y_train) == len(groups):
+            raise ValueError("Training features, target and groups have different lengths")
+
+        try:
+            X = np.asarray(X_train)
+            if X.dtype != np.float32:
+                X = X.astype(np.float64, copy=False)
+            y = np.asarray(y_train, dtype=np.float64).ravel()
+            order, labels, bounds = partition_by_group(groups)
+            print(f"Training {len(labels)} group models with data shapes:", X.shape, y.shape)
+
+            powers = polynomial_powers(X.shape[1], self.degree)
+            n_jobs = n_jobs or os.cpu_count() or 1
+            X, y = X[order], y[order]
+            if n_jobs == 1 or len(bounds) == 1:
+                statistics = [design_statistics(X[start:stop], y[start:stop], powers) for start, stop in bounds]
+            else:
+                with SharedArray(X) as shared_X, SharedArray(y) as shared_y:
+                    del X, y
+                    with create_process_pool(min(n_jobs, len(bounds))) as pool:
+                        # Largest groups first, so the pool is not left waiting on one at the end
+                        futures = {
+                            i: pool.submit(
+                                shard_statistics,
+                                shared_X.descriptor,
+                                shared_y.descriptor,
+                                bounds[i][0],
+                                bounds[i][1],
+                                powers
+                            )
+                            for i in sorted(range(len(bounds)), key=lambda i: bounds[i][0] - bounds[i][1])
+                        }
+                        statistics = [
+                            SufficientStatistics.from_dict(futures[i].result()) for i in range(len(bounds))
+                        ]
+
+            total = SufficientStatistics(len(powers))
+            for group_stats in statistics:
+                total.merge(group_stats)
+            global_coef, global_intercept = total.solve()
+
+            coef = np.empty((len(labels) + 1, len(powers)))
+            intercept = np.empty(len(labels) + 1)
+            coef[-1], intercept[-1] = global_coef, global_intercept
+            rows = []
+            for i, (label, group_stats) in enumerate(zip(labels, statistics)):
+                own_model = group_stats.n_samples >= self.min_group_size
+                if own_model:
+                    coef[i], intercept[i] = group_stats.solve()
+                else:
+                    coef[i], intercept[i] = global_coef, global_intercept
+                metrics = group_stats.metrics(coef[i], intercept[i])
+                rows.append({
+                    'group': label,
+                    'rows': int(group_stats.n_samples),
+                    'model': 'group' if own_model else 'global',
+                    'train_rmse': metrics['rmse'],
+                    'train_r2': metrics['r2']
+                })
+
+            self.powers = powers
+            self.groups = labels
+            self.coef = coef
+            self.intercept = intercept
+            self.group_statistics = dict(zip(labels, statistics))
+            self.summary = pd.DataFrame(rows)
+            n_fallback = int((self.summary['model'] == 'global').sum())
+            print(f"Group models trained successfully ({n_fallback} groups use the global model)")
+            return self
+        except Exception as e:
+            print(f"Error during grouped training: {str(e)}")
+            raise
+
+    def route(self, groups) -> np.ndarray:
+        """Row of the coefficient matrix for each group label; unseen groups get the global model."""
+        if not self.is_trained:
+            raise ValueError("Model needs to be trained before making predictions")
+        index = pd.Index(self.groups).get_indexer(group_labels(groups))
+        index[index < 0] = len(self.groups)
+        return index
+
+    def predict(self, X, groups):
+        """Predict with each row's group model, from scaled features."""
+        if X is None or len(X) == 0:
+            raise ValueError("Input data cannot be empty")
+        if len(X) != len(groups):
+            raise ValueError("Features and groups have different lengths")
+        rows = self.route(groups)
+        X = np.asarray(X)
+
+        predictions = np.empty(len(X))
+        for start in range(0, len(X), STATISTICS_BLOCK_SIZE):
+            stop = start + STATISTICS_BLOCK_SIZE
+            design = expand_polynomial(X[start:stop], self.powers)
+            block = rows[start:stop]
+            predictions[start:stop] = np.einsum('ij,ij->i', design, self.coef[block]) + self.intercept[block]
+        return predictions
+
+    def evaluate(self, X_test, y_test, groups):
+        """
+        Evaluate the model overall and per group.
+
+        Returns:
+            tuple: (metrics dict, DataFrame of rows, mse, rmse and r2 per group, predictions)
+        """
+        y = np.asarray(y_test, dtype=np.float64).ravel()
+        y_pred = self.predict(X_test, groups)
+        residuals = y - y_pred
+        mse = float(np.mean(residuals ** 2))
+        total = float(np.sum((y - y.mean()) ** 2))
+        metrics = {
+            'mse': mse,
+            'rmse': float(np.sqrt(mse)),
+            'r2': 1 - mse * len(y) / total if total > 0 else float('nan')
+        }
+
+        # Per-group sums in one pass each with bincount
+        codes, labels = pd.factorize(group_labels(groups), sort=True)
+        count = np.bincount(codes)
+        sse = np.bincount(codes, weights=residuals ** 2)
+        # Sum of squares around each group's mean, without the cancellation of sum(y²) - sum(y)²/n
+        group_mean = np.bincount(codes, weights=y) / count
+        sst = np.bincount(codes, weights=(y - group_mean[codes]) ** 2)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            per_group = pd.DataFrame({
+                'group': labels,
+                'rows': count,
+                'model': np.where(np.isin(labels, self.groups), 'group', 'global'),
+                'mse': sse / count,
+                'rmse': np.sqrt(sse / count),
+                'r2': np.where(sst > 0, 1 - sse / sst, np.nan)
+            })
+        # Groups that fell back to the global model during training
+        fallback = self.summary.loc[self.summary['model'] == 'global', 'group']
+        per_group.loc[per_group['group'].isin(fallback), 'model'] = 'global'
+        return metrics, per_group, y_pred
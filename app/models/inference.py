@@ -0,0 +1,273 @@
+import numpy as np
+import pandas as pd
+from config.settings import FEATURE_COLUMNS
+from models.grouped import group_labels
+from models.model_utils import expansion_plan, interval_bounds, leverage, run_expansion
+
+# Rows evaluated per block, to bound the size of the temporary design matrix
+INFERENCE_BLOCK_SIZE = 65_536
+
+
+class CompiledPredictor:
+    """
+    Fused NumPy evaluator for a trained PoultryWeightPredictor.
+
+    The StandardScaler's scale is folded into the polynomial coefficients
+    and its mean becomes a single centering step, so a prediction is one
+    subtraction, one term expansion and one dot product over the raw feature
+    matrix instead of scaler, PolynomialFeatures and LinearRegression calls.
+    """
+
+    def __init__(self, powers, coef, intercept, offset, feature_columns=FEATURE_COLUMNS, uncertainty=None):
+        """
+        Initialize the evaluator from raw-space parameters.
+
+        Args:
+            powers: Exponent matrix of the non-constant polynomial terms
+            coef: Coefficients of the terms for centered (unscaled) features
+            intercept (float): Constant term
+            offset: Feature means subtracted before the expansion
+            feature_columns (list): Names of the input features, in order
+            uncertainty (dict): Output of SufficientStatistics.uncertainty for
+                the same terms, enabling predict_interval
+        """
+        self.powers = np.asarray(powers, dtype=np.int64)
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = float(intercept)
+        self.offset = np.asarray(offset, dtype=np.float64)
+        self.feature_columns = list(feature_columns)
+        self.uncertainty = uncertainty
+        if len(self.coef) != len(self.powers):
+            raise ValueError("Number of coefficients does not match number of terms")
+        if self.powers.shape[1] != len(self.feature_columns):
+            raise ValueError("Term exponents do not match the number of features")
+        self._steps, self._n_columns = expansion_plan(self.powers)
+
+    @classmethod
+    def from_model(cls, model, data_processor):
+        """
+        Compile a trained model and its fitted DataProcessor.
+
+        Args:
+            model (PoultryWeightPredictor): Trained model
+            data_processor (DataProcessor): Processor whose scaler the model was trained with
+        """
+        if not model.is_trained:
+            raise ValueError("Model needs to be trained before compiling")
+        if not data_processor.is_fitted:
+            raise ValueError("Scaler not fitted yet. Run preprocess_data first.")
+
+        powers = model.model.named_steps['poly'].powers_
+        regressor = model.model.named_steps['regressor']
+        scaler = data_processor.scaler
+        mean = scaler.mean_ if getattr(scaler, 'mean_', None) is not None else np.zeros(powers.shape[1])
+        scale = scaler.scale_ if getattr(scaler, 'scale_', None) is not None else np.ones(powers.shape[1])
+        return cls.from_scaled_parameters(
+            powers, regressor.coef_, regressor.intercept_, mean, scale,
+            feature_columns=getattr(scaler, 'feature_names_in_', FEATURE_COLUMNS),
+            uncertainty=getattr(model, 'uncertainty', None)
+        )
+
+    @classmethod
+    def from_scaled_parameters(cls, powers, coef, intercept, mean, scale,
+                               feature_columns=FEATURE_COLUMNS, uncertainty=None):
+        """
+        Fold scaler statistics into coefficients fitted on scaled features.
+
+        The uncertainty of the scaled design, if given, is folded the same
+        way: each term of the raw design is its scaled term times a constant.
+        """
+        powers = np.asarray(powers, dtype=np.int64)
+        coef = np.asarray(coef, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+
+        # (x - mean) / scale raised to p equals (x - mean)^p times prod(scale^-p)
+        folded = coef / np.prod(scale[None, :] ** powers, axis=1)
+
+        constant = powers.sum(axis=1) == 0
+        if uncertainty is not None:
+            term_scale = 1 / np.prod(scale[None, :] ** powers[~constant], axis=1)
+            uncertainty = {
+                **uncertainty,
+                'factor': np.asarray(uncertainty['factor'])[:, ~constant] * term_scale,
+                'x_mean': np.asarray(uncertainty['x_mean'])[~constant] / term_scale
+            }
+        return cls(
+            powers[~constant],
+            folded[~constant],
+            float(intercept) + folded[constant].sum(),
+            mean,
+            feature_columns=feature_columns,
+            uncertainty=uncertainty
+        )
+
+    @property
+    def has_intervals(self) -> bool:
+        """Whether predict_interval is available."""
+        return self.uncertainty is not None
+
+    def _as_matrix(self, X) -> np.ndarray:
+        """Select and order the feature columns of X as a float64 matrix."""
+        if isinstance(X, pd.DataFrame):
+            missing_cols = [col for col in self.feature_columns if col not in X.columns]
+            if missing_cols:
+                raise ValueError(f"Missing required feature columns: {missing_cols}")
+            X = X[self.feature_columns].to_numpy(dtype=np.float64)
+        else:
+            X = np.asarray(X, dtype=np.float64)
+            if X.ndim == 1:
+                X = X.reshape(1, -1)
+        if X.ndim != 2 or X.shape[1] != len(self.feature_columns):
+            raise ValueError(f"Expected {len(self.feature_columns)} feature columns")
+        return X
+
+    def design(self, X) -> np.ndarray:
+        """Polynomial design of raw features, centered but not scaled."""
+        X = self._as_matrix(X)
+        return run_expansion(X - self.offset, self._steps, self._n_columns)[:, :len(self.powers)]
+
+    def predict(self, X) -> np.ndarray:
+        """Predict weights for a raw (unscaled) feature matrix or DataFrame."""
+        X = self._as_matrix(X)
+        if len(X) == 0:
+            raise ValueError("Input data cannot be empty")
+
+        predictions = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), INFERENCE_BLOCK_SIZE):
+            block = X[start:start + INFERENCE_BLOCK_SIZE] - self.offset
+            work = run_expansion(block, self._steps, self._n_columns)
+            np.dot(work[:, :len(self.coef)], self.coef, out=predictions[start:start + len(block)])
+        predictions += self.intercept
+        return predictions
+
+    def predict_interval(self, X, level: float = 0.95) -> dict:
+        """
+        Predict weights with confidence and prediction intervals.
+
+        Returns:
+            dict: 'prediction' plus the bounds returned by interval_bounds
+        """
+        if not self.has_intervals:
+            raise ValueError("This model was saved without the statistics needed for intervals")
+        X = self._as_matrix(X)
+        if len(X) == 0:
+            raise ValueError("Input data cannot be empty")
+
+        predictions = np.empty(len(X), dtype=np.float64)
+        row_leverage = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), INFERENCE_BLOCK_SIZE):
+            block = X[start:start + INFERENCE_BLOCK_SIZE] - self.offset
+            work = run_expansion(block, self._steps, self._n_columns)[:, :len(self.coef)]
+            stop = start + len(block)
+            np.dot(work, self.coef, out=predictions[start:stop])
+            row_leverage[start:stop] = leverage(work, self.uncertainty['factor'], self.uncertainty['x_mean'])
+        predictions += self.intercept
+        return {'prediction': predictions, **interval_bounds(predictions, row_leverage, self.uncertainty, level)}
+
+
+class GroupedCompiledPredictor(CompiledPredictor):
+    """
+    Fused evaluator for a GroupedPoultryWeightPredictor.
+
+    Holds one row of folded coefficients per group plus a last row for the
+    global model. Each input row is expanded once and dotted with the row of
+    its group, found with a vectorized label lookup; rows of groups unseen in
+    training use the global model.
+    """
+
+    def __init__(self, powers, coef, intercept, offset, groups, group_column: str,
+                 feature_columns=FEATURE_COLUMNS):
+        """
+        Initialize the evaluator from raw-space parameters.
+
+        Args:
+            powers: Exponent matrix of the non-constant polynomial terms
+            coef: Coefficient matrix with one row per group and a last row for the global model
+            intercept: Constant term of every row of coef
+            offset: Feature means subtracted before the expansion
+            groups: Group labels of the rows of coef, without the global row
+            group_column (str): Name of the column holding the group of each row
+            feature_columns (list): Names of the input features, in order
+        """
+        self.powers = np.asarray(powers, dtype=np.int64)
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.offset = np.asarray(offset, dtype=np.float64)
+        self.groups = pd.Index(group_labels(groups))
+        self.group_column = group_column
+        self.feature_columns = list(feature_columns)
+        self.uncertainty = None
+        if self.coef.shape != (len(self.groups) + 1, len(self.powers)):
+            raise ValueError("Coefficient matrix does not match the groups and terms")
+        if self.powers.shape[1] != len(self.feature_columns):
+            raise ValueError("Term exponents do not match the number of features")
+        self._steps, self._n_columns = expansion_plan(self.powers)
+
+    @classmethod
+    def from_scaled_parameters(cls, powers, coef, intercept, mean, scale, groups, group_column: str,
+                               feature_columns=FEATURE_COLUMNS):
+        """Fold scaler statistics into per-group coefficients fitted on scaled features."""
+        powers = np.asarray(powers, dtype=np.int64)
+        coef = np.asarray(coef, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+
+        folded = coef / np.prod(scale[None, :] ** powers, axis=1)
+        constant = powers.sum(axis=1) == 0
+        return cls(
+            powers[~constant],
+            folded[:, ~constant],
+            np.asarray(intercept, dtype=np.float64) + folded[:, constant].sum(axis=1),
+            mean,
+            groups,
+            group_column,
+            feature_columns=feature_columns
+        )
+
+    @classmethod
+    def from_model(cls, model, data_processor):
+        """Compile a trained GroupedPoultryWeightPredictor and its fitted DataProcessor."""
+        if not model.is_trained:
+            raise ValueError("Model needs to be trained before compiling")
+        if not data_processor.is_fitted:
+            raise ValueError("Scaler not fitted yet. Run preprocess_data first.")
+        scaler = data_processor.scaler
+        return cls.from_scaled_parameters(
+            model.powers, model.coef, model.intercept, scaler.mean_, scaler.scale_,
+            model.groups, model.group_column,
+            feature_columns=getattr(scaler, 'feature_names_in_', FEATURE_COLUMNS)
+        )
+
+    def route(self, groups) -> np.ndarray:
+        """Row of coef for each group label; unseen groups get the global row."""
+        index = self.groups.get_indexer(group_labels(groups))
+        index[index < 0] = len(self.groups)
+        return index
+
+    def predict(self, X, groups=None) -> np.ndarray:
+        """
+        Predict weights for raw (unscaled) features.
+
+        Args:
+            X: Feature matrix, or DataFrame that may also hold group_column
+            groups: Group label of every row (default: X[group_column])
+        """
+        if groups is None:
+            if not isinstance(X, pd.DataFrame) or self.group_column not in X.columns:
+                raise ValueError(f"Missing group column: {self.group_column}")
+            groups = X[self.group_column]
+        X = self._as_matrix(X)
+        if len(X) == 0:
+            raise ValueError("Input data cannot be empty")
+        if len(groups) != len(X):
+            raise ValueError("Features and groups have different lengths")
+        rows = self.route(groups)
+
+        predictions = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), INFERENCE_BLOCK_SIZE):
+            block = X[start:start + INFERENCE_BLOCK_SIZE] - self.offset
+            work = run_expansion(block, self._steps, self._n_columns)[:, :len(self.powers)]
+            index = rows[start:start + len(block)]
+            predictions[start:start + len(block)] = (
+                np.einsum('ij,ij->i', work, self.coef[index]) + self.intercept[index]
+            )
+        return predictions
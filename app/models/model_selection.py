@@ -0,0 +1,159 @@
+import multiprocessing
+import time
+import tracemalloc
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from config.settings import FEATURE_COLUMNS, RANDOM_STATE
+from models.model_utils import (
+    SufficientStatistics,
+    create_process_pool,
+    design_statistics,
+    polynomial_powers
+)
+
+
+def candidate_columns(powers, degree: int, feature_indices) -> np.ndarray:
+    """
+    Design columns of a lower-degree model on a subset of features.
+
+    Every term of a degree-d expansion over a feature subset is also a term
+    of the full maximum-degree expansion, so a candidate is just a column
+    selection of the largest design.
+    """
+    excluded = np.setdiff1d(np.arange(powers.shape[1]), feature_indices)
+    mask = powers.sum(axis=1) <= degree
+    if len(excluded):
+        mask &= powers[:, excluded].sum(axis=1) == 0
+    return np.flatnonzero(mask)
+
+
+def fit_workspace_bytes(n_terms: int) -> int:
+    """Approximate memory of one candidate fit: its Gram sub-block and the solver's scaled copies."""
+    return 4 * n_terms * n_terms * 8
+
+
+def evaluate_candidate(train_stats: dict, validation_stats: dict, columns) -> dict:
+    """
+    Process-pool worker: fit one candidate from its Gram sub-block and score it.
+
+    tracemalloc is process-wide, so the fit's peak memory is only traced in
+    a worker process that nothing else traces. Called in-process (n_jobs=1)
+    or under an active tracer, e.g. the profiler's, the tracer is left
+    alone and the peak is estimated with fit_workspace_bytes.
+    """
+    trace = multiprocessing.parent_process() is not None and not tracemalloc.is_tracing()
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    train = SufficientStatistics.from_dict(train_stats).select(columns)
+    coef, intercept = train.solve()
+    fit_time = time.perf_counter() - start
+    if trace:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    else:
+        peak = fit_workspace_bytes(len(columns))
+
+    validation = SufficientStatistics.from_dict(validation_stats).select(columns)
+    return {
+        'train': train.metrics(coef, intercept),
+        'validation': validation.metrics(coef, intercept),
+        'fit_time_ms': fit_time * 1000,
+        'fit_peak_kb': peak / 1024
+    }
+
+
+def select_polynomial_degree(X, y, degrees=range(1, 5), feature_subsets=None,
+                             feature_names=FEATURE_COLUMNS, validation_size: float = 0.2,
+                             n_jobs: int = None) -> pd.DataFrame:
+    """
+    Rank polynomial degrees (and optionally feature subsets) on a validation split.
+
+    The design is expanded once at the highest requested degree and reduced to
+    training and validation Gram statistics in a single pass. Each candidate
+    then solves on a sub-block of the Gram matrix in a process pool, so lower
+    degrees and feature subsets reuse the terms of the largest expansion.
+
+    Args:
+        X: Scaled feature matrix
+        y: Target values
+        degrees: Polynomial degrees to evaluate
+        feature_subsets: Iterable of feature-name lists to evaluate (default: all features).
+            Pass 'all' to try every non-empty subset.
+        feature_names (list): Names of the columns of X
+        validation_size (float): Fraction of rows held out for scoring
+        n_jobs (int): Number of worker processes (1 evaluates in-process)
+
+    Returns:
+        pd.DataFrame: Leaderboard sorted by validation RMSE
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64).ravel()
+    degrees = sorted(set(int(d) for d in degrees))
+    if not degrees or degrees[0] < 1:
+        raise ValueError("Degrees must be positive integers")
+    if not 0 < validation_size < 1:
+        raise ValueError("Validation size must be between 0 and 1")
+
+    feature_names = list(feature_names)
+    if feature_subsets is None:
+        feature_subsets = [feature_names]
+    elif feature_subsets == 'all':
+        feature_subsets = [
+            list(subset)
+            for size in range(1, len(feature_names) + 1)
+            for subset in combinations(feature_names, size)
+        ]
+    feature_subsets = [list(subset) for subset in feature_subsets]
+    unknown = {name for subset in feature_subsets for name in subset} - set(feature_names)
+    if unknown:
+        raise ValueError(f"Unknown features in subsets: {sorted(unknown)}")
+
+    n_validation = int(round(len(X) * validation_size))
+    if n_validation < 1 or len(X) - n_validation < 2:
+        raise ValueError("Not enough rows for a training/validation split")
+    order = np.random.RandomState(RANDOM_STATE).permutation(len(X))
+    validation_rows, train_rows = order[:n_validation], order[n_validation:]
+
+    powers = polynomial_powers(X.shape[1], degrees[-1])
+    start = time.perf_counter()
+    train_stats = design_statistics(X[train_rows], y[train_rows], powers).to_dict()
+    validation_stats = design_statistics(X[validation_rows], y[validation_rows], powers).to_dict()
+    expansion_time = time.perf_counter() - start
+
+    candidates = []
+    for degree in degrees:
+        for subset in feature_subsets:
+            indices = [feature_names.index(name) for name in subset]
+            candidates.append((degree, subset, candidate_columns(powers, degree, indices)))
+
+    if n_jobs == 1:
+        results = [evaluate_candidate(train_stats, validation_stats, cols) for _, _, cols in candidates]
+    else:
+        with create_process_pool(n_jobs) as pool:
+            futures = [
+                pool.submit(evaluate_candidate, train_stats, validation_stats, cols)
+                for _, _, cols in candidates
+            ]
+            results = [future.result() for future in futures]
+
+    rows = []
+    for (degree, subset, cols), result in zip(candidates, results):
+        rows.append({
+            'degree': degree,
+            'features': ', '.join(subset),
+            'n_terms': len(cols),
+            'val_rmse': result['validation']['rmse'],
+            'val_r2': result['validation']['r2'],
+            'train_rmse': result['train']['rmse'],
+            'fit_time_ms': result['fit_time_ms'],
+            'fit_peak_kb': result['fit_peak_kb'],
+            # Memory a standalone fit would need for its expanded design matrix
+            'design_mb': len(train_rows) * len(cols) * 8 / 1024 ** 2
+        })
+
+    leaderboard = pd.DataFrame(rows).sort_values('val_rmse', kind='stable').reset_index(drop=True)
+    leaderboard.insert(0, 'rank', np.arange(1, len(leaderboard) + 1))
+    leaderboard.attrs['expansion_time_ms'] = expansion_time * 1000
+    return leaderboard
@@ -0,0 +1,576 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations_with_replacement
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+
+# Rows processed per block when accumulating statistics, to bound temporary memory
+STATISTICS_BLOCK_SIZE = 65_536
+
+
+def polynomial_powers(n_features: int, degree: int) -> np.ndarray:
+    """
+    Exponent matrix of a full polynomial expansion including the bias term.
+
+    Rows are ordered like sklearn's PolynomialFeatures.powers_, so designs
+    built with expand_polynomial line up with fitted pipeline coefficients.
+    """
+    if degree < 0:
+        raise ValueError("Polynomial degree must be non-negative")
+    rows = []
+    for d in range(degree + 1):
+        for combo in combinations_with_replacement(range(n_features), d):
+            rows.append(np.bincount(combo, minlength=n_features))
+    return np.array(rows, dtype=np.int64).reshape(-1, n_features)
+
+
+def selected_powers(n_features: int, degree: int, interaction_only: bool = False,
+                    max_power=None, terms=None) -> np.ndarray:
+    """
+    Exponent matrix of a selective polynomial expansion including the bias term.
+
+    Terms are the rows of polynomial_powers(n_features, degree) that pass
+    every given filter, in the same order.
+
+    Args:
+        n_features (int): Number of input features
+        degree (int): Highest total degree of a term
+        interaction_only (bool): Keep only products of distinct features
+        max_power: Highest power of any single feature, as one int or one
+            int per feature
+        terms: Explicit exponent rows to keep (bias is always kept)
+
+    Returns:
+        np.ndarray: Exponent matrix of shape (n_terms, n_features)
+    """
+    powers = polynomial_powers(n_features, degree)
+    keep = np.ones(len(powers), dtype=bool)
+    if interaction_only:
+        keep &= (powers <= 1).all(axis=1)
+    if max_power is not None:
+        limits = np.broadcast_to(np.asarray(max_power, dtype=np.int64), (n_features,))
+        if (limits < 0).any():
+            raise ValueError("Maximum powers must be non-negative")
+        keep &= (powers <= limits).all(axis=1)
+    if terms is not None:
+        terms = np.asarray(terms, dtype=np.int64).reshape(-1, n_features)
+        if (terms < 0).any() or (terms.sum(axis=1) > degree).any():
+            raise ValueError(f"Terms must have non-negative powers and a degree of at most {degree}")
+        wanted = {tuple(term) for term in terms.tolist()}
+        keep &= np.array([tuple(term) in wanted or sum(term) == 0 for term in powers.tolist()])
+    return powers[keep]
+
+
+def term_names(powers, feature_names) -> list:
+    """Names of polynomial terms in the format of PolynomialFeatures.get_feature_names_out."""
+    return [
+        ' '.join(
+            name if power == 1 else f"{name}^{power}"
+            for name, power in zip(feature_names, term) if power > 0
+        ) or '1'
+        for term in np.asarray(powers).tolist()
+    ]
+
+
+def parse_term(name: str, feature_names) -> np.ndarray:
+    """Exponent row of a term named like term_names, e.g. 'Int Temp^2 Feed Intake'."""
+    # Feature names may contain spaces, so match the longest name at each position
+    names = sorted(feature_names, key=len, reverse=True)
+    term = np.zeros(len(feature_names), dtype=np.int64)
+    rest = name.strip()
+    while rest:
+        match = next((feature for feature in names if rest.startswith(feature)), None)
+        if match is None:
+            raise ValueError(f"Unknown feature in term: {name}")
+        rest = rest[len(match):]
+        power = 1
+        if rest.startswith('^'):
+            digits = rest[1:].split(' ', 1)[0]
+            if not digits.isdigit():
+                raise ValueError(f"Invalid power in term: {name}")
+            power = int(digits)
+            rest = rest[1 + len(digits):]
+        term[list(feature_names).index(match)] += power
+        rest = rest.lstrip(' ')
+    return term
+
+
+def expansion_plan(powers) -> tuple:
+    """
+    Plan the computation of polynomial terms from lower-order terms.
+
+    Each step is (target, parent, feature): column target is column parent
+    times feature column. A parent of -1 copies the feature column and a
+    feature of -1 fills the column with ones. Lower-order terms that are not
+    in powers are appended as extra temporary columns.
+
+    Returns:
+        tuple: (steps, n_columns) where n_columns >= len(powers)
+    """
+    powers = np.asarray(powers, dtype=np.int64)
+    positions = {tuple(term): index for index, term in enumerate(powers.tolist())}
+    steps = []
+    planned = set()
+
+    def plan(term):
+        if term in planned:
+            return positions[term]
+        if term not in positions:
+            positions[term] = len(positions)
+        nonzero = [j for j, p in enumerate(term) if p > 0]
+        if not nonzero:
+            steps.append((positions[term], -1, -1))
+        else:
+            last = nonzero[-1]
+            parent = term[:last] + (term[last] - 1,) + term[last + 1:]
+            parent_index = plan(parent) if sum(parent) > 0 else -1
+            steps.append((positions[term], parent_index, last))
+        planned.add(term)
+        return positions[term]
+
+    for term in list(positions):
+        plan(term)
+    return steps, len(positions)
+
+
+def run_expansion(X, steps, n_columns) -> np.ndarray:
+    """Execute an expansion plan over X; returns a column-major work array."""
+    work = np.empty((X.shape[0], n_columns), dtype=np.float64, order='F')
+    for target, parent, feature in steps:
+        if feature < 0:
+            work[:, target] = 1.0
+        elif parent < 0:
+            work[:, target] = X[:, feature]
+        else:
+            np.multiply(work[:, parent], X[:, feature], out=work[:, target])
+    return work
+
+
+def expand_polynomial(X, powers) -> np.ndarray:
+    """
+    Build the polynomial design matrix of X for the given exponent rows.
+
+    Each term is computed from a lower-order term times one feature column,
+    so a degree-d term costs one multiplication instead of d.
+
+    Args:
+        X: Feature matrix of shape (n_samples, n_features)
+        powers: Exponent matrix of shape (n_terms, n_features)
+
+    Returns:
+        np.ndarray: Design matrix of shape (n_samples, n_terms)
+    """
+    X = np.asarray(X, dtype=np.float64)
+    powers = np.asarray(powers, dtype=np.int64)
+    if X.ndim != 2 or X.shape[1] != powers.shape[1]:
+        raise ValueError(f"Expected a feature matrix with {powers.shape[1]} columns")
+    steps, n_columns = expansion_plan(powers)
+    return run_expansion(X, steps, n_columns)[:, :len(powers)]
+
+
+class SufficientStatistics:
+    """
+    Accumulated sufficient statistics of a least-squares fit with intercept.
+
+    Stores the sample count, column means and the centered Gram matrix
+    (X - mean)^T (X - mean) together with the centered X^T y and y^T y.
+    The uncentered Gram matrix and X^T y are recoverable from these, but
+    the centered form stays accurate when batches are merged. Batches can be
+    folded in with update(), combined with merge() and removed again with
+    subtract(); solve() returns the same coefficients as LinearRegression.
+    """
+
+    def __init__(self, n_features: int):
+        """Initialize empty statistics for a design with n_features columns."""
+        self.n_features = n_features
+        self.n_samples = 0.0
+        self.x_mean = np.zeros(n_features)
+        self.y_mean = 0.0
+        self.xx = np.zeros((n_features, n_features))
+        self.xy = np.zeros(n_features)
+        self.yy = 0.0
+
+    @classmethod
+    def from_batch(cls, X, y, sample_weight=None):
+        """Create statistics from a single design matrix and target."""
+        X = np.asarray(X)
+        return cls(X.shape[1]).update(X, y, sample_weight=sample_weight)
+
+    @property
+    def gram(self) -> np.ndarray:
+        """Uncentered Gram matrix X^T X."""
+        return self.xx + self.n_samples * np.outer(self.x_mean, self.x_mean)
+
+    @property
+    def xty(self) -> np.ndarray:
+        """Uncentered cross product X^T y."""
+        return self.xy + self.n_samples * self.x_mean * self.y_mean
+
+    def copy(self):
+        """Return an independent copy of the statistics."""
+        return self.from_dict(self.to_dict())
+
+    def update(self, X, y, sample_weight=None):
+        """Fold a batch of design rows and targets into the statistics."""
+        X = np.asarray(X)
+        y = np.asarray(y, dtype=np.float64).ravel()
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected a design matrix with {self.n_features} columns")
+        if len(X) != len(y):
+            raise ValueError("Design matrix and target have different lengths")
+        if sample_weight is not None:
+            sample_weight = np.asarray(sample_weight, dtype=np.float64).ravel()
+            if len(sample_weight) != len(y):
+                raise ValueError("Sample weights and target have different lengths")
+
+        for start in range(0, len(X), STATISTICS_BLOCK_SIZE):
+            stop = start + STATISTICS_BLOCK_SIZE
+            weights = None if sample_weight is None else sample_weight[start:stop]
+            self.merge(self._block_statistics(X[start:stop], y[start:stop], weights))
+        return self
+
+    def _block_statistics(self, X, y, weights):
+        """Compute centered statistics of one block of rows."""
+        block = SufficientStatistics(self.n_features)
+        X = X.astype(np.float64, copy=False)
+        if weights is None:
+            total = float(len(y))
+        else:
+            total = float(weights.sum())
+        if total <= 0:
+            return block
+
+        block.n_samples = total
+        if weights is None:
+            block.x_mean = X.mean(axis=0)
+            block.y_mean = float(y.mean())
+        else:
+            block.x_mean = weights @ X / total
+            block.y_mean = float(weights @ y / total)
+
+        X_centered = X - block.x_mean
+        y_centered = y - block.y_mean
+        weighted = X_centered if weights is None else X_centered * weights[:, None]
+        block.xx = weighted.T @ X_centered
+        block.xy = weighted.T @ y_centered
+        block.yy = float(y_centered @ (y_centered if weights is None else y_centered * weights))
+        return block
+
+    def merge(self, other):
+        """Combine another set of statistics into this one in place."""
+        if other.n_features != self.n_features:
+            raise ValueError("Cannot merge statistics of different designs")
+        if other.n_samples == 0:
+            return self
+        if self.n_samples == 0:
+            self._assign(other)
+            return self
+
+        n_total = self.n_samples + other.n_samples
+        factor = self.n_samples * other.n_samples / n_total
+        dx = other.x_mean - self.x_mean
+        dy = other.y_mean - self.y_mean
+
+        self.xx = self.xx + other.xx + factor * np.outer(dx, dx)
+        self.xy = self.xy + other.xy + factor * dx * dy
+        self.yy = self.yy + other.yy + factor * dy * dy
+        self.x_mean = self.x_mean + dx * other.n_samples / n_total
+        self.y_mean = self.y_mean + dy * other.n_samples / n_total
+        self.n_samples = n_total
+        return self
+
+    def subtract(self, other):
+        """Return new statistics with the contribution of other removed."""
+        if other.n_features != self.n_features:
+            raise ValueError("Cannot subtract statistics of different designs")
+        remaining = self.n_samples - other.n_samples
+        if remaining <= 0:
+            raise ValueError("Cannot remove all samples from the statistics")
+
+        result = SufficientStatistics(self.n_features)
+        result.n_samples = remaining
+        result.x_mean = (self.n_samples * self.x_mean - other.n_samples * other.x_mean) / remaining
+        result.y_mean = (self.n_samples * self.y_mean - other.n_samples * other.y_mean) / remaining
+
+        factor = remaining * other.n_samples / self.n_samples
+        dx = other.x_mean - result.x_mean
+        dy = other.y_mean - result.y_mean
+        result.xx = self.xx - other.xx - factor * np.outer(dx, dx)
+        result.xy = self.xy - other.xy - factor * dx * dy
+        result.yy = self.yy - other.yy - factor * dy * dy
+        return result
+
+    def select(self, columns):
+        """Return the statistics of a subset of design columns."""
+        columns = np.asarray(columns)
+        result = SufficientStatistics(len(columns))
+        result.n_samples = self.n_samples
+        result.x_mean = self.x_mean[columns]
+        result.y_mean = self.y_mean
+        result.xx = self.xx[np.ix_(columns, columns)]
+        result.xy = self.xy[columns]
+        result.yy = self.yy
+        return result
+
+    def residual_sum_of_squares(self, coef, intercept: float) -> float:
+        """Sum of squared residuals of a linear model over the accumulated rows."""
+        coef = np.asarray(coef, dtype=np.float64)
+        offset = self.y_mean - self.x_mean @ coef - intercept
+        sse = self.yy - 2 * coef @ self.xy + coef @ self.xx @ coef + self.n_samples * offset ** 2
+        return float(max(sse, 0.0))
+
+    def metrics(self, coef, intercept: float) -> dict:
+        """MSE, RMSE and R² of a linear model over the accumulated rows."""
+        sse = self.residual_sum_of_squares(coef, intercept)
+        mse = sse / self.n_samples
+        return {
+            'mse': mse,
+            'rmse': float(np.sqrt(mse)),
+            'r2': 1 - sse / self.yy if self.yy > 0 else float('nan')
+        }
+
+    def solve(self) -> tuple:
+        """
+        Solve the least-squares problem for coefficients and intercept.
+
+        Constant columns (such as the polynomial bias term) get a zero
+        coefficient, matching LinearRegression with fit_intercept=True.
+
+        Returns:
+            tuple: (coef, intercept)
+        """
+        if self.n_samples == 0:
+            raise ValueError("Cannot solve with no accumulated samples")
+
+        coef = np.zeros(self.n_features)
+        scale, active = self._active_columns()
+        if active.any():
+            # Jacobi scaling keeps the normal equations well conditioned
+            s = scale[active]
+            xx = self.xx[np.ix_(active, active)] / np.outer(s, s)
+            xy = self.xy[active] / s
+            coef[active] = np.linalg.lstsq(xx, xy, rcond=None)[0] / s
+
+        intercept = self.y_mean - self.x_mean @ coef
+        return coef, float(intercept)
+
+    def _active_columns(self) -> tuple:
+        """Column norms of the centered design and the mask of non-constant columns."""
+        scale = np.sqrt(np.clip(np.diag(self.xx), 0, None))
+        active = scale > np.finfo(np.float64).eps * max(scale.max(initial=0.0), 1.0)
+        return scale, active
+
+    def uncertainty(self, coef, intercept: float) -> dict:
+        """
+        Covariance factor and residual variance of a fit, for analytic intervals.
+
+        The Jacobi-scaled centered Gram matrix is Cholesky-factored as L L^T
+        and factor = L^-1 D^-1, so for a design row x the squared norm of
+        factor @ (x - x_mean) equals (x - x_mean)^T XX^-1 (x - x_mean), the
+        leverage of x. Constant columns get zero weight. If the Gram matrix
+        is singular, its pseudo-inverse square root is used instead.
+
+        Returns:
+            dict: 'factor', 'x_mean', 'residual_variance', residual degrees
+            of freedom 'dof' and 'n_samples'
+        """
+        if self.n_samples == 0:
+            raise ValueError("Cannot estimate uncertainty with no accumulated samples")
+
+        scale, active = self._active_columns()
+        inverse = np.zeros((0, int(active.sum())))
+        if active.any():
+            s = scale[active]
+            xx = self.xx[np.ix_(active, active)] / np.outer(s, s)
+            try:
+                inverse = np.linalg.inv(np.linalg.cholesky(xx)) / s
+            except np.linalg.LinAlgError:
+                eigenvalues, eigenvectors = np.linalg.eigh(xx)
+                keep = eigenvalues > eigenvalues.max() * len(eigenvalues) * np.finfo(np.float64).eps
+                inverse = (eigenvectors[:, keep] / np.sqrt(eigenvalues[keep])).T / s
+
+        factor = np.zeros((len(inverse), self.n_features))
+        factor[:, active] = inverse
+        # One parameter per independent column plus the intercept
+        dof = self.n_samples - len(inverse) - 1
+        rss = self.residual_sum_of_squares(coef, intercept)
+        return {
+            'factor': factor,
+            'x_mean': self.x_mean.copy(),
+            'residual_variance': rss / dof if dof > 0 else float('nan'),
+            'dof': float(dof),
+            'n_samples': float(self.n_samples)
+        }
+
+    def _assign(self, other) -> None:
+        """Copy every statistic from other."""
+        self.n_samples = other.n_samples
+        self.x_mean = other.x_mean.copy()
+        self.y_mean = other.y_mean
+        self.xx = other.xx.copy()
+        self.xy = other.xy.copy()
+        self.yy = other.yy
+
+    def to_dict(self) -> dict:
+        """Return the statistics as a dictionary of plain arrays and numbers."""
+        return {
+            'n_samples': self.n_samples,
+            'x_mean': self.x_mean.copy(),
+            'y_mean': self.y_mean,
+            'xx': self.xx.copy(),
+            'xy': self.xy.copy(),
+            'yy': self.yy
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Rebuild statistics from the output of to_dict."""
+        stats = cls(len(data['x_mean']))
+        stats.n_samples = float(data['n_samples'])
+        stats.x_mean = np.array(data['x_mean'], dtype=np.float64)
+        stats.y_mean = float(data['y_mean'])
+        stats.xx = np.array(data['xx'], dtype=np.float64)
+        stats.xy = np.array(data['xy'], dtype=np.float64)
+        stats.yy = float(data['yy'])
+        return stats
+
+
+def compare_metrics(reference: dict, candidate: dict, rtol: float) -> dict:
+    """
+    Relative differences between two metric dictionaries, e.g. from evaluate().
+
+    Returns:
+        dict: 'differences' per shared metric and 'within_tolerance', which is
+        True when every difference is at most rtol
+    """
+    differences = {}
+    for name in reference:
+        if name in candidate:
+            scale = max(abs(reference[name]), np.finfo(np.float64).tiny)
+            differences[name] = abs(candidate[name] - reference[name]) / scale
+    return {
+        'differences': differences,
+        'within_tolerance': all(diff <= rtol for diff in differences.values())
+    }
+
+
+def leverage(design, factor, x_mean) -> np.ndarray:
+    """Leverage of each design row, from the factor returned by SufficientStatistics.uncertainty."""
+    return np.square((design - x_mean) @ factor.T).sum(axis=1)
+
+
+def interval_bounds(predictions, leverage, uncertainty: dict, level: float = 0.95) -> dict:
+    """
+    Confidence and prediction intervals around predictions of a least-squares fit.
+
+    The confidence interval bounds the expected weight at each row; the
+    prediction interval also covers the residual noise of a single new
+    observation. Both use Student's t quantile with the residual degrees of
+    freedom, and are computed for all rows at once.
+
+    Args:
+        predictions: Point predictions
+        leverage: Leverage of each row (see leverage())
+        uncertainty (dict): Output of SufficientStatistics.uncertainty
+        level (float): Coverage of the intervals, between 0 and 1
+
+    Returns:
+        dict: 'confidence_lower', 'confidence_upper', 'prediction_lower' and 'prediction_upper'
+    """
+    if not 0 < level < 1:
+        raise ValueError("Interval level must be between 0 and 1")
+    if not uncertainty['dof'] > 0:
+        raise ValueError("Not enough training rows to estimate prediction intervals")
+    # scipy is only needed once intervals are requested
+    from scipy.special import stdtrit
+
+    t = float(stdtrit(uncertainty['dof'], 0.5 + level / 2))
+    base = uncertainty['residual_variance'] * (1 / uncertainty['n_samples'] + np.asarray(leverage))
+    confidence = t * np.sqrt(base)
+    prediction = t * np.sqrt(base + uncertainty['residual_variance'])
+    return {
+        'confidence_lower': predictions - confidence,
+        'confidence_upper': predictions + confidence,
+        'prediction_lower': predictions - prediction,
+        'prediction_upper': predictions + prediction
+    }
+
+
+def design_statistics(X, y, powers, sample_weight=None) -> SufficientStatistics:
+    """Accumulate statistics of the polynomial design of X block by block."""
+    stats = SufficientStatistics(len(powers))
+    for start in range(0, len(X), STATISTICS_BLOCK_SIZE):
+        stop = start + STATISTICS_BLOCK_SIZE
+        weights = None if sample_weight is None else sample_weight[start:stop]
+        stats.update(expand_polynomial(X[start:stop], powers), y[start:stop], sample_weight=weights)
+    return stats
+
+
+class SharedArray:
+    """
+    A NumPy array copied once into shared memory for process-pool workers.
+
+    Workers receive only the small descriptor and attach to the block with
+    attach(), so the data itself is never pickled.
+    """
+
+    def __init__(self, array):
+        """Copy array into a new shared memory block."""
+        array = np.ascontiguousarray(array)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.array = np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf)
+        self.array[...] = array
+        self.descriptor = (self._shm.name, array.shape, array.dtype.str)
+
+    @staticmethod
+    def attach(descriptor) -> tuple:
+        """Attach to a shared array from a worker; returns (shm, array)."""
+        name, shape, dtype = descriptor
+        shm = shared_memory.SharedMemory(name=name)
+        return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+    def close(self) -> None:
+        """Release and unlink the shared memory block."""
+        self.array = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def create_process_pool(n_jobs: int = None) -> ProcessPoolExecutor:
+    """
+    Create a process pool for parallel training.
+
+    Workers are started with spawn rather than fork, since forking the
+    multi-threaded Streamlit server is not safe.
+    """
+    n_jobs = n_jobs or os.cpu_count() or 1
+    return ProcessPoolExecutor(
+        max_workers=n_jobs,
+        mp_context=multiprocessing.get_context('spawn')
+    )
+
+
+def shard_bounds(n_samples: int, n_shards: int) -> list:
+    """Split range(n_samples) into at most n_shards contiguous (start, stop) pairs."""
+    n_shards = max(1, min(n_shards, n_samples))
+    edges = np.linspace(0, n_samples, n_shards + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+def shard_statistics(x_descriptor, y_descriptor, start: int, stop: int, powers) -> dict:
+    """Process-pool worker: statistics of one shard of the shared training data."""
+    x_shm, X = SharedArray.attach(x_descriptor)
+    y_shm, y = SharedArray.attach(y_descriptor)
+    try:
+        return design_statistics(X[start:stop], y[start:stop], powers).to_dict()
+    finally:
+        del X, y
+        x_shm.close()
+        y_shm.close()
@@ -1,20 +1,58 @@
-from sklearn.preprocessing import PolynomialFeatures
-from sklearn.linear_model import LinearRegression
-from sklearn.pipeline import Pipeline
-from sklearn.metrics import mean_squared_error, r2_score
-import joblib
+import itertools
 import os
 import numpy as np
 from config.settings import POLYNOMIAL_DEGREE, MODEL_SAVE_PATH
+from models.model_utils import (
+    SufficientStatistics,
+    interval_bounds,
+    leverage,
+    SharedArray,
+    create_process_pool,
+    design_statistics,
+    shard_bounds,
+    shard_statistics
+)
+
+# Process-wide fit counter: every fit of any model gets a new version
+_fit_versions = itertools.count(1)
 
 class PoultryWeightPredictor:
-    def __init__(self):
-        """Initialize the model pipeline."""
+    def __init__(self, degree=POLYNOMIAL_DEGREE, interaction_only=False, max_power=None, terms=None,
+                 feature_names=None):
+        """
+        Initialize the model pipeline with polynomial features of the given degree.
+        
+        By default every term up to degree is used. Any of interaction_only,
+        max_power or terms switches to a selective expansion with only the
+        chosen terms; see SelectivePolynomialFeatures for their format.
+        feature_names are needed to select terms or powers by feature name.
+        """
+        # scikit-learn is imported on first use, so prediction-only code never pays for it
+        from sklearn.linear_model import LinearRegression
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import PolynomialFeatures
+        
+        self.degree = degree
+        self.selective = bool(interaction_only) or max_power is not None or terms is not None
+        if self.selective:
+            from models.features import SelectivePolynomialFeatures
+            poly = SelectivePolynomialFeatures(
+                degree=degree,
+                interaction_only=interaction_only,
+                max_power=max_power,
+                terms=terms,
+                feature_names=feature_names
+            )
+        else:
+            poly = PolynomialFeatures(degree=degree)
         self.model = Pipeline([
-            ('poly', PolynomialFeatures(degree=POLYNOMIAL_DEGREE)),
+            ('poly', poly),
             ('regressor', LinearRegression())
         ])
         self._is_trained = False
+        self._statistics = None
+        self._uncertainty = None
+        self.version = 0
         
     @property
     def is_trained(self):
@@ -30,13 +68,143 @@ class PoultryWeightPredictor:
             
         try:
             print("Training model with data shapes:", X_train.shape, y_train.shape)
-            self.model.fit(X_train, y_train)
+            design = self.model.named_steps['poly'].fit_transform(X_train)
+            self.model.named_steps['regressor'].fit(design, y_train)
+            # Keep the accumulated statistics so partial_fit can continue from here
+            self._statistics = SufficientStatistics.from_batch(design, y_train)
+            self._store_uncertainty()
             self._is_trained = True
+            self.version = next(_fit_versions)
             print("Model trained successfully")
             return self
         except Exception as e:
             print(f"Error during training: {str(e)}")
             raise
+    
+    def train_parallel(self, X_train, y_train, n_jobs=None, n_shards=None):
+        """
+        Train the model with a map-reduce over row shards in a process pool.
+        
+        X_train and y_train are copied once into shared memory. Each worker
+        expands its shard to the polynomial design in bounded blocks and
+        returns the shard's Gram and X^T y partials; these are merged and
+        solved once. The result matches train() up to floating-point error.
+        
+        Args:
+            X_train: Scaled feature matrix; float32 input (compact mode) is
+                shared as float32 and expanded to float64 block by block
+            y_train: Target values
+            n_jobs (int): Number of worker processes (default: all cores)
+            n_shards (int): Number of row shards (default: n_jobs)
+        """
+        if X_train is None or y_train is None:
+            raise ValueError("Training data cannot be None")
+        if len(X_train) == 0 or len(y_train) == 0:
+            raise ValueError("Training data cannot be empty")
+        if len(X_train) != len(y_train):
+            raise ValueError("Training features and target have different lengths")
+            
+        try:
+            X = np.asarray(X_train)
+            if X.dtype != np.float32:
+                X = X.astype(np.float64, copy=False)
+            y = np.asarray(y_train, dtype=np.float64).ravel()
+            print("Training model in parallel with data shapes:", X.shape, y.shape)
+            
+            poly = self.model.named_steps['poly'].fit(X[:1])
+            powers = poly.powers_
+            n_jobs = n_jobs or os.cpu_count() or 1
+            bounds = shard_bounds(len(X), n_shards or n_jobs)
+            
+            if n_jobs == 1 or len(bounds) == 1:
+                statistics = design_statistics(X, y, powers)
+            else:
+                statistics = SufficientStatistics(len(powers))
+                with SharedArray(X) as shared_X, SharedArray(y) as shared_y:
+                    with create_process_pool(min(n_jobs, len(bounds))) as pool:
+                        futures = [
+                            pool.submit(
+                                shard_statistics,
+                                shared_X.descriptor,
+                                shared_y.descriptor,
+                                start,
+                                stop,
+                                powers
+                            )
+                            for start, stop in bounds
+                        ]
+                        for future in futures:
+                            statistics.merge(SufficientStatistics.from_dict(future.result()))
+            
+            self._statistics = statistics
+            self._set_coefficients(*statistics.solve())
+            self._store_uncertainty()
+            self._is_trained = True
+            self.version = next(_fit_versions)
+            print(f"Model trained successfully on {len(bounds)} shards")
+            return self
+        except Exception as e:
+            print(f"Error during parallel training: {str(e)}")
+            raise
+    
+    @property
+    def statistics(self):
+        """Accumulated sufficient statistics of the polynomial design, if any."""
+        return getattr(self, '_statistics', None)
+    
+    def partial_fit(self, X_batch, y_batch):
+        """
+        Update the model with a new batch of training rows.
+        
+        The batch is expanded to the polynomial design and folded into the
+        accumulated Gram matrix and X^T y, then the coefficients are re-solved.
+        The cost depends on the batch size, not the size of the history.
+        Batches must be scaled with the same fitted DataProcessor as earlier data.
+        """
+        if X_batch is None or y_batch is None:
+            raise ValueError("Training data cannot be None")
+        if len(X_batch) == 0 or len(y_batch) == 0:
+            raise ValueError("Training data cannot be empty")
+        if self._is_trained and self.statistics is None:
+            raise ValueError("Model has no accumulated statistics. Retrain it with train() first")
+            
+        try:
+            poly = self.model.named_steps['poly']
+            if self.statistics is None:
+                design = poly.fit_transform(X_batch)
+                self._statistics = SufficientStatistics(design.shape[1])
+            else:
+                design = poly.transform(X_batch)
+            
+            self._statistics.update(design, y_batch)
+            self._set_coefficients(*self._statistics.solve())
+            self._store_uncertainty()
+            self._is_trained = True
+            self.version = next(_fit_versions)
+            print(f"Model updated with {len(X_batch)} rows ({int(self._statistics.n_samples)} in total)")
+            return self
+        except Exception as e:
+            print(f"Error during incremental training: {str(e)}")
+            raise
+    
+    def _store_uncertainty(self):
+        """Precompute the covariance factor and residual variance used by predict_interval."""
+        regressor = self.model.named_steps['regressor']
+        self._uncertainty = self._statistics.uncertainty(regressor.coef_, regressor.intercept_)
+    
+    @property
+    def uncertainty(self):
+        """Covariance factor and residual variance of the fit, or None for models saved without statistics."""
+        if getattr(self, '_uncertainty', None) is None and self.statistics is not None and self._is_trained:
+            self._store_uncertainty()
+        return getattr(self, '_uncertainty', None)
+    
+    def _set_coefficients(self, coef, intercept):
+        """Install solved coefficients in the regression step of the pipeline."""
+        regressor = self.model.named_steps['regressor']
+        regressor.coef_ = np.asarray(coef, dtype=np.float64)
+        regressor.intercept_ = float(intercept)
+        regressor.n_features_in_ = len(regressor.coef_)
         
     def predict(self, X):
         """Make predictions using the trained model."""
@@ -52,10 +220,35 @@ class PoultryWeightPredictor:
             print(f"Error during prediction: {str(e)}")
             raise
     
+    def predict_interval(self, X, level=0.95):
+        """
+        Predict with confidence and prediction intervals.
+        
+        The intervals come from the covariance factor stored at training
+        time, so they cost one extra matrix product over the design rows.
+        
+        Returns:
+            dict: 'prediction' plus the bounds returned by interval_bounds
+        """
+        if not self._is_trained:
+            raise ValueError("Model needs to be trained before making predictions")
+        if X is None or len(X) == 0:
+            raise ValueError("Input data cannot be empty")
+        uncertainty = self.uncertainty
+        if uncertainty is None:
+            raise ValueError("Model has no accumulated statistics. Retrain it with train() first")
+        
+        design = self.model.named_steps['poly'].transform(X)
+        predictions = self.model.named_steps['regressor'].predict(design)
+        row_leverage = leverage(design, uncertainty['factor'], uncertainty['x_mean'])
+        return {'prediction': predictions, **interval_bounds(predictions, row_leverage, uncertainty, level)}
+    
     def evaluate(self, X_test, y_test):
         """Evaluate the model performance."""
         if not self._is_trained:
             raise ValueError("Model needs to be trained before evaluation")
+        
+        from sklearn.metrics import mean_squared_error, r2_score
             
         try:
             # Make predictions
@@ -113,6 +306,7 @@ class PoultryWeightPredictor:
             # Ensure directory exists
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
             # Save the entire object
+            import joblib
             joblib.dump(self, filepath)
             print(f"Model saved to {filepath}")
         except Exception as e:
@@ -127,6 +321,7 @@ class PoultryWeightPredictor:
             
         try:
             # Load the model
+            import joblib
             model = joblib.load(filepath)
             if not isinstance(model, cls):
                 raise ValueError("Loaded file is not a valid model")
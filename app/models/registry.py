@@ -0,0 +1,303 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from config.settings import MODEL_SAVE_PATH, MODEL_CACHE_SIZE
+from models.artifact import ModelArtifact, ARTIFACT_EXTENSION
+from models.grouped import GroupedPoultryWeightPredictor
+
+INDEX_FILENAME = 'index.json'
+METADATA_SUFFIX = '.meta.json'
+MODEL_EXTENSIONS = ('.joblib', ARTIFACT_EXTENSION)
+
+
+def _json_value(value):
+    """Convert metadata values (NumPy scalars, timestamps) to JSON-friendly types."""
+    if isinstance(value, dict):
+        return {str(k): _json_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_value(v) for v in value]
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Index of saved models with metadata sidecars and a cache of loaded models.
+
+    Every model file (<name>.joblib or a compact <name>.pwm artifact) has a
+    <name>.meta.json sidecar holding its training date, metrics and file
+    fingerprint, and the directory keeps an index.json of all sidecars. Listing, filtering and sorting read only the
+    index, so no model is unpickled until it is actually loaded. Loaded
+    models are kept in a bounded LRU cache that is invalidated when the file
+    changes.
+    """
+
+    def __init__(self, directory: str = MODEL_SAVE_PATH, cache_size: int = MODEL_CACHE_SIZE):
+        """Initialize the registry for a model directory."""
+        if cache_size < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.directory = directory
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> str:
+        """Path of the index file."""
+        return os.path.join(self.directory, INDEX_FILENAME)
+
+    def model_path(self, name: str) -> str:
+        """Path of a model file from its registry name."""
+        return os.path.join(self.directory, name)
+
+    @staticmethod
+    def metadata_path(model_path: str) -> str:
+        """Path of the metadata sidecar of a model file."""
+        return os.path.splitext(model_path)[0] + METADATA_SUFFIX
+
+    def save(self, save_dict: dict, name: str) -> str:
+        """
+        Save a model dictionary with joblib and register it.
+
+        Args:
+            save_dict (dict): Model, data processor and training metadata
+            name (str): File name of the model, e.g. 'poultry_model.joblib'
+
+        Returns:
+            str: Path of the saved model file
+        """
+        if not name.endswith(MODEL_EXTENSIONS):
+            name += MODEL_EXTENSIONS[0]
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.model_path(name)
+        import joblib
+        joblib.dump(save_dict, path)
+
+        metadata = {
+            key: value for key, value in save_dict.items()
+            if key not in ('model', 'data_processor')
+        }
+        self.register(path, metadata)
+        return path
+
+    def save_artifact(self, model, data_processor, name: str, metadata: dict = None) -> str:
+        """
+        Save a model in the compact, pickle-free artifact format and register it.
+
+        Args:
+            model: Trained PoultryWeightPredictor or GroupedPoultryWeightPredictor
+            data_processor (DataProcessor): Processor whose scaler the model was trained with
+            name (str): File name of the model; the .pwm extension is added if missing
+            metadata (dict): Training date, metrics and other JSON-friendly details
+
+        Returns:
+            str: Path of the saved artifact
+        """
+        if name.endswith('.joblib'):
+            name = name[:-len('.joblib')]
+        if not name.endswith(ARTIFACT_EXTENSION):
+            name += ARTIFACT_EXTENSION
+        metadata = _json_value(metadata or {})
+        if isinstance(model, GroupedPoultryWeightPredictor):
+            artifact = ModelArtifact.from_grouped_model(model, data_processor, metadata=metadata)
+        else:
+            artifact = ModelArtifact.from_model(model, data_processor, metadata=metadata)
+        path = artifact.save(self.model_path(name))
+        self.register(path, metadata)
+        return path
+
+    def register(self, path: str, metadata: dict = None) -> dict:
+        """Write the metadata sidecar of an existing model file and add it to the index."""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model file not found: {path}")
+        stat = os.stat(path)
+        # File fields come last, so metadata keys such as 'name' cannot override them
+        record = {
+            **_json_value(metadata or {}),
+            'name': os.path.basename(path),
+            'format': os.path.splitext(path)[1].lstrip('.'),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+            'sha256': file_hash(path)
+        }
+        self._write_json(self.metadata_path(path), record)
+
+        with self._lock:
+            index = self._read_index()
+            index[record['name']] = record
+            self._write_json(self.index_path, index)
+        return record
+
+    def refresh(self) -> dict:
+        """
+        Bring the index in line with the model files in the directory.
+
+        Records of deleted files are dropped and new files are added from
+        their sidecars. Files saved without a sidecar get a record with only
+        file information; they are never unpickled here.
+        """
+        if not os.path.exists(self.directory):
+            return {}
+
+        with self._lock:
+            index = self._read_index()
+            model_files = {
+                f for f in os.listdir(self.directory)
+                if f.endswith(MODEL_EXTENSIONS)
+            }
+            changed = False
+
+            for name in set(index) - model_files:
+                del index[name]
+                changed = True
+
+            for name in model_files:
+                path = self.model_path(name)
+                record = index.get(name)
+                if record is not None and record.get('mtime') == os.stat(path).st_mtime:
+                    continue
+                sidecar = self._read_json(self.metadata_path(path))
+                if sidecar is None or sidecar.get('mtime') != os.stat(path).st_mtime:
+                    stat = os.stat(path)
+                    sidecar = {
+                        **(sidecar or {}),
+                        'name': name,
+                        'format': os.path.splitext(name)[1].lstrip('.'),
+                        'size': stat.st_size,
+                        'mtime': stat.st_mtime
+                    }
+                index[name] = sidecar
+                changed = True
+
+            if changed:
+                self._write_json(self.index_path, index)
+            return index
+
+    def list_models(self, name_contains: str = None, min_r2: float = None,
+                    sort_by: str = 'training_date', descending: bool = True) -> list:
+        """
+        List model records from the index without loading any model.
+
+        Args:
+            name_contains (str): Keep only models whose name contains this text
+            min_r2 (float): Keep only models with at least this test R² score
+            sort_by (str): Record field or training metric to sort by
+            descending (bool): Sort from highest to lowest
+
+        Returns:
+            list: Metadata records (dicts)
+        """
+        records = list(self.refresh().values())
+
+        if name_contains:
+            records = [r for r in records if name_contains.lower() in r['name'].lower()]
+        if min_r2 is not None:
+            records = [
+                r for r in records
+                if (r.get('training_metrics') or {}).get('r2', -np.inf) >= min_r2
+            ]
+
+        def sort_value(record):
+            return record.get(sort_by, (record.get('training_metrics') or {}).get(sort_by))
+
+        # Records missing the field sort last in either direction
+        present = [r for r in records if sort_value(r) is not None]
+        missing = [r for r in records if sort_value(r) is None]
+        return sorted(present, key=sort_value, reverse=descending) + missing
+
+    def load(self, name: str):
+        """
+        Load a saved model, reusing the cached object while the file is unchanged.
+
+        A file whose modification time changed is re-hashed, and reloaded
+        only if its content actually differs.
+        """
+        path = self.model_path(name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model file not found: {path}")
+        stat = os.stat(path)
+
+        with self._lock:
+            entry = self._cache.get(name)
+            if entry is not None:
+                if (entry['mtime'], entry['size']) == (stat.st_mtime, stat.st_size):
+                    self._cache.move_to_end(name)
+                    return entry['model']
+                if entry['size'] == stat.st_size and file_hash(path) == entry['sha256']:
+                    entry['mtime'] = stat.st_mtime
+                    self._cache.move_to_end(name)
+                    return entry['model']
+                del self._cache[name]
+
+        if path.endswith(ARTIFACT_EXTENSION):
+            model = ModelArtifact.load(path)
+        else:
+            # Only pickled models need joblib (and scikit-learn to unpickle them)
+            import joblib
+            model = joblib.load(path)
+
+        with self._lock:
+            self._cache[name] = {
+                'model': model,
+                'mtime': stat.st_mtime,
+                'size': stat.st_size,
+                'sha256': file_hash(path)
+            }
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return model
+
+    def clear_cache(self) -> None:
+        """Drop all cached models."""
+        with self._lock:
+            self._cache.clear()
+
+    def _read_index(self) -> dict:
+        """Read the index file, returning an empty index if it does not exist."""
+        return self._read_json(self.index_path) or {}
+
+    @staticmethod
+    def _read_json(path: str):
+        """Read a JSON file, returning None if it is missing or unreadable."""
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write_json(path: str, data) -> None:
+        """Write JSON atomically so readers never see a partial file."""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_model_registry(directory: str = MODEL_SAVE_PATH) -> ModelRegistry:
+    """Return the process-wide registry for a directory, so its cache survives reruns."""
+    with _registries_lock:
+        if directory not in _registries:
+            _registries[directory] = ModelRegistry(directory)
+        return _registries[directory]
@@ -1,13 +1,20 @@
 import streamlit as st
 import pandas as pd
+import io
+import os
 from utils.data_processor import DataProcessor
-from utils.visualizations import Visualizer
+from utils.cache import DatasetCache, get_dataset_cache, copy_processor
+from utils.dataset_store import get_dataset_store
+from utils.profiling import performance_panel
+from config.settings import CHUNK_SIZE, REQUIRED_COLUMNS, TEMP_DATA_PATH
+
+def dataset_available(entry: dict) -> bool:
+    """Whether a cached entry's dataset is still in the store; pruned ones are processed again."""
+    return entry.get('dataset') is None or entry['dataset'].exists()
 
 def app():
     st.title("📤 Data Upload and Preview")
-    
-    # Initialize objects
-    data_processor = DataProcessor()
+    profiler = performance_panel("Data Upload")
     
     # File upload
     uploaded_file = st.file_uploader(
@@ -16,50 +23,182 @@ def app():
         help="Upload a CSV file containing poultry data"
     )
     
+    # Large files are cleaned chunk by chunk instead of being loaded at once
+    chunked_mode = st.sidebar.checkbox(
+        "Large file mode",
+        value=False,
+        help="Process the file in chunks so memory use does not grow with file size"
+    )
+    chunk_size = st.sidebar.number_input(
+        "Rows per chunk",
+        min_value=1_000,
+        value=CHUNK_SIZE,
+        step=10_000,
+        disabled=not chunked_mode
+    )
+    
+    # Created once there is a file to process, since it loads scikit-learn
     if uploaded_file is not None:
+        data_processor = DataProcessor()
+    
+    if uploaded_file is not None and chunked_mode:
+        try:
+            st.write("File uploaded successfully")
+            st.write(f"Filename: {uploaded_file.name}")
+            
+            # Only a small sample is parsed for the preview
+            preview_df = pd.read_csv(uploaded_file, nrows=5)
+            uploaded_file.seek(0)
+            
+            st.subheader("Raw Data Preview")
+            st.dataframe(preview_df)
+            
+            is_valid, missing_cols = data_processor.validate_columns(preview_df)
+            if not is_valid:
+                st.error(f"Missing required columns: {', '.join(missing_cols)}")
+                st.stop()
+            
+            # Clean the file chunk by chunk into the temp directory
+            file_bytes = uploaded_file.getvalue()
+            cache_key = DatasetCache.make_key(
+                file_bytes,
+                {'mode': 'chunked', 'chunk_size': int(chunk_size), 'is_training': True}
+            )
+            output_path = os.path.join(TEMP_DATA_PATH, f"processed_{cache_key}.csv")
+            
+            def process_in_chunks():
+                with profiler.stage('preprocess', mode='chunked') as stage:
+                    summary = data_processor.preprocess_csv_in_chunks(
+                        io.BytesIO(file_bytes),
+                        output_path,
+                        chunksize=int(chunk_size)
+                    )
+                    stage.set_rows(summary['rows_read'])
+                # The cleaned file is moved into the memory-mapped store; sessions only keep a handle
+                with profiler.stage('parse', rows=summary['rows_written']):
+                    dataset = get_dataset_store().put_csv(cache_key, output_path, float_columns=REQUIRED_COLUMNS)
+                os.remove(output_path)
+                return {
+                    'dataset': dataset,
+                    'data_processor': data_processor,
+                    'summary': summary
+                }
+            
+            with st.spinner("Processing file in chunks..."):
+                entry, cache_hit = get_dataset_cache().get_or_compute(
+                    cache_key, process_in_chunks, validate=dataset_available
+                )
+            summary = entry['summary']
+            dataset = entry['dataset']
+            if cache_hit:
+                st.caption("Loaded processed data from cache")
+            
+            st.subheader("Chunked Processing Summary")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Chunks Processed", summary['chunks'])
+            with col2:
+                st.metric("Rows Kept", summary['rows_written'])
+            with col3:
+                st.metric("Rows Dropped", summary['rows_dropped'])
+            
+            st.subheader("Processed Data Preview")
+            st.dataframe(dataset.head())
+            
+            st.session_state['dataset'] = dataset
+            st.session_state['data_key'] = cache_key
+            st.session_state['data_processor'] = copy_processor(entry)
+            
+            # Accumulated while the chunks were processed, so no extra pass over the data
+            st.subheader("Summary Statistics")
+            st.write(pd.DataFrame(summary['statistics']))
+            st.caption("Medians are approximate, within 1% of the exact value")
+            
+        except Exception as e:
+            st.error(f"Error processing file: {str(e)}")
+            import traceback
+            st.write("Traceback:", traceback.format_exc())
+    
+    elif uploaded_file is not None:
         try:
             # Debug information
             st.write("File uploaded successfully")
             st.write(f"Filename: {uploaded_file.name}")
             
-            # Read the data
-            df = pd.read_csv(uploaded_file)
+            # Identical uploads and settings share one cached, already processed copy
+            file_bytes = uploaded_file.getvalue()
+            cache_key = DatasetCache.make_key(file_bytes, {'mode': 'in_memory', 'is_training': True})
+            
+            def parse_and_process():
+                with profiler.stage('parse') as stage:
+                    df = pd.read_csv(io.BytesIO(file_bytes))
+                    stage.set_rows(len(df))
+                entry = {
+                    'raw_shape': df.shape,
+                    'raw_columns': df.columns.tolist(),
+                    'raw_preview': df.head(),
+                    'raw_dtypes': df.dtypes,
+                    'null_counts': df.isnull().sum()
+                }
+                is_valid, missing_cols = data_processor.validate_columns(df)
+                entry['missing_columns'] = missing_cols
+                if is_valid:
+                    # df is local to this computation, so it can be converted in place
+                    with profiler.stage('preprocess', rows=len(df)):
+                        df_processed = data_processor.preprocess_data(df, fast=True, copy=False)
+                    entry.update({
+                        # The processed frame lives in the memory-mapped store, not in the cache
+                        'dataset': get_dataset_store().put(cache_key, df_processed),
+                        'data_processor': data_processor,
+                        'report': data_processor.preprocessing_report,
+                        'duplicates': int(df_processed.duplicated().sum()),
+                        'description': df_processed.describe()
+                    })
+                return entry
+            
+            entry, cache_hit = get_dataset_cache().get_or_compute(
+                cache_key, parse_and_process, validate=dataset_available
+            )
+            if cache_hit:
+                st.caption("Loaded processed data from cache")
             
             # Debug information
-            st.write(f"Data shape: {df.shape}")
-            st.write("Columns found:", df.columns.tolist())
+            st.write(f"Data shape: {entry['raw_shape']}")
+            st.write("Columns found:", entry['raw_columns'])
             
             # Display raw data preview before processing
             st.subheader("Raw Data Preview")
-            st.dataframe(df.head())
+            st.dataframe(entry['raw_preview'])
             
             # Validate columns
-            is_valid, missing_cols = data_processor.validate_columns(df)
-            
-            if not is_valid:
-                st.error(f"Missing required columns: {', '.join(missing_cols)}")
+            if entry['missing_columns']:
+                st.error(f"Missing required columns: {', '.join(entry['missing_columns'])}")
                 st.stop()
                 
             # Display column information
             st.subheader("Column Information")
-            st.write(df.dtypes)
+            st.write(entry['raw_dtypes'])
             
             # Show number of null values
             st.subheader("Null Values Count")
-            st.write(df.isnull().sum())
+            st.write(entry['null_counts'])
             
-            # Process the data
-            df_processed = data_processor.preprocess_data(df)
+            dataset = entry['dataset']
+            df_processed = dataset.read()
             
             # Debug information
             st.write(f"Processed data shape: {df_processed.shape}")
+            with st.expander("Preprocessing Report"):
+                st.json(entry['report'])
             
             # Display processed data preview
             st.subheader("Processed Data Preview")
             st.dataframe(df_processed.head())
             
-            # Save to session state
-            st.session_state['data'] = df_processed
+            # Session state keeps only a handle; pages memory-map the columns they need
+            st.session_state['dataset'] = dataset
+            st.session_state['data_key'] = cache_key
+            st.session_state['data_processor'] = copy_processor(entry)
             
             # Display basic statistics
             st.subheader("Basic Statistics")
@@ -71,11 +210,11 @@ def app():
             
             with col2:
                 st.metric("Missing Values", df_processed.isnull().sum().sum())
-                st.metric("Duplicate Records", df_processed.duplicated().sum())
+                st.metric("Duplicate Records", entry['duplicates'])
             
             # Display summary statistics
             st.subheader("Summary Statistics")
-            st.write(df_processed.describe())
+            st.write(entry['description'])
             
         except Exception as e:
             st.error(f"Error processing file: {str(e)}")
@@ -1,23 +1,31 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.express as px 
-from utils.data_processor import DataProcessor
 from utils.visualizations import Visualizer
-from config.settings import REQUIRED_COLUMNS
+from utils.outliers import build_outlier_report
+from utils.profiling import performance_panel
+from config.settings import REQUIRED_COLUMNS, PLOT_MAX_POINTS
 
 def app():
     st.title("📊 Data Analysis")
+    profiler = performance_panel("Data Analysis")
     
     # Check if data exists in session state
-    if 'data' not in st.session_state:
+    if 'dataset' not in st.session_state:
         st.error("Please upload data in the Data Upload page first!")
         st.stop()
         
     # Initialize objects
-    data_processor = DataProcessor()
     visualizer = Visualizer()
-    df = st.session_state['data']
+    dataset = st.session_state['dataset']
+    n_rows = len(dataset)
+    
+    def read_columns(columns=None):
+        """Memory-map only the columns a view needs."""
+        try:
+            return dataset.read(columns)
+        except FileNotFoundError:
+            st.error("The uploaded data is no longer available. Please upload it again.")
+            st.stop()
     
     # Sidebar for analysis options
     st.sidebar.subheader("Analysis Options")
@@ -26,16 +34,35 @@ def app():
         ["Time Series Analysis", "Feature Relationships", "Outlier Detection"]
     )
     
+    # Scatter plots of large datasets are drawn with WebGL instead of SVG
+    render_mode = 'webgl' if n_rows > PLOT_MAX_POINTS else 'svg'
+    
     if analysis_type == "Time Series Analysis":
         st.subheader("Weight Progression Over Time")
-        weight_plot = visualizer.plot_weight_over_time(df)
+        df = read_columns(['Weight'])
+        window = None
+        if len(df) > PLOT_MAX_POINTS:
+            # Long series are downsampled; narrowing the window re-renders it from the raw rows
+            window = st.slider(
+                "Zoom window (rows)",
+                min_value=0,
+                max_value=len(df),
+                value=(0, len(df)),
+                help=f"Windows of up to {PLOT_MAX_POINTS:,} rows show every point"
+            )
+        with profiler.stage('plot', rows=len(df), plot='weight_over_time'):
+            weight_plot = visualizer.plot_weight_over_time(df, window=window)
         st.plotly_chart(weight_plot, use_container_width=True)
+        st.caption(f"Figure payload: {visualizer.payload_size(weight_plot) / 1024:.1f} KB")
         
         # Show growth rate
         st.subheader("Growth Rate Analysis")
-        df['Growth Rate'] = df['Weight'].pct_change() * 100
-        growth_plot = visualizer.plot_feature_distribution(df, 'Growth Rate')
+        # Kept out of the stored frame, which is read-only and shared between sessions
+        with profiler.stage('plot', rows=len(df), plot='growth_rate'):
+            growth_df = pd.DataFrame({'Growth Rate': df['Weight'].pct_change() * 100})
+            growth_plot = visualizer.plot_feature_distribution(growth_df, 'Growth Rate')
         st.plotly_chart(growth_plot, use_container_width=True)
+        st.caption(f"Figure payload: {visualizer.payload_size(growth_plot) / 1024:.1f} KB")
         
     elif analysis_type == "Feature Relationships":
         st.subheader("Feature Relationships")
@@ -47,12 +74,26 @@ def app():
         with col2:
             feature_2 = st.selectbox("Select second feature", 
                                    [col for col in REQUIRED_COLUMNS if col != feature_1])
+        df = read_columns([feature_1, feature_2])
         
-        # Create scatter plot
-        fig = px.scatter(df, x=feature_1, y=feature_2, 
-                
-                        title=f"{feature_1} vs {feature_2}")
+        # Binned density keeps the figure small however many rows there are
+        plot_type = st.radio(
+            "Plot type",
+            ["Density heatmap", "Scatter"],
+            index=0 if len(df) > PLOT_MAX_POINTS else 1,
+            horizontal=True
+        )
+        if plot_type == "Density heatmap":
+            with profiler.stage('plot', rows=len(df), plot='feature_density'):
+                fig = visualizer.plot_density_heatmap(df, feature_1, feature_2)
+        else:
+            with profiler.stage('plot', rows=len(df), plot='feature_scatter'):
+                import plotly.express as px
+                fig = px.scatter(df, x=feature_1, y=feature_2,
+                                 title=f"{feature_1} vs {feature_2}",
+                                 render_mode=render_mode)
         st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"Figure payload: {visualizer.payload_size(fig) / 1024:.1f} KB")
         
         # Show correlation coefficient
         correlation = df[feature_1].corr(df[feature_2])
@@ -61,11 +102,37 @@ def app():
     else:  # Outlier Detection
         st.subheader("Outlier Detection")
         
-        # Select feature for outlier detection
-        feature = st.selectbox("Select feature to detect outliers", REQUIRED_COLUMNS)
+        # Outliers of every column are computed once per dataset, so changing
+        # the selection below only looks up precomputed flags
+        df = read_columns(REQUIRED_COLUMNS)
+        cached_report = st.session_state.get('outlier_report')
+        if cached_report is None or cached_report[0] != dataset.key:
+            with profiler.stage('outliers', rows=len(df)):
+                cached_report = (dataset.key, build_outlier_report(df, REQUIRED_COLUMNS))
+            st.session_state['outlier_report'] = cached_report
+        report = cached_report[1]
         
-        # Detect outliers
-        outliers = data_processor.detect_outliers(df, feature)
+        method = st.radio(
+            "Detection method",
+            ["Per feature (IQR)", "Multivariate (Mahalanobis)"],
+            horizontal=True
+        )
+        
+        if method == "Per feature (IQR)":
+            # Select feature for outlier detection
+            feature = st.selectbox("Select feature to detect outliers", REQUIRED_COLUMNS)
+            outliers = report['flags'][feature]
+            y_values, title = df[feature], f"Outliers in {feature}"
+        else:
+            alpha = st.select_slider(
+                "Significance level",
+                options=[0.1, 0.05, 0.01, 0.001, 0.0001],
+                value=0.001,
+                help="Rows whose combination of values is this unlikely are flagged"
+            )
+            threshold = report['detector'].threshold(alpha)
+            outliers = report['distances'] > threshold
+            y_values, title = report['distances'], "Multivariate Outliers (Mahalanobis Distance²)"
         
         # Show statistics
         col1, col2 = st.columns(2)
@@ -75,20 +142,29 @@ def app():
             st.metric("Percentage of Outliers", f"{(outliers.sum()/len(df))*100:.2f}%")
         
         # Plot with outliers highlighted
-        fig = px.scatter(
-            df,
-            x=df.index,
-            y=feature,
-            color=outliers,
-            title=f"Outliers in {feature}",
-            color_discrete_map={True: "red", False: "blue"}
-        )
+        with profiler.stage('plot', rows=len(df), plot='outliers'):
+            import plotly.express as px
+            fig = px.scatter(
+                x=df.index,
+                y=y_values,
+                color=outliers,
+                title=title,
+                labels={'x': 'index', 'y': y_values.name, 'color': 'Outlier'},
+                color_discrete_map={True: "red", False: "blue"},
+                render_mode=render_mode
+            )
+            if method != "Per feature (IQR)":
+                fig.add_hline(y=threshold, line_dash='dash', annotation_text=f"α = {alpha}")
         st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"Figure payload: {visualizer.payload_size(fig) / 1024:.1f} KB")
+        
+        with st.expander("Outliers in all features"):
+            st.dataframe(report['bounds'].assign(outliers=report['flags'].sum()))
     
     # Download analyzed data
     st.sidebar.markdown("---")
     if st.sidebar.button("Download Analyzed Data"):
-        csv = df.to_csv(index=False)
+        csv = read_columns().to_csv(index=False)
         st.sidebar.download_button(
             label="Download CSV",
             data=csv,
@@ -1,31 +1,53 @@
 import streamlit as st
 import pandas as pd
 import os
-import joblib
-from utils.data_processor import DataProcessor, FEATURE_COLUMNS
+from utils.data_processor import DataProcessor
 from utils.visualizations import Visualizer
+from utils.cache import get_dataset_cache, copy_processor
+from utils.dataset_store import get_dataset_store
+from utils.profiling import performance_panel
 from models.polynomial_regression import PoultryWeightPredictor
-from config.settings import MODEL_SAVE_PATH
+from models.registry import get_model_registry
+from models.model_selection import select_polynomial_degree
+from models.cross_validation import cross_validate_polynomial
+from models.grouped import GroupedPoultryWeightPredictor
+from models.ensemble import BootstrapEnsemble
+from models.model_utils import polynomial_powers, selected_powers, term_names
+from config.settings import (
+    POLYNOMIAL_DEGREE, GROUP_MIN_ROWS, ENSEMBLE_SIZE, FEATURE_COLUMNS, REQUIRED_COLUMNS, TARGET_COLUMN
+)
 
 def app():
     st.title("🎯 Model Training")
+    profiler = performance_panel("Model Training")
     
     # Check if data exists in session state
-    if 'data' not in st.session_state:
+    if 'dataset' not in st.session_state:
         st.error("Please upload data in the Data Upload page first!")
         st.stop()
     
     # Initialize objects
     data_processor = DataProcessor()
     visualizer = Visualizer()
-    model = PoultryWeightPredictor()
     
-    # Get data
-    df = st.session_state['data']
+    # Memory-map the columns used for training from the dataset store
+    dataset = st.session_state['dataset']
+    try:
+        df = dataset.read(REQUIRED_COLUMNS)
+    except FileNotFoundError:
+        st.error("The uploaded data is no longer available. Please upload it again.")
+        st.stop()
     
-    # Preprocess data first
+    # Preprocess data first, unless the upload page already cached the processed frame
     try:
-        df_processed = data_processor.preprocess_data(df)
+        cached_entry = get_dataset_cache().get(dataset.key)
+        if cached_entry is not None and cached_entry.get('dataset') is not None:
+            df_processed = df
+            data_processor = copy_processor(cached_entry)
+        else:
+            # Frames read from the dataset store are read-only views, so let preprocessing copy
+            with profiler.stage('preprocess', rows=len(df)):
+                df_processed = data_processor.preprocess_data(df, fast=True, copy=True)
         st.success(f"Data preprocessed successfully: {df_processed.shape[0]} rows")
         
         # Save data_processor in session state for predictions
@@ -51,6 +73,73 @@ def app():
         help="Proportion of dataset to include in the test split"
     )
     
+    degree = st.sidebar.number_input(
+        "Polynomial Degree",
+        min_value=1,
+        max_value=6,
+        value=st.session_state.get('selected_degree', POLYNOMIAL_DEGREE),
+        help="Degree of the polynomial features; use Model Selection below to compare degrees"
+    )
+    
+    # Selective expansion keeps only the chosen terms, so high degrees stay affordable
+    selective = st.sidebar.checkbox(
+        "Selective expansion",
+        value=False,
+        help="Generate only some of the polynomial terms instead of every term up to the degree"
+    )
+    expansion_options = {}
+    if selective:
+        interaction_only = st.sidebar.checkbox(
+            "Interaction terms only",
+            value=False,
+            help="Keep only products of distinct features, such as Int Temp × Feed Intake"
+        )
+        max_power = st.sidebar.number_input(
+            "Maximum power per feature",
+            min_value=1,
+            max_value=int(degree),
+            value=int(degree),
+            help="Highest power of any single feature within a term"
+        )
+        candidates = term_names(
+            selected_powers(len(FEATURE_COLUMNS), int(degree), interaction_only, max_power),
+            FEATURE_COLUMNS
+        )[1:]
+        chosen_terms = st.sidebar.multiselect(
+            "Terms",
+            candidates,
+            help="Train on these terms only; leave empty to keep every term allowed above"
+        )
+        expansion_options = {
+            'interaction_only': interaction_only,
+            'max_power': int(max_power),
+            'terms': chosen_terms or None,
+            'feature_names': FEATURE_COLUMNS
+        }
+        n_terms = len(chosen_terms) if chosen_terms else len(candidates)
+        n_full = len(polynomial_powers(len(FEATURE_COLUMNS), int(degree))) - 1
+        st.sidebar.caption(f"{n_terms} of {n_full} terms")
+    model = PoultryWeightPredictor(degree=int(degree), **expansion_options)
+    
+    parallel_training = st.sidebar.checkbox(
+        "Parallel training",
+        value=False,
+        help="Split the training data into shards and fit them across CPU cores"
+    )
+    n_jobs = st.sidebar.number_input(
+        "Worker processes",
+        min_value=1,
+        max_value=os.cpu_count() or 1,
+        value=os.cpu_count() or 1,
+        disabled=not parallel_training
+    )
+    
+    compact_mode = st.sidebar.checkbox(
+        "Compact memory mode",
+        value=False,
+        help="Keep the scaled training and test features in float32, halving their memory"
+    )
+    
     # Show data information
     st.sidebar.subheader("Data Information")
     total_samples = len(df_processed)
@@ -70,25 +159,227 @@ def app():
     
     # Prepare features
     try:
-        X_train, X_test, y_train, y_test = data_processor.prepare_features(
-            df_processed, 
-            test_size=test_size
-        )
+        with profiler.stage('split', rows=len(df_processed), compact=compact_mode):
+            X_train, X_test, y_train, y_test = data_processor.prepare_features(
+                df_processed, 
+                test_size=test_size,
+                compact=compact_mode
+            )
         st.success("Features prepared successfully")
         
         # Show shapes
         st.write(f"Training set shape: {X_train.shape}")
         st.write(f"Test set shape: {X_test.shape}")
+        memory = data_processor.memory_report
+        if compact_mode:
+            st.caption(
+                f"Feature matrices: {memory['bytes'] / 1024 ** 2:.1f} MB as {memory['dtype']} "
+                f"({memory['saved_bytes'] / 1024 ** 2:.1f} MB saved)"
+            )
         
     except Exception as e:
         st.error(f"Error preparing features: {str(e)}")
         st.stop()
     
-    # Save test data in session state
-    st.session_state['test_data'] = {
-        'X_test': X_test,
-        'y_test': y_test
-    }
+    # Keep only a handle to the test targets; the result views memory-map them back
+    st.session_state['test_data'] = get_dataset_store().put(
+        f"{dataset.key}-test-{test_size:.4f}",
+        y_test.to_frame()
+    )
+    
+    # Compare polynomial degrees (and feature subsets) on a validation split of the training set
+    with st.expander("Model Selection"):
+        degree_range = st.slider("Degrees to evaluate", min_value=1, max_value=6, value=(1, 4))
+        try_subsets = st.checkbox(
+            "Also evaluate every feature subset",
+            help=f"Evaluates {2 ** len(FEATURE_COLUMNS) - 1} subsets per degree"
+        )
+        if st.button("Run Model Selection"):
+            with st.spinner("Evaluating candidates..."):
+                leaderboard = select_polynomial_degree(
+                    X_train,
+                    y_train,
+                    degrees=range(degree_range[0], degree_range[1] + 1),
+                    feature_subsets='all' if try_subsets else None,
+                    n_jobs=int(n_jobs) if parallel_training else 1
+                )
+            st.session_state['model_selection'] = leaderboard
+        
+        leaderboard = st.session_state.get('model_selection')
+        if leaderboard is not None:
+            st.caption(
+                f"Shared expansion at the highest degree: {leaderboard.attrs.get('expansion_time_ms', 0):.1f} ms"
+            )
+            st.dataframe(leaderboard, hide_index=True)
+            best_degree = int(leaderboard.loc[0, 'degree'])
+            if st.button(f"Use best degree ({best_degree}) for training"):
+                st.session_state['selected_degree'] = best_degree
+                st.rerun()
+    
+    # K-fold cross-validation of the selected degree on the training set
+    with st.expander("Cross-Validation"):
+        n_folds = st.slider("Number of folds", min_value=2, max_value=20, value=5)
+        if st.button("Run Cross-Validation"):
+            with st.spinner("Cross-validating..."):
+                # Validate the same terms the model is trained on
+                cv_powers = None
+                expansion = f"full expansion of degree {model.degree}"
+                if model.selective:
+                    from models.features import SelectivePolynomialFeatures
+                    cv_powers = SelectivePolynomialFeatures(
+                        degree=model.degree, **expansion_options
+                    ).fit(X_train[:1]).powers_
+                    expansion = f"selective expansion with {len(cv_powers) - 1} terms of degree {model.degree}"
+                st.session_state['cross_validation'] = {
+                    **cross_validate_polynomial(
+                        X_train,
+                        y_train,
+                        n_splits=n_folds,
+                        degree=model.degree,
+                        powers=cv_powers
+                    ),
+                    'expansion': expansion
+                }
+        
+        cv_results = st.session_state.get('cross_validation')
+        if cv_results is not None:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("R² Score", f"{cv_results['mean']['r2']:.4f} ± {cv_results['std']['r2']:.4f}")
+            with col2:
+                st.metric("RMSE", f"{cv_results['mean']['rmse']:.4f} ± {cv_results['std']['rmse']:.4f}")
+            with col3:
+                st.metric("MSE", f"{cv_results['mean']['mse']:.4f} ± {cv_results['std']['mse']:.4f}")
+            st.dataframe(cv_results['folds'], hide_index=True)
+            st.caption(
+                f"Completed {len(cv_results['folds'])} folds of the {cv_results['expansion']} "
+                f"in {cv_results['time_ms']:.1f} ms"
+            )
+    
+    # One model per house or flock, trained across the worker processes
+    with st.expander("Per-Group Models"):
+        group_candidates = [col for col in dataset.columns if col not in REQUIRED_COLUMNS]
+        if not group_candidates:
+            st.info("Upload data with a grouping column, such as a house or flock ID, to train one model per group.")
+        else:
+            group_column = st.selectbox("Group by", group_candidates)
+            min_group_size = st.number_input(
+                "Minimum rows per group",
+                min_value=1,
+                value=GROUP_MIN_ROWS,
+                help="Groups with fewer training rows use the global model"
+            )
+            if st.button("Train Per-Group Models"):
+                try:
+                    groups = dataset.read([group_column])[group_column]
+                    grouped_model = GroupedPoultryWeightPredictor(
+                        group_column, degree=model.degree, min_group_size=int(min_group_size)
+                    )
+                    with st.spinner("Training group models..."):
+                        with profiler.stage('train_grouped', rows=len(X_train)):
+                            grouped_model.train(
+                                X_train,
+                                y_train,
+                                groups.loc[y_train.index],
+                                n_jobs=int(n_jobs) if parallel_training else 1
+                            )
+                        with profiler.stage('evaluate_grouped', rows=len(X_test)):
+                            grouped_metrics, per_group, _ = grouped_model.evaluate(
+                                X_test, y_test, groups.loc[y_test.index]
+                            )
+                    st.session_state['grouped_training'] = {
+                        'model': grouped_model,
+                        'metrics': grouped_metrics,
+                        'per_group': per_group,
+                        'test_size': test_size
+                    }
+                except FileNotFoundError:
+                    st.error("The uploaded data is no longer available. Please upload it again.")
+                except Exception as e:
+                    st.error(f"Error during grouped training: {str(e)}")
+            
+            grouped = st.session_state.get('grouped_training')
+            if grouped is not None and grouped['model'].group_column == group_column:
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("R² Score", f"{grouped['metrics']['r2']:.4f}")
+                with col2:
+                    st.metric("RMSE", f"{grouped['metrics']['rmse']:.4f}")
+                with col3:
+                    st.metric("MSE", f"{grouped['metrics']['mse']:.4f}")
+                summary = grouped['model'].summary
+                st.caption(
+                    f"{len(summary)} groups; {int((summary['model'] == 'global').sum())} use the global model"
+                )
+                st.dataframe(grouped['per_group'], hide_index=True)
+                
+                grouped_name = st.text_input(
+                    "Model Name",
+                    value=f"poultry_models_by_{group_column}_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}",
+                    key='grouped_model_name'
+                )
+                if st.button("Save Per-Group Models"):
+                    try:
+                        # All groups go into a single compact artifact
+                        full_path = get_model_registry().save_artifact(
+                            grouped['model'],
+                            data_processor,
+                            grouped_name,
+                            metadata={
+                                'feature_columns': FEATURE_COLUMNS,
+                                'training_date': pd.Timestamp.now(),
+                                'training_metrics': grouped['metrics'],
+                                'test_size': grouped['test_size']
+                            }
+                        )
+                        st.success(f"Per-group models saved to {full_path}")
+                    except Exception as e:
+                        st.error(f"Error saving model: {str(e)}")
+    
+    # Bagged replicas of the model, to report how stable its fit is
+    with st.expander("Bootstrap Ensemble"):
+        n_estimators = st.number_input(
+            "Replicas",
+            min_value=2,
+            max_value=1000,
+            value=ENSEMBLE_SIZE,
+            help="Number of models fitted to bootstrap resamples of the training data"
+        )
+        if st.button("Train Ensemble"):
+            try:
+                ensemble = BootstrapEnsemble(degree=model.degree, n_estimators=int(n_estimators))
+                with st.spinner("Training bootstrap replicas..."):
+                    with profiler.stage('train_ensemble', rows=len(X_train), replicas=int(n_estimators)):
+                        ensemble.train(X_train, y_train, n_jobs=int(n_jobs) if parallel_training else 1)
+                    with profiler.stage('evaluate_ensemble', rows=len(X_test)):
+                        ensemble_metrics, _, _ = ensemble.evaluate(X_test, y_test)
+                st.session_state['ensemble_training'] = {
+                    'model': ensemble,
+                    'metrics': ensemble_metrics
+                }
+            except Exception as e:
+                st.error(f"Error during ensemble training: {str(e)}")
+        
+        ensemble = st.session_state.get('ensemble_training')
+        if ensemble is not None:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Ensemble R² Score", f"{ensemble['metrics']['r2']:.4f}")
+            with col2:
+                st.metric("Ensemble RMSE", f"{ensemble['metrics']['rmse']:.4f}")
+            with col3:
+                st.metric(
+                    "Mean Prediction Spread",
+                    f"{ensemble['metrics']['mean_prediction_std']:.4f}",
+                    help="Average standard deviation of the replica predictions on the test set"
+                )
+            summary = ensemble['model'].summary
+            st.caption(
+                f"Out-of-bag R² over {len(summary)} replicas: "
+                f"{summary['oob_r2'].mean():.4f} ± {summary['oob_r2'].std():.4f}"
+            )
+            st.write("Coefficient stability (least stable first):")
+            st.dataframe(ensemble['model'].coefficient_summary(FEATURE_COLUMNS), hide_index=True)
     
     # Training progress
     progress_bar = st.progress(0)
@@ -105,15 +396,21 @@ def app():
             progress_bar.progress(25)
             
             # Train the model
-            model.train(X_train, y_train)
+            with profiler.stage('train', rows=len(X_train), parallel=bool(parallel_training)):
+                if parallel_training:
+                    model.train_parallel(X_train, y_train, n_jobs=int(n_jobs))
+                else:
+                    model.train(X_train, y_train)
             progress_bar.progress(50)
             
             # Evaluate the model
-            metrics, y_pred = model.evaluate(X_test, y_test)
+            with profiler.stage('evaluate', rows=len(X_test)):
+                metrics, y_pred = model.evaluate(X_test, y_test)
             progress_bar.progress(75)
             
             # Get feature importance
-            importance_dict = model.get_feature_importance(FEATURE_COLUMNS)
+            with profiler.stage('importance'):
+                importance_dict = model.get_feature_importance(FEATURE_COLUMNS)
             progress_bar.progress(100)
             
             # Store results
@@ -140,6 +437,12 @@ def app():
         metrics = results['metrics']
         y_pred = results['predictions']
         importance_dict = results['feature_importance']
+        try:
+            y_actual = st.session_state['test_data'].read()[TARGET_COLUMN]
+        except FileNotFoundError:
+            st.session_state['training_results'] = None
+            st.error("The test data of these results is no longer available. Please train the model again.")
+            st.stop()
         
         # Display metrics
         st.subheader("Model Performance")
@@ -157,35 +460,39 @@ def app():
         
         with tab1:
             st.subheader("Actual vs Predicted Values")
-            prediction_plot = visualizer.plot_actual_vs_predicted(
-                st.session_state['test_data']['y_test'],
-                y_pred
-            )
+            with profiler.stage('plot', rows=len(y_pred), plot='actual_vs_predicted'):
+                prediction_plot = visualizer.plot_actual_vs_predicted(
+                    y_actual,
+                    y_pred
+                )
             st.plotly_chart(prediction_plot, use_container_width=True)
+            st.caption(f"Figure payload: {visualizer.payload_size(prediction_plot) / 1024:.1f} KB")
             
             if st.checkbox("Show detailed predictions"):
                 n_examples = min(10, len(y_pred))
                 examples = pd.DataFrame({
-                    'Actual Weight': st.session_state['test_data']['y_test'][:n_examples],
+                    'Actual Weight': y_actual[:n_examples],
                     'Predicted Weight': y_pred[:n_examples],
                     'Absolute Error': abs(
-                        st.session_state['test_data']['y_test'][:n_examples] - 
+                        y_actual[:n_examples] - 
                         y_pred[:n_examples]
                     ),
                     'Relative Error (%)': abs(
-                        st.session_state['test_data']['y_test'][:n_examples] - 
+                        y_actual[:n_examples] - 
                         y_pred[:n_examples]
-                    ) / st.session_state['test_data']['y_test'][:n_examples] * 100
+                    ) / y_actual[:n_examples] * 100
                 })
                 st.dataframe(examples)
         
         with tab2:
             st.subheader("Feature Importance")
-            importance_plot = visualizer.plot_feature_importance(
-                list(importance_dict.keys()),
-                list(importance_dict.values())
-            )
+            with profiler.stage('plot', plot='feature_importance'):
+                importance_plot = visualizer.plot_feature_importance(
+                    list(importance_dict.keys()),
+                    list(importance_dict.values())
+                )
             st.plotly_chart(importance_plot, use_container_width=True)
+            st.caption(f"Figure payload: {visualizer.payload_size(importance_plot) / 1024:.1f} KB")
             
             # Show feature importance table
             st.write("Feature Importance Values:")
@@ -206,6 +513,14 @@ def app():
                 help="Enter a name for the model or use the default timestamp-based name"
             )
         
+        save_format = st.radio(
+            "Save Format",
+            ["joblib (full objects)", "Compact (pickle-free)"],
+            horizontal=True,
+            help="Compact artifacts store only arrays and JSON metadata; they load faster, "
+                 "do not depend on the scikit-learn version and are safe to open from untrusted sources"
+        )
+        
         with col2:
             if st.button("Save Model", use_container_width=True):
                 try:
@@ -213,17 +528,12 @@ def app():
                         st.error("Please enter a model name")
                         return
                     
-                    # Ensure .joblib extension
-                    if not model_name.endswith('.joblib'):
-                        model_name += '.joblib'
-                    
-                    # Create full path
-                    os.makedirs(MODEL_SAVE_PATH, exist_ok=True)
-                    full_path = os.path.join(MODEL_SAVE_PATH, model_name)
+                    # The model object created on this rerun is untrained; save the trained one
+                    trained_model = st.session_state['model']
                     
                     # Create save dictionary
                     save_dict = {
-                        'model': model,
+                        'model': trained_model,
                         'data_processor': data_processor,
                         'feature_columns': FEATURE_COLUMNS,
                         'training_date': pd.Timestamp.now(),
@@ -231,8 +541,18 @@ def app():
                         'test_size': test_size
                     }
                     
-                    # Save everything
-                    joblib.dump(save_dict, full_path)
+                    # Save everything and record its metadata in the registry index
+                    registry = get_model_registry()
+                    if save_format.startswith("Compact"):
+                        metadata = {
+                            key: value for key, value in save_dict.items()
+                            if key not in ('model', 'data_processor')
+                        }
+                        full_path = registry.save_artifact(
+                            trained_model, data_processor, model_name, metadata=metadata
+                        )
+                    else:
+                        full_path = registry.save(save_dict, model_name)
                     
                     # Success message
                     st.success(f"Model saved successfully!")
@@ -245,6 +565,7 @@ def app():
                         
                 except Exception as e:
                     st.error(f"Error saving model: {str(e)}")
+                    import traceback
                     st.code(traceback.format_exc())
         
 
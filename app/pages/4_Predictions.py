@@ -2,10 +2,12 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import os
-import joblib
-from utils.data_processor import DataProcessor, FEATURE_COLUMNS
-from models.polynomial_regression import PoultryWeightPredictor
-from config.settings import MODEL_SAVE_PATH
+from models.inference import CompiledPredictor
+from models.batch_prediction import BatchPredictionEngine, PREDICTION_COLUMN, remove_stale_outputs
+from models.registry import get_model_registry
+from models.artifact import ModelArtifact
+from utils.profiling import performance_panel
+from config.settings import FEATURE_COLUMNS, MODEL_SAVE_PATH
 
 def validate_input_values(input_values: dict) -> bool:
     """Validate input values for manual prediction."""
@@ -15,11 +17,26 @@ def validate_input_values(input_values: dict) -> bool:
             return False
     return True
 
+def processor_key(data_processor) -> tuple:
+    """Fitted scaler parameters of a data processor, so a refitted processor compiles anew."""
+    if data_processor is None or not data_processor.is_fitted:
+        return None
+    scaler = data_processor.scaler
+    return (scaler.mean_.tobytes(), scaler.scale_.tobytes())
+
+def discard_batch_result() -> None:
+    """Forget the stored batch result and delete its output file."""
+    batch_result = st.session_state.pop('batch_result', None)
+    if batch_result is not None and os.path.exists(batch_result[1]['output_path']):
+        os.remove(batch_result[1]['output_path'])
+
 def app():
     st.title("🔮 Make Predictions")
+    profiler = performance_panel("Predictions")
     
-    # Initialize data processor
-    data_processor = DataProcessor()
+    # Compact artifacts carry their own scaler; pickled models bring a data processor.
+    # Neither scikit-learn nor plotly is imported unless a pickled model needs it.
+    data_processor = None
     
     # Sidebar - Model Selection
     st.sidebar.subheader("Model Selection")
@@ -42,33 +59,58 @@ def app():
             if 'data_processor' in st.session_state:
                 data_processor = st.session_state['data_processor']
                 print("Using data processor from training session")
+            # Every fit gets a new version, so a retrained model is compiled again
+            compiled_key = ('session', getattr(model, 'version', None), processor_key(data_processor))
         else:
             # Load saved model
             if not os.path.exists(MODEL_SAVE_PATH):
                 st.error(f"Model directory not found: {MODEL_SAVE_PATH}")
                 st.stop()
-                
-            saved_models = [f for f in os.listdir(MODEL_SAVE_PATH) if f.endswith('.joblib')]
+            
+            # Listing and filtering only read the registry index, not the models
+            registry = get_model_registry()
+            name_filter = st.sidebar.text_input("Filter models by name", value="")
+            sort_by = st.sidebar.selectbox("Sort models by", ["training_date", "r2", "rmse", "name"])
+            saved_models = registry.list_models(
+                name_contains=name_filter or None,
+                sort_by=sort_by,
+                descending=sort_by not in ("rmse", "name")
+            )
             
             if not saved_models:
                 st.error("No saved models found!")
                 st.stop()
-                
-            selected_model = st.sidebar.selectbox("Select Saved Model", saved_models)
+            
+            records = {record['name']: record for record in saved_models}
+            selected_model = st.sidebar.selectbox("Select Saved Model", list(records))
+            selected_record = records[selected_model]
+            if selected_record.get('training_metrics'):
+                st.sidebar.caption(
+                    f"Trained {selected_record.get('training_date', 'unknown')} · "
+                    f"R² {selected_record['training_metrics'].get('r2', float('nan')):.4f}"
+                )
             try:
-                model_path = os.path.join(MODEL_SAVE_PATH, selected_model)
-                saved_data = joblib.load(model_path)
+                # Loaded models are cached until the file changes
+                with profiler.stage('load_model', model=selected_model):
+                    stat = os.stat(registry.model_path(selected_model))
+                    saved_data = registry.load(selected_model)
+                compiled_key = ('saved', selected_model, stat.st_mtime_ns, stat.st_size)
                 
                 # Check if it's a dictionary containing model and data_processor
-                if isinstance(saved_data, dict):
+                if isinstance(saved_data, ModelArtifact):
+                    # Compact artifacts already hold the scaler and coefficients
+                    model = saved_data
+                elif isinstance(saved_data, dict):
                     model = saved_data['model']
                     data_processor = saved_data['data_processor']
                 else:
                     model = saved_data
                 
-                if not isinstance(model, PoultryWeightPredictor):
-                    st.error("Invalid model file!")
-                    st.stop()
+                if not isinstance(model, ModelArtifact):
+                    from models.polynomial_regression import PoultryWeightPredictor
+                    if not isinstance(model, PoultryWeightPredictor):
+                        st.error("Invalid model file!")
+                        st.stop()
                 
                 st.sidebar.success(f"Model loaded successfully: {selected_model}")
                 
@@ -80,6 +122,23 @@ def app():
         st.error(f"Error initializing model: {str(e)}")
         st.stop()
     
+    # Compile the model and scaler into a single fused evaluator, reused across reruns
+    try:
+        compiled = st.session_state.get('compiled_predictor')
+        if compiled is None or compiled[0] != compiled_key:
+            if isinstance(model, ModelArtifact):
+                compiled = (compiled_key, model.predictor)
+            else:
+                if data_processor is None:
+                    from utils.data_processor import DataProcessor
+                    data_processor = DataProcessor()
+                compiled = (compiled_key, CompiledPredictor.from_model(model, data_processor))
+            st.session_state['compiled_predictor'] = compiled
+        predictor = compiled[1]
+    except Exception as e:
+        st.error(f"Error preparing model for predictions: {str(e)}")
+        st.stop()
+    
     # Main content
     st.subheader("Make New Predictions")
     
@@ -89,7 +148,22 @@ def app():
         ["Manual Input", "Batch Prediction (CSV)"]
     )
     
+    # Analytic intervals need the training statistics; grouped and older models have none
+    interval_level = None
+    if getattr(predictor, 'has_intervals', False):
+        interval_level = st.select_slider(
+            "Interval Level",
+            options=[0.8, 0.9, 0.95, 0.99],
+            value=0.95,
+            format_func=lambda level: f"{level:.0%}",
+            help="Confidence level of the intervals around each prediction. The confidence "
+                 "interval covers the mean weight for these conditions; the prediction "
+                 "interval covers an individual bird's weight."
+        )
+    
     if input_method == "Manual Input":
+        # A batch result is not shown here, so its output file is not kept either
+        discard_batch_result()
         st.markdown("### Enter Feature Values")
         
         try:
@@ -139,6 +213,15 @@ def app():
                     step=1.0,
                     help="Amount of feed consumed"
                 )
+                
+                # Per-group models need the group of the input; unknown groups use the global model
+                group_column = getattr(predictor, 'group_column', None)
+                if group_column:
+                    group = st.selectbox(
+                        group_column,
+                        list(predictor.groups) + ["Other (global model)"],
+                        help="Group whose model makes the prediction"
+                    )
             
             if st.button("Predict"):
                 try:
@@ -153,14 +236,34 @@ def app():
                     st.write("Input Data:")
                     st.dataframe(input_df)
                     
-                    # Scale features directly (no need for preprocessing for single prediction)
-                    scaled_features = data_processor.scale_features(input_df[FEATURE_COLUMNS])
-                    
-                    # Make prediction
-                    prediction = model.predict(scaled_features)
+                    # Make prediction (scaling is folded into the compiled predictor)
+                    intervals = {}
+                    with profiler.stage('predict', rows=len(input_df)):
+                        if group_column:
+                            prediction = predictor.predict(input_df[FEATURE_COLUMNS], [group])
+                        elif interval_level is not None:
+                            result = predictor.predict_interval(input_df[FEATURE_COLUMNS], interval_level)
+                            prediction = result['prediction']
+                            intervals = {
+                                f"{label} {interval_level:.0%} {side}": result[f"{key}_{side.lower()}"][0]
+                                for label, key in (('Confidence', 'confidence'), ('Prediction', 'prediction'))
+                                for side in ('Lower', 'Upper')
+                            }
+                        else:
+                            prediction = predictor.predict(input_df[FEATURE_COLUMNS])
                     
                     # Display prediction
                     st.success(f"Predicted Weight: {prediction[0]:.2f} g")
+                    if intervals:
+                        col1, col2 = st.columns(2)
+                        col1.metric(
+                            f"{interval_level:.0%} Confidence Interval (mean weight)",
+                            f"{result['confidence_lower'][0]:.2f} – {result['confidence_upper'][0]:.2f} g"
+                        )
+                        col2.metric(
+                            f"{interval_level:.0%} Prediction Interval (single bird)",
+                            f"{result['prediction_lower'][0]:.2f} – {result['prediction_upper'][0]:.2f} g"
+                        )
                     
                     # Add to prediction history
                     if 'prediction_history' not in st.session_state:
@@ -168,7 +271,9 @@ def app():
                     
                     st.session_state['prediction_history'].append({
                         **input_values,
-                        'Predicted Weight': prediction[0]
+                        **({group_column: group} if group_column else {}),
+                        'Predicted Weight': prediction[0],
+                        **intervals
                     })
                     
                 except Exception as e:
@@ -183,7 +288,8 @@ def app():
         st.markdown("### Upload Data for Batch Prediction")
         
         # Show sample format
-        st.info("Your CSV file should have these columns: " + ", ".join(FEATURE_COLUMNS))
+        required_columns = FEATURE_COLUMNS + ([predictor.group_column] if getattr(predictor, 'group_column', None) else [])
+        st.info("Your CSV file should have these columns: " + ", ".join(required_columns))
         
         # Sample data
         sample_df = pd.DataFrame({
@@ -212,52 +318,60 @@ def app():
         
         if uploaded_file is not None:
             try:
-                # Read data
-                prediction_df = pd.read_csv(uploaded_file)
-                
-                # Show raw data
-                st.subheader("Input Data Preview")
-                st.dataframe(prediction_df.head())
-                
-                # Validate columns
-                is_valid, missing_cols = data_processor.validate_columns(prediction_df)
-                
-                if not is_valid:
-                    st.error(f"Missing required columns: {', '.join(missing_cols)}")
-                    st.write("Required columns:", FEATURE_COLUMNS)
-                    st.stop()
-                
-                # Scale features
-                scaled_features = data_processor.scale_features(prediction_df[FEATURE_COLUMNS])
-                
-                # Make predictions
-                predictions = model.predict(scaled_features)
-                
-                # Create results DataFrame
-                results_df = prediction_df.copy()
-                results_df['Predicted_Weight'] = predictions
+                # Predict chunk by chunk into a temporary file; only a preview stays in memory
+                # file_id changes on every upload, even of a file with the same name and size
+                batch_key = (uploaded_file.file_id, compiled[0], interval_level)
+                # Outputs of ended sessions are never discarded by them
+                remove_stale_outputs()
+                batch_result = st.session_state.get('batch_result')
+                if (batch_result is None or batch_result[0] != batch_key
+                        or not os.path.exists(batch_result[1]['output_path'])):
+                    discard_batch_result()
+                    status_text = st.empty()
+                    engine = BatchPredictionEngine(predictor, interval_level=interval_level)
+                    with profiler.stage('predict', mode='batch') as stage:
+                        result = engine.run(
+                            uploaded_file,
+                            progress_callback=lambda rows: status_text.text(f"Predicted {rows:,} rows...")
+                        )
+                        stage.set_rows(result['rows'])
+                    status_text.empty()
+                    batch_result = (batch_key, result)
+                    st.session_state['batch_result'] = batch_result
+                result = batch_result[1]
                 
                 # Display results
-                st.subheader("Prediction Results")
-                st.dataframe(results_df)
+                st.subheader("Prediction Results Preview")
+                st.caption(f"Showing the first {len(result['preview'])} of {result['rows']:,} rows")
+                st.dataframe(result['preview'])
+                
+                if result['invalid_rows']:
+                    st.warning(f"{result['invalid_rows']:,} rows had missing or invalid feature values")
                 
                 # Show statistics
                 st.subheader("Prediction Statistics")
-                stats = results_df['Predicted_Weight'].describe()
-                st.write(stats)
+                st.write(pd.Series(result['statistics'], name=PREDICTION_COLUMN))
                 
-                # Download results
-                st.download_button(
-                    label="Download Predictions",
-                    data=results_df.to_csv(index=False),
-                    file_name="predictions.csv",
-                    mime="text/csv"
-                )
+                # Download results; the button holds the whole file in memory, so it is
+                # only built on request, for the one rerun that shows it
+                if st.button("Prepare Download"):
+                    with open(result['output_path'], 'rb') as output_file:
+                        st.download_button(
+                            label="Download Predictions",
+                            data=output_file,
+                            file_name="predictions.csv",
+                            mime="text/csv"
+                        )
                 
+            except ValueError as e:
+                st.error(str(e))
+                st.write("Required columns:", required_columns)
             except Exception as e:
                 st.error(f"Error processing file: {str(e)}")
                 import traceback
                 st.code(traceback.format_exc())
+        else:
+            discard_batch_result()
     
     # Show prediction history
     if 'prediction_history' in st.session_state and st.session_state['prediction_history']:
@@ -1,7 +1,9 @@
 import streamlit as st
+from utils.profiling import performance_panel
 
 def app():
     st.title("ℹ️ About")
+    performance_panel("About")
     
     st.markdown("""
     # Poultry Weight Predictor
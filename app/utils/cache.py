@@ -0,0 +1,199 @@
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+import pandas as pd
+from config.settings import DATASET_CACHE_MAX_BYTES, DATASET_CACHE_MAX_ENTRIES
+
+
+class DatasetCache:
+    """
+    Size-bounded LRU cache of parsed and preprocessed datasets.
+
+    Entries are keyed by a hash of the uploaded file bytes plus the
+    preprocessing settings, so the same export uploaded twice (or by several
+    users) maps to a single cached copy. Cached frames are shared between
+    sessions and must be treated as read-only by callers.
+
+    Sizes are estimated from the DataFrames of an entry only, so the number
+    of entries is bounded as well, for entries holding other large objects.
+    """
+
+    def __init__(self, max_bytes: int = DATASET_CACHE_MAX_BYTES,
+                 max_entries: int = DATASET_CACHE_MAX_ENTRIES):
+        """Initialize an empty cache holding at most max_bytes of data in max_entries entries."""
+        if max_bytes <= 0:
+            raise ValueError("Cache size must be positive")
+        if max_entries < 1:
+            raise ValueError("Cache must hold at least one entry")
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(data: bytes, settings: dict = None) -> str:
+        """Build a cache key from file contents and preprocessing settings."""
+        digest = hashlib.blake2b(data, digest_size=16)
+        digest.update(json.dumps(settings or {}, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _entry_size(entry: dict) -> int:
+        """Estimate the memory held by an entry from its DataFrames."""
+        return int(sum(
+            value.memory_usage(deep=True).sum()
+            for value in entry.values()
+            if isinstance(value, pd.DataFrame)
+        ))
+
+    def get(self, key: str):
+        """Return the cached entry for key, or None if it is not cached."""
+        entry = self._lookup(key)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+        return entry
+
+    def _lookup(self, key: str):
+        """Return the entry for key and mark it as recently used, counting hits only."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return entry
+
+    def put(self, key: str, entry: dict) -> dict:
+        """
+        Store an entry, evicting least recently used entries to stay within budget.
+
+        An entry larger than the whole budget is returned but not kept.
+        """
+        size = self._entry_size(entry)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._sizes.pop(key)
+                del self._entries[key]
+
+            if size > self.max_bytes:
+                print(f"Dataset cache: entry of {size / 1024 ** 2:.1f} MB exceeds the "
+                      f"{self.max_bytes / 1024 ** 2:.1f} MB budget and is not cached")
+                return entry
+
+            while self._entries and (
+                self._total_bytes + size > self.max_bytes or len(self._entries) >= self.max_entries
+            ):
+                evicted_key, _ = self._entries.popitem(last=False)
+                self._total_bytes -= self._sizes.pop(evicted_key)
+
+            self._entries[key] = entry
+            self._sizes[key] = size
+            self._total_bytes += size
+        return entry
+
+    def invalidate(self, key: str) -> None:
+        """Drop the entry for key, if cached."""
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+                self._total_bytes -= self._sizes.pop(key)
+
+    def _lookup_valid(self, key: str, validate):
+        """Return the entry for key, dropping it instead if validate rejects it."""
+        entry = self._lookup(key)
+        if entry is not None and validate is not None and not validate(entry):
+            self.invalidate(key)
+            return None
+        return entry
+
+    def get_or_compute(self, key: str, compute, validate=None) -> tuple:
+        """
+        Return the cached entry for key, computing and storing it on a miss.
+
+        Concurrent callers asking for the same key wait for a single
+        computation instead of each parsing the file, and receive its
+        entry even when it is too large to be cached. If the computation
+        fails, the next waiter computes the entry itself.
+
+        Args:
+            key (str): Cache key from make_key
+            compute (callable): Zero-argument function returning the entry dict
+            validate (callable): Called with a cached entry; if it returns
+                False, e.g. because a file the entry refers to is gone, the
+                entry is dropped and computed again
+
+        Returns:
+            tuple: (entry, hit) where hit tells whether the entry was cached
+        """
+        while True:
+            entry = self._lookup_valid(key, validate)
+            if entry is not None:
+                return entry, True
+
+            with self._lock:
+                pending = self._pending.get(key)
+                leader = pending is None
+                if leader:
+                    pending = self._pending[key] = {'done': threading.Event(), 'entry': None}
+                    self.misses += 1
+
+            if not leader:
+                # Another session is computing this entry; share its result
+                pending['done'].wait()
+                if pending['entry'] is not None:
+                    with self._lock:
+                        self.hits += 1
+                    return pending['entry'], True
+                continue
+
+            try:
+                pending['entry'] = self.put(key, compute())
+            finally:
+                with self._lock:
+                    del self._pending[key]
+                pending['done'].set()
+            return pending['entry'], False
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        """Return cache usage statistics."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+_dataset_cache = None
+_dataset_cache_lock = threading.Lock()
+
+
+def get_dataset_cache() -> DatasetCache:
+    """Return the process-wide dataset cache shared by all pages and sessions."""
+    global _dataset_cache
+    with _dataset_cache_lock:
+        if _dataset_cache is None:
+            _dataset_cache = DatasetCache()
+        return _dataset_cache
+
+
+def copy_processor(entry: dict):
+    """Return a private copy of the fitted DataProcessor stored in a cache entry."""
+    return copy.deepcopy(entry['data_processor'])
@@ -1,7 +1,8 @@
+import os
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
+from config.settings import CHUNK_SIZE
+from utils.statistics import StreamingStatistics
 
 # Define constants
 REQUIRED_COLUMNS = [
@@ -24,11 +25,19 @@ FEATURE_COLUMNS = [
 TARGET_COLUMN = 'Weight'
 RANDOM_STATE = 42
 
+# Largest magnitude float32 represents; integers above 2**24 lose precision in float32
+FLOAT32_MAX = float(np.finfo(np.float32).max)
+FLOAT32_MAX_EXACT_INTEGER = 2 ** 24
+
 class DataProcessor:
     def __init__(self):
         """Initialize the DataProcessor with a standard scaler."""
+        # Imported here so that importing this module (e.g. for its constants) stays cheap
+        from sklearn.preprocessing import StandardScaler
         self.scaler = StandardScaler()
         self.is_fitted = False
+        self.preprocessing_report = None
+        self.memory_report = None
     
     def validate_data(self, df: pd.DataFrame, is_training: bool = True) -> None:
         """
@@ -57,13 +66,21 @@ class DataProcessor:
         missing_cols = [col for col in required_cols if col not in df.columns]
         return len(missing_cols) == 0, missing_cols
     
-    def preprocess_data(self, df: pd.DataFrame, is_training: bool = True) -> pd.DataFrame:
+    def preprocess_data(self, df: pd.DataFrame, is_training: bool = True,
+                        fast: bool = False, copy: bool = True, compact: bool = False) -> pd.DataFrame:
         """
         Preprocess the input dataframe.
         
         Args:
             df (pd.DataFrame): Input dataframe to preprocess
             is_training (bool): Whether this is training data or prediction data
+            fast (bool): Coerce all columns in one vectorized pass and collect
+                diagnostics in preprocessing_report instead of printing them
+            copy (bool): Whether the fast path works on a copy of df. With
+                copy=False the caller's frame may be converted in place.
+            compact (bool): Downcast feature columns to float32 where no value
+                is out of range or loses integer precision; the memory saved
+                is recorded in preprocessing_report['memory']
             
         Returns:
             pd.DataFrame: Preprocessed dataframe
@@ -71,6 +88,9 @@ class DataProcessor:
         # Validate input
         self.validate_data(df, is_training=is_training)
         
+        if fast:
+            return self._preprocess_fast(df, is_training=is_training, copy=copy, compact=compact)
+        
         # Create a copy
         df = df.copy()
         
@@ -99,6 +119,10 @@ class DataProcessor:
         rows_dropped = initial_rows - len(df)
         print(f"\nRows dropped due to null values: {rows_dropped}")
         
+        memory = self._downcast_features(df) if compact else None
+        if memory is not None:
+            print(f"Compact mode saved {memory['saved_bytes'] / 1024 ** 2:.1f} MB")
+        
         # Validate after preprocessing
         if len(df) == 0:
             raise ValueError("No valid data remaining after preprocessing")
@@ -113,18 +137,243 @@ class DataProcessor:
             raise ValueError("Scaler must be fitted before preprocessing prediction data")
         
         print(f"Final shape: {df.shape}")
+        self.preprocessing_report = {
+            'initial_shape': (initial_rows, df.shape[1]),
+            'final_shape': df.shape,
+            'rows_dropped': rows_dropped,
+            'copied': True,
+            'memory': memory
+        }
         return df
-    
-    def prepare_features(self, df: pd.DataFrame, test_size: float = 0.2) -> tuple:
-        """Prepare features for model training."""
+
+    def _preprocess_fast(self, df: pd.DataFrame, is_training: bool, copy: bool,
+                         compact: bool = False) -> pd.DataFrame:
+        """Vectorized preprocess_data path that records a report instead of printing."""
+        initial_shape = df.shape
+        columns_to_process = REQUIRED_COLUMNS if is_training else FEATURE_COLUMNS
+        dtypes_before = {col: str(df[col].dtype) for col in columns_to_process}
+
+        if copy:
+            df = df.copy()
+
+        try:
+            self._coerce_columns(df, columns_to_process)
+        except Exception as e:
+            raise ValueError(f"Error converting columns: {str(e)}")
+
+        # Downcast before dropping rows so the filtered copy is already compact
+        memory = self._downcast_features(df) if compact else None
+
+        # Same rule as the regular path: drop rows with a null in any column
+        null_counts = df[columns_to_process].isnull().sum()
+        valid_rows = df.notna().all(axis=1)
+        rows_dropped = int(len(df) - valid_rows.sum())
+        if rows_dropped:
+            df = df[valid_rows]
+
+        self.preprocessing_report = {
+            'initial_shape': initial_shape,
+            'final_shape': df.shape,
+            'rows_dropped': rows_dropped,
+            'copied': copy,
+            'memory': memory,
+            'columns': {
+                col: {
+                    'dtype_before': dtypes_before[col],
+                    'dtype_after': str(df[col].dtype),
+                    'null_values': int(null_counts[col])
+                }
+                for col in columns_to_process
+            }
+        }
+
+        if len(df) == 0:
+            raise ValueError("No valid data remaining after preprocessing")
+
+        if is_training:
+            self.scaler.fit(df[FEATURE_COLUMNS])
+            self.is_fitted = True
+        elif not self.is_fitted:
+            raise ValueError("Scaler must be fitted before preprocessing prediction data")
+
+        return df
+
+    def preprocess_csv_in_chunks(self, source, output_path: str, chunksize: int = CHUNK_SIZE,
+                                 is_training: bool = True) -> dict:
+        """
+        Preprocess a CSV file chunk by chunk, writing cleaned rows incrementally.
+
+        Each chunk goes through the same validation, coercion and null-dropping
+        rules as preprocess_data. When training, the scaler is fitted with
+        partial_fit so peak memory depends on chunksize rather than file size.
+        Column statistics of the cleaned rows are accumulated in the same pass.
+
+        Args:
+            source: Path or file-like object of the CSV to read
+            output_path (str): Path of the CSV file the cleaned rows are written to
+            chunksize (int): Number of rows read per chunk
+            is_training (bool): Whether this is training data or prediction data
+
+        Returns:
+            dict: Summary with rows read, rows written, rows dropped, chunk count
+                and 'statistics' in the format of calculate_statistics (approximate median)
+        """
+        if chunksize < 1:
+            raise ValueError("Chunk size must be a positive integer")
+        if not is_training and not self.is_fitted:
+            raise ValueError("Scaler must be fitted before preprocessing prediction data")
+
+        columns_to_process = REQUIRED_COLUMNS if is_training else FEATURE_COLUMNS
+        if is_training:
+            from sklearn.preprocessing import StandardScaler
+            self.scaler = StandardScaler()
+            self.is_fitted = False
+
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        summary = {
+            'output_path': output_path,
+            'rows_read': 0,
+            'rows_written': 0,
+            'rows_dropped': 0,
+            'chunks': 0
+        }
+        statistics = StreamingStatistics(columns_to_process)
+
+        try:
+            with open(output_path, 'w', newline='') as output:
+                for chunk in pd.read_csv(source, chunksize=chunksize):
+                    missing_cols = [col for col in columns_to_process if col not in chunk.columns]
+                    if missing_cols:
+                        raise ValueError(f"Missing required columns: {missing_cols}")
+                    if chunk[FEATURE_COLUMNS].isnull().any().any():
+                        raise ValueError("DataFrame contains null values in feature columns")
+
+                    chunk = self._coerce_columns(chunk, columns_to_process)
+
+                    summary['chunks'] += 1
+                    summary['rows_read'] += len(chunk)
+                    chunk = chunk.dropna()
+                    if chunk.empty:
+                        continue
+
+                    if is_training:
+                        self.scaler.partial_fit(chunk[FEATURE_COLUMNS])
+                    statistics.update(chunk)
+
+                    chunk.to_csv(output, header=summary['rows_written'] == 0, index=False)
+                    summary['rows_written'] += len(chunk)
+        except Exception:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+
+        summary['rows_dropped'] = summary['rows_read'] - summary['rows_written']
+        summary['statistics'] = statistics.result()
+
+        if summary['rows_written'] == 0:
+            os.remove(output_path)
+            raise ValueError("No valid data remaining after preprocessing")
+        if is_training and summary['rows_written'] < 2:
+            os.remove(output_path)
+            raise ValueError("Training data must contain at least 2 rows")
+
+        if is_training:
+            self.is_fitted = True
+
+        return summary
+
+    @staticmethod
+    def _coerce_columns(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+        """
+        Strip string values and convert the given columns to numeric in place.
+
+        All object columns are stripped and converted together in a single
+        pass over their flattened values, so the cost does not grow with the
+        number of per-column calls. Numeric columns are left untouched.
+        """
+        object_cols = [col for col in columns if df[col].dtype == 'object']
+        other_cols = [
+            col for col in columns
+            if col not in object_cols and not pd.api.types.is_numeric_dtype(df[col])
+        ]
+
+        if object_cols:
+            flat = pd.Series(df[object_cols].to_numpy().ravel(order='F'), dtype=object)
+            converted = pd.to_numeric(flat.str.strip(), errors='coerce').to_numpy()
+            converted = converted.reshape(len(df), len(object_cols), order='F')
+            for i, col in enumerate(object_cols):
+                df[col] = converted[:, i]
+
+        for col in other_cols:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+        return df
+
+    @staticmethod
+    def _fits_float32(values: np.ndarray) -> bool:
+        """Whether converting numeric values to float32 keeps them in range and integers exact."""
+        if values.dtype == np.float32:
+            return True
+        if not np.issubdtype(values.dtype, np.number):
+            return False
+        if not len(values):
+            return True
+        if np.issubdtype(values.dtype, np.integer):
+            return int(np.abs(values).max()) <= FLOAT32_MAX_EXACT_INTEGER
+        finite = values[np.isfinite(values)]
+        return not len(finite) or float(np.abs(finite).max()) <= FLOAT32_MAX
+
+    def _downcast_features(self, df: pd.DataFrame) -> dict:
+        """
+        Convert the numeric feature columns of df to float32 in place where that is safe.
+
+        The target stays in full precision. Returns the bytes used by the
+        feature columns before and after, and the columns that were converted.
+        """
+        before = after = 0
+        converted = []
+        for col in FEATURE_COLUMNS:
+            if col not in df.columns or not pd.api.types.is_numeric_dtype(df[col]):
+                continue
+            values = df[col].to_numpy()
+            before += values.nbytes
+            if values.dtype != np.float32 and self._fits_float32(values):
+                df[col] = values.astype(np.float32)
+                converted.append(col)
+            after += df[col].to_numpy().nbytes
+        return {
+            'before_bytes': before,
+            'after_bytes': after,
+            'saved_bytes': before - after,
+            'converted_columns': converted
+        }
+
+    def prepare_features(self, df: pd.DataFrame, test_size: float = 0.2,
+                         compact: bool = False) -> tuple:
+        """
+        Prepare features for model training.
+        
+        With compact=True the scaled feature matrices are float32 (unless a
+        feature does not fit in float32) and are filled column by column from
+        df, then scaled in place, so no full-size float64 intermediate is
+        made. The split is the same as in the default mode. memory_report
+        records the bytes of the feature matrices in both modes.
+        """
         # Validate input
         self.validate_data(df, is_training=True)
         
+        if compact:
+            return self._prepare_features_compact(df, test_size)
+        
         # Select features and target
         X = df[FEATURE_COLUMNS]
         y = df[TARGET_COLUMN]
         
         # Split data
+        from sklearn.model_selection import train_test_split
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=test_size, random_state=RANDOM_STATE
         )
@@ -138,7 +387,48 @@ class DataProcessor:
         X_train_scaled = self.scaler.transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
         
+        self.memory_report = self._feature_memory(X_train_scaled, X_test_scaled)
         return X_train_scaled, X_test_scaled, y_train, y_test
+
+    def _prepare_features_compact(self, df: pd.DataFrame, test_size: float) -> tuple:
+        """Compact prepare_features path; see prepare_features."""
+        columns = [df[col].to_numpy() for col in FEATURE_COLUMNS]
+        dtype = np.float32 if all(self._fits_float32(values) for values in columns) else np.float64
+        
+        # ShuffleSplit is what train_test_split uses, so both modes split identically
+        from sklearn.model_selection import ShuffleSplit
+        splitter = ShuffleSplit(n_splits=1, test_size=test_size, random_state=RANDOM_STATE)
+        train_idx, test_idx = next(splitter.split(np.empty((len(df), 1))))
+        
+        X_train = np.empty((len(train_idx), len(FEATURE_COLUMNS)), dtype=dtype)
+        X_test = np.empty((len(test_idx), len(FEATURE_COLUMNS)), dtype=dtype)
+        for j, values in enumerate(columns):
+            X_train[:, j] = values[train_idx]
+            X_test[:, j] = values[test_idx]
+        
+        if not self.is_fitted:
+            self.scaler.fit(pd.DataFrame(X_train, columns=FEATURE_COLUMNS, copy=False))
+            self.is_fitted = True
+        
+        for X in (X_train, X_test):
+            X -= self.scaler.mean_
+            X /= self.scaler.scale_
+        
+        y = df[TARGET_COLUMN]
+        self.memory_report = self._feature_memory(X_train, X_test)
+        return X_train, X_test, y.iloc[train_idx], y.iloc[test_idx]
+
+    @staticmethod
+    def _feature_memory(X_train: np.ndarray, X_test: np.ndarray) -> dict:
+        """Bytes of the scaled feature matrices compared with float64 ones."""
+        used = X_train.nbytes + X_test.nbytes
+        float64_bytes = (X_train.size + X_test.size) * np.dtype(np.float64).itemsize
+        return {
+            'dtype': str(X_train.dtype),
+            'bytes': used,
+            'float64_bytes': float64_bytes,
+            'saved_bytes': float64_bytes - used
+        }
     
     def scale_features(self, X: pd.DataFrame) -> np.ndarray:
         """Scale features using the fitted scaler."""
@@ -154,13 +444,25 @@ class DataProcessor:
         return self.scaler.transform(X)
     
     @staticmethod
-    def calculate_statistics(df: pd.DataFrame) -> dict:
-        """Calculate basic statistics for the dataset."""
+    def calculate_statistics(df: pd.DataFrame, approximate: bool = False,
+                             relative_accuracy: float = 0.01) -> dict:
+        """
+        Calculate basic statistics for the dataset.
+        
+        Args:
+            df (pd.DataFrame): Input dataframe
+            approximate (bool): Compute everything in one pass with StreamingStatistics;
+                the median is then within relative_accuracy of the exact one
+            relative_accuracy (float): Relative error bound of the approximate median
+        """
         if df.empty:
             raise ValueError("Cannot calculate statistics on empty DataFrame")
             
-        stats = {}
         columns = [col for col in REQUIRED_COLUMNS if col in df.columns]
+        if approximate:
+            return StreamingStatistics(columns, relative_accuracy).update(df).result()
+        
+        stats = {}
         for col in columns:
             stats[col] = {
                 'mean': df[col].mean(),
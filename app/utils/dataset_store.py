@@ -0,0 +1,272 @@
+import csv
+import os
+import threading
+import weakref
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.feather as feather
+from config.settings import DATASET_STORE_PATH, DATASET_STORE_MAX_BYTES, DATASET_STORE_BATCH_BYTES
+
+DATASET_EXTENSION = '.feather'
+# CSV bytes per parsed block; the reader keeps a few dozen blocks in flight
+CSV_BLOCK_BYTES = 1024 * 1024
+
+
+class DatasetHandle:
+    """
+    Small, picklable reference to a dataset in the DatasetStore.
+
+    Sessions keep the handle instead of the DataFrame and read the columns
+    they need on demand. Reads are memory-mapped, so the data lives in the
+    operating system's page cache and is shared by every session and rerun
+    that reads the same file.
+    """
+
+    def __init__(self, key: str, path: str, columns: list, n_rows: int):
+        """Initialize a handle; use DatasetStore.put or get to create one."""
+        self.key = key
+        self.path = path
+        self.columns = list(columns)
+        self.n_rows = n_rows
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __repr__(self) -> str:
+        return f"DatasetHandle(key={self.key!r}, rows={self.n_rows}, columns={self.columns})"
+
+    def exists(self) -> bool:
+        """Whether the dataset file is still in the store."""
+        return os.path.exists(self.path)
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        """
+        First n rows, read from the leading record batches only.
+
+        Raises:
+            FileNotFoundError: If the dataset was evicted from the store
+        """
+        try:
+            with pa.memory_map(self.path) as source:
+                reader = pa.ipc.open_file(source)
+                batches = []
+                rows = 0
+                for i in range(reader.num_record_batches):
+                    if rows >= n:
+                        break
+                    batches.append(reader.get_batch(i).slice(0, n - rows))
+                    rows += batches[-1].num_rows
+                table = pa.Table.from_batches(batches, schema=reader.schema)
+                return table.to_pandas()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Dataset {self.key} is no longer in the store") from None
+
+    def read(self, columns: list = None) -> pd.DataFrame:
+        """
+        Memory-map the dataset, or only some of its columns, as a DataFrame.
+
+        Numeric columns without missing values are zero-copy views of the
+        file and are read-only; other columns are converted normally.
+
+        Raises:
+            FileNotFoundError: If the dataset was evicted from the store
+        """
+        if columns is not None:
+            missing = [col for col in columns if col not in self.columns]
+            if missing:
+                raise ValueError(f"Columns not found in dataset: {missing}")
+        try:
+            table = feather.read_table(self.path, columns=columns, memory_map=True)
+            # The modification time doubles as the last use for eviction
+            os.utime(self.path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Dataset {self.key} is no longer in the store") from None
+        # Arrow returns the columns in file order; keep the requested order like pandas
+        names = columns if columns is not None else table.column_names
+        return pd.DataFrame({name: _column_values(table.column(name)) for name in names}, copy=False)
+
+
+def _column_values(column: pa.ChunkedArray):
+    """NumPy view of a single-chunk column without nulls, or a converted copy otherwise."""
+    if column.num_chunks == 1:
+        try:
+            return column.chunk(0).to_numpy(zero_copy_only=True)
+        except pa.ArrowInvalid:
+            pass
+    return column.to_pandas()
+
+
+def _combine(batches: list, schema: pa.Schema) -> pa.Table:
+    """Batches as a table with a single chunk per column, written as one record batch."""
+    return pa.Table.from_batches(batches, schema=schema).combine_chunks()
+
+
+class DatasetStore:
+    """
+    Directory of processed datasets in the Arrow IPC (Feather v2) format.
+
+    Files are written uncompressed with every column in a single chunk, so
+    reading a column maps it straight from the page cache instead of
+    copying it. Datasets are keyed like DatasetCache entries, and the least
+    recently used files are deleted once the store exceeds max_bytes.
+    Files still referenced by a live DatasetHandle, e.g. in a session or a
+    cache entry, are never deleted, so the store may exceed max_bytes while
+    they are in use.
+    """
+
+    def __init__(self, directory: str = DATASET_STORE_PATH, max_bytes: int = DATASET_STORE_MAX_BYTES):
+        """Initialize a store in directory."""
+        if max_bytes <= 0:
+            raise ValueError("Store size must be positive")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Handles given out by this store; they drop out once nothing references them
+        self._handles = weakref.WeakSet()
+
+    def path(self, key: str) -> str:
+        """Path of the file holding a dataset."""
+        return os.path.join(self.directory, key + DATASET_EXTENSION)
+
+    def get(self, key: str):
+        """Return the handle of a stored dataset, or None if it is not stored."""
+        path = self.path(key)
+        try:
+            # Memory-mapped, so only the file metadata is actually read
+            table = feather.read_table(path, memory_map=True)
+            # The modification time doubles as the last use for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return self._track(DatasetHandle(key, path, table.column_names, table.num_rows))
+
+    def put(self, key: str, df: pd.DataFrame) -> DatasetHandle:
+        """
+        Store a DataFrame under key and return its handle.
+
+        The index is not stored, so a frame with dropped rows is read back
+        with a fresh RangeIndex. A dataset already stored under key is reused.
+        """
+        handle = self.get(key)
+        if handle is not None:
+            return handle
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        return self._write(key, table)
+
+    def put_csv(self, key: str, csv_path: str, float_columns: list = None,
+                batch_bytes: int = DATASET_STORE_BATCH_BYTES) -> DatasetHandle:
+        """
+        Stream a CSV file into the store under key and return its handle.
+
+        Arrow's multithreaded reader parses the file in small blocks, which
+        are combined into record batches of about batch_bytes and appended to
+        the store file one at a time. Memory therefore depends on batch_bytes,
+        not on the file size. Columns of datasets larger than one batch span
+        several batches, so reading them copies instead of mapping the file.
+
+        Args:
+            key (str): Dataset key
+            csv_path (str): Path of the CSV file
+            float_columns (list): Columns read as float64; all other columns are
+                read as strings, so no type depends on the first block, where a
+                column of whole numbers would otherwise become int64 and fail on
+                a later "53.0". Default: every type is inferred from the first block.
+            batch_bytes (int): Approximate size of the written record batches
+        """
+        handle = self.get(key)
+        if handle is not None:
+            return handle
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        n_rows = 0
+        convert_options = None
+        if float_columns is not None:
+            with open(csv_path, newline='', encoding='utf-8') as source:
+                header = next(csv.reader(source), [])
+            convert_options = pa_csv.ConvertOptions(column_types={
+                col: pa.float64() if col in float_columns else pa.string() for col in header
+            })
+        try:
+            # Given a Python file object Arrow reads ahead a bounded number of
+            # blocks; given a path, it buffers the whole file
+            with open(csv_path, 'rb') as source:
+                reader = pa_csv.open_csv(
+                    source,
+                    read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+                    convert_options=convert_options
+                )
+                schema = reader.schema
+                with pa.ipc.new_file(tmp_path, schema) as writer:
+                    pending, pending_bytes = [], 0
+                    for batch in reader:
+                        pending.append(batch)
+                        pending_bytes += batch.nbytes
+                        n_rows += batch.num_rows
+                        if pending_bytes >= batch_bytes:
+                            writer.write_table(_combine(pending, schema))
+                            pending, pending_bytes = [], 0
+                    if pending or n_rows == 0:
+                        writer.write_table(_combine(pending, schema))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, path)
+        handle = self._track(DatasetHandle(key, path, schema.names, n_rows))
+        self.prune(keep=path)
+        return handle
+
+    def _write(self, key: str, table: pa.Table) -> DatasetHandle:
+        """Write a table atomically as a single chunk per column and prune the store."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        table = table.combine_chunks()
+        feather.write_feather(table, tmp_path, compression='uncompressed', chunksize=max(table.num_rows, 1))
+        os.replace(tmp_path, path)
+        handle = self._track(DatasetHandle(key, path, table.column_names, table.num_rows))
+        self.prune(keep=path)
+        return handle
+
+    def _track(self, handle: DatasetHandle) -> DatasetHandle:
+        """Register a handle so prune() keeps its file while the handle is alive."""
+        with self._lock:
+            self._handles.add(handle)
+        return handle
+
+    def prune(self, keep: str = None) -> None:
+        """Delete least recently used datasets without live handles until the store fits in max_bytes."""
+        with self._lock:
+            if not os.path.isdir(self.directory):
+                return
+            in_use = {handle.path for handle in self._handles}
+            if keep is not None:
+                in_use.add(keep)
+            files = []
+            for name in os.listdir(self.directory):
+                if name.endswith(DATASET_EXTENSION):
+                    stat = os.stat(os.path.join(self.directory, name))
+                    files.append((stat.st_mtime, stat.st_size, os.path.join(self.directory, name)))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                if path in in_use:
+                    continue
+                os.remove(path)
+                total -= size
+
+
+_dataset_store = None
+_dataset_store_lock = threading.Lock()
+
+
+def get_dataset_store() -> DatasetStore:
+    """Return the process-wide dataset store shared by all pages and sessions."""
+    global _dataset_store
+    with _dataset_store_lock:
+        if _dataset_store is None:
+            _dataset_store = DatasetStore()
+        return _dataset_store
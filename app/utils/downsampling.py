@@ -0,0 +1,65 @@
+import numpy as np
+
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept. The points in between are split
+    into n_out - 2 equal buckets, and each bucket keeps the point forming the
+    largest triangle with the previously kept point and the mean of the next
+    bucket. Unlike taking every k-th point, this preserves peaks, dips and the
+    visual shape of the series.
+
+    Args:
+        x: Increasing x values (e.g. time or row positions)
+        y: Finite y values
+        n_out (int): Number of points to keep, at least 3
+
+    Returns:
+        np.ndarray: Sorted indices into x and y
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if len(y) != n:
+        raise ValueError("x and y must have the same length")
+    if n_out < 3:
+        raise ValueError("LTTB needs to keep at least 3 points")
+    if n_out >= n:
+        return np.arange(n)
+
+    # Bucket i covers [edges[i], edges[i + 1]); the last "bucket" is the final point
+    edges = np.empty(n_out, dtype=np.int64)
+    edges[:-1] = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-2] = n - 1
+    edges[-1] = n
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, stop, next_stop = edges[i], edges[i + 1], edges[i + 2]
+        next_x = x[stop:next_stop].mean()
+        next_y = y[stop:next_stop].mean()
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[i + 1] = previous
+    return selected
+
+
+def downsample_frame(df, column: str, max_points: int):
+    """
+    Keep at most max_points rows of df, chosen by LTTB on column against row position.
+
+    Returns df itself when it is already small enough.
+    """
+    if len(df) <= max_points:
+        return df
+    keep = lttb_indices(np.arange(len(df)), df[column].to_numpy(), max_points)
+    return df.iloc[keep]
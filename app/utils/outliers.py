@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+
+def iqr_outliers(df: pd.DataFrame, columns: list = None, factor: float = 1.5) -> tuple:
+    """
+    Flag IQR outliers in every column at once.
+
+    The quartiles of all columns come from a single vectorized quantile call,
+    and the flags match DataProcessor.detect_outliers column by column.
+
+    Args:
+        df (pd.DataFrame): Input dataframe
+        columns (list): Columns to check (default: all numeric columns)
+        factor (float): Multiple of the IQR beyond the quartiles that counts as an outlier
+
+    Returns:
+        tuple: (flags DataFrame of booleans, bounds DataFrame with q1, q3, lower and upper per column)
+    """
+    if df.empty:
+        raise ValueError("Cannot detect outliers in empty DataFrame")
+    if columns is None:
+        columns = df.select_dtypes(include='number').columns.tolist()
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        raise ValueError(f"Columns not found: {missing}")
+
+    values = df[columns].to_numpy(dtype=np.float64)
+    q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+    iqr = q3 - q1
+    lower = q1 - factor * iqr
+    upper = q3 + factor * iqr
+
+    flags = pd.DataFrame((values < lower) | (values > upper), index=df.index, columns=columns)
+    bounds = pd.DataFrame({'q1': q1, 'q3': q3, 'lower': lower, 'upper': upper}, index=columns)
+    return flags, bounds
+
+
+class MahalanobisDetector:
+    """
+    Multivariate outlier detection with the Mahalanobis distance.
+
+    Rows are compared with the mean and covariance of the data they were
+    fitted on, so combinations that are unusual together (e.g. high feed
+    intake with low weight) are caught even when each value is typical on
+    its own. The pseudo-inverse of the covariance is computed once at fit
+    time, which also copes with perfectly correlated columns.
+    """
+
+    def __init__(self):
+        """Initialize an unfitted detector."""
+        self.columns = None
+        self.mean = None
+        self.precision = None
+
+    def fit(self, df: pd.DataFrame, columns: list) -> 'MahalanobisDetector':
+        """Estimate the mean and inverse covariance from rows without missing values."""
+        values = df[columns].to_numpy(dtype=np.float64)
+        values = values[np.isfinite(values).all(axis=1)]
+        if len(values) <= len(columns):
+            raise ValueError("Need more complete rows than columns to estimate the covariance")
+        self.columns = list(columns)
+        self.mean = values.mean(axis=0)
+        self.precision = np.linalg.pinv(np.cov(values, rowvar=False))
+        return self
+
+    def distances(self, df: pd.DataFrame) -> pd.Series:
+        """Squared Mahalanobis distance of every row (NaN for rows with missing values)."""
+        if self.precision is None:
+            raise ValueError("Detector must be fitted before computing distances")
+        centered = df[self.columns].to_numpy(dtype=np.float64) - self.mean
+        squared = np.einsum('ij,jk,ik->i', centered, self.precision, centered)
+        return pd.Series(squared, index=df.index, name='Mahalanobis Distance²')
+
+    def threshold(self, alpha: float) -> float:
+        """
+        Squared distance above which a row is an outlier at significance level alpha.
+
+        For roughly normal data the squared distances follow a chi-squared
+        distribution with one degree of freedom per column.
+        """
+        if not 0 < alpha < 1:
+            raise ValueError("Significance level must be between 0 and 1")
+        from scipy.stats import chi2
+        return float(chi2.ppf(1 - alpha, df=len(self.columns)))
+
+
+def build_outlier_report(df: pd.DataFrame, columns: list, factor: float = 1.5) -> dict:
+    """
+    Everything the outlier views need for one dataset, computed once.
+
+    Returns:
+        dict: 'flags' and 'bounds' of the per-column IQR check, the fitted
+        'detector' and the squared Mahalanobis 'distances' of every row
+    """
+    flags, bounds = iqr_outliers(df, columns, factor)
+    detector = MahalanobisDetector().fit(df, columns)
+    return {
+        'flags': flags,
+        'bounds': bounds,
+        'detector': detector,
+        'distances': detector.distances(df)
+    }
@@ -0,0 +1,259 @@
+import json
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import deque
+import pandas as pd
+from config.settings import PROFILING_ENABLED, PROFILE_MAX_RECORDS
+
+
+class _DisabledStage:
+    """Stage returned while profiling is off; entering and leaving it does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_rows(self, rows) -> None:
+        pass
+
+
+_DISABLED_STAGE = _DisabledStage()
+
+
+class _SharedTracer:
+    """
+    Reference-counted tracemalloc shared by the profilers of all sessions.
+
+    tracemalloc is process-wide, so profilers never start, stop or reset it
+    directly. Tracing starts with the first profiler that asks for it and
+    stops when the last one releases it. The peak is reset only when no
+    stage is open anywhere in the process, so one session's stage never
+    disturbs another's figures. A stage entered while others are open
+    reports only its allocation delta, not a peak.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = 0
+        self._started = False
+        self._open_stages = 0
+
+    def acquire(self) -> None:
+        """Register a profiler that traces memory, starting tracemalloc if needed."""
+        with self._lock:
+            if self._users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started = True
+            self._users += 1
+
+    def release(self) -> None:
+        """Unregister a profiler, stopping tracemalloc after the last one if it was started here."""
+        with self._lock:
+            self._users -= 1
+            if self._users == 0 and self._started:
+                tracemalloc.stop()
+                self._started = False
+
+    def enter_stage(self):
+        """Open a stage; returns (traced bytes at entry, whether its peak can be measured) or None."""
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                return None
+            # Tracers started elsewhere may reset the peak themselves, so it is not trusted
+            measure_peak = self._started and self._open_stages == 0
+            if measure_peak:
+                tracemalloc.reset_peak()
+            self._open_stages += 1
+            return tracemalloc.get_traced_memory()[0], measure_peak
+
+    def exit_stage(self):
+        """Close a stage; returns (current, peak) traced bytes, or None if tracing stopped meanwhile."""
+        with self._lock:
+            self._open_stages -= 1
+            if not tracemalloc.is_tracing():
+                return None
+            return tracemalloc.get_traced_memory()
+
+
+_tracer = _SharedTracer()
+
+
+class Stage:
+    """Context manager that times one pipeline stage and hands its record to the profiler."""
+
+    __slots__ = ('profiler', 'name', 'rows', 'details', '_start', '_started_at', '_memory')
+
+    def __init__(self, profiler, name: str, rows=None, details: dict = None):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+        self.details = details or {}
+
+    def set_rows(self, rows) -> None:
+        """Record the row count of a stage that only learns it while running (e.g. parsing)."""
+        self.rows = rows
+
+    def __enter__(self):
+        self._memory = _tracer.enter_stage() if self.profiler.trace_memory else None
+        self._started_at = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall_ms = (time.perf_counter() - self._start) * 1000
+        record = {
+            **self.profiler.context,
+            'stage': self.name,
+            'started_at': pd.Timestamp(self._started_at, unit='s').isoformat(),
+            'wall_ms': wall_ms,
+            'rows': None if self.rows is None else int(self.rows),
+        }
+        if self._memory is not None:
+            memory_start, measure_peak = self._memory
+            traced = _tracer.exit_stage()
+            if traced is not None:
+                current, peak = traced
+                record['allocated_kb'] = (current - memory_start) / 1024
+                if measure_peak:
+                    record['peak_kb'] = (peak - memory_start) / 1024
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        record.update(self.details)
+        self.profiler.add(record)
+        return False
+
+
+class StageProfiler:
+    """
+    Records wall time, row counts and allocated memory of pipeline stages.
+
+    Usage:
+        profiler = StageProfiler(enabled=True)
+        with profiler.stage('train', rows=len(X_train)):
+            model.train(X_train, y_train)
+
+    While disabled, stage() returns a shared no-op context manager, so
+    instrumented code pays only for one attribute check per stage. Memory is
+    traced with tracemalloc only when trace_memory is set, because tracing
+    slows down allocation-heavy code considerably. The tracer is shared by
+    all sessions and stops once no profiler traces memory any more,
+    including when a profiler is garbage collected with its session.
+    Stages nested in, or overlapping with, other open stages report the
+    memory they allocated but no peak.
+    """
+
+    def __init__(self, enabled: bool = PROFILING_ENABLED, trace_memory: bool = False,
+                 max_records: int = PROFILE_MAX_RECORDS):
+        """Initialize an empty profiler."""
+        self.enabled = enabled
+        self.trace_memory = False
+        self._tracing = None
+        self._set_tracing(trace_memory)
+        self.records = deque(maxlen=max_records)
+        # Fields added to every record, e.g. the page that recorded it
+        self.context = {}
+        # Called with each new record, e.g. to refresh a live table
+        self.listener = None
+
+    def stage(self, name: str, rows=None, **details):
+        """Context manager timing the stage called name."""
+        if not self.enabled:
+            return _DISABLED_STAGE
+        return Stage(self, name, rows, details)
+
+    def configure(self, enabled: bool, trace_memory: bool = False) -> None:
+        """Turn recording and memory tracing on or off."""
+        self.enabled = enabled
+        self._set_tracing(enabled and trace_memory)
+
+    def _set_tracing(self, trace_memory: bool) -> None:
+        """Acquire or release the shared tracer; it is also released when the profiler is collected."""
+        if trace_memory and self._tracing is None:
+            _tracer.acquire()
+            self._tracing = weakref.finalize(self, _tracer.release)
+        elif not trace_memory and self._tracing is not None:
+            # Calling the finalizer releases the tracer once and detaches it
+            self._tracing()
+            self._tracing = None
+        self.trace_memory = trace_memory
+
+    def add(self, record: dict) -> None:
+        """Store a finished stage record."""
+        self.records.append(record)
+        if self.listener is not None:
+            self.listener(record)
+
+    def clear(self) -> None:
+        """Drop all records."""
+        self.records.clear()
+
+    def to_frame(self) -> pd.DataFrame:
+        """Records as a DataFrame, most recent last."""
+        return pd.DataFrame(list(self.records))
+
+    def to_json_lines(self) -> str:
+        """Records as JSON lines, one structured log entry per stage."""
+        return ''.join(json.dumps(record) + '\n' for record in self.records)
+
+    def write_json_lines(self, path: str) -> None:
+        """Append the records to a JSON-lines log file."""
+        with open(path, 'a') as f:
+            f.write(self.to_json_lines())
+
+
+def performance_panel(page: str) -> StageProfiler:
+    """
+    Show the collapsible performance panel in the sidebar and return the session profiler.
+
+    Call it at the top of a page and wrap the page's stages in profiler.stage().
+    Stages recorded while the page runs are added to the panel as they finish.
+    """
+    import streamlit as st
+
+    if 'profiler' not in st.session_state:
+        st.session_state['profiler'] = StageProfiler()
+    profiler = st.session_state['profiler']
+    profiler.context = {'page': page}
+
+    with st.sidebar.expander("Performance"):
+        enabled = st.checkbox("Record stage timings", value=profiler.enabled, key='profiling_enabled')
+        trace_memory = st.checkbox(
+            "Trace memory",
+            value=profiler.trace_memory,
+            key='profiling_trace_memory',
+            disabled=not enabled,
+            help="Measures allocations with tracemalloc, which slows the app down"
+        )
+        profiler.configure(enabled, trace_memory)
+
+        table = st.empty()
+
+        def show_records(record=None):
+            if profiler.records:
+                table.dataframe(profiler.to_frame().iloc[::-1], hide_index=True)
+            else:
+                table.caption("No stages recorded yet.")
+
+        show_records()
+        profiler.listener = show_records if enabled else None
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                "Export",
+                data=profiler.to_json_lines(),
+                file_name="stage_timings.jsonl",
+                mime="application/x-ndjson",
+                disabled=not profiler.records
+            )
+        with col2:
+            if st.button("Clear"):
+                profiler.clear()
+                show_records()
+    return profiler
@@ -0,0 +1,233 @@
+import numpy as np
+import pandas as pd
+
+# Magnitudes below this are counted as zero by the quantile sketch
+MIN_INDEXABLE_VALUE = 1e-12
+
+
+class _BucketStore:
+    """Dense counts of consecutive integer bucket keys."""
+
+    def __init__(self):
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, keys: np.ndarray) -> None:
+        """Count each key once."""
+        if len(keys):
+            low = int(keys.min())
+            self.add_counts(low, np.bincount(keys - low))
+
+    def add_counts(self, offset: int, counts: np.ndarray) -> None:
+        """Add counts of the keys offset, offset + 1, ..."""
+        if not len(counts):
+            return
+        if not len(self.counts):
+            self.offset, self.counts = offset, counts.astype(np.int64)
+            return
+        low = min(self.offset, offset)
+        high = max(self.offset + len(self.counts), offset + len(counts))
+        if (low, high) != (self.offset, self.offset + len(self.counts)):
+            grown = np.zeros(high - low, dtype=np.int64)
+            grown[self.offset - low:self.offset - low + len(self.counts)] = self.counts
+            self.offset, self.counts = low, grown
+        self.counts[offset - low:offset - low + len(counts)] += counts
+
+    def items(self) -> tuple:
+        """Keys and counts of the non-empty buckets, in increasing key order."""
+        nonzero = np.flatnonzero(self.counts)
+        return nonzero + self.offset, self.counts[nonzero]
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with a relative error guarantee (DDSketch).
+
+    Values are counted in logarithmic buckets whose bounds grow by a factor
+    gamma = (1 + alpha) / (1 - alpha). Every quantile estimate q' of a true
+    quantile q satisfies |q' - q| <= alpha * |q|, whatever the distribution,
+    and the number of buckets grows only with the logarithm of the value
+    range. Sketches with the same accuracy merge exactly, by adding bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """Initialize an empty sketch with relative accuracy alpha."""
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Relative accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self.gamma)
+        self.positive = _BucketStore()
+        self.negative = _BucketStore()
+        self.zero_count = 0
+        self.count = 0
+        # Exact extremes; estimates are clipped to them
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values) -> 'QuantileSketch':
+        """Add values to the sketch; missing and infinite values are ignored."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return self
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        if self.min > MIN_INDEXABLE_VALUE:
+            # Common case of all-positive data: no sign split needed
+            positive, negative = values, values[:0]
+        else:
+            positive = values[values > MIN_INDEXABLE_VALUE]
+            negative = -values[values < -MIN_INDEXABLE_VALUE]
+        self.positive.add(self._keys(positive))
+        self.negative.add(self._keys(negative))
+        self.zero_count += len(values) - len(positive) - len(negative)
+        self.count += len(values)
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Add the counts of another sketch with the same accuracy."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        self.positive.add_counts(other.positive.offset, other.positive.counts)
+        self.negative.add_counts(other.negative.offset, other.negative.counts)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """
+        Estimate one or more quantiles, q between 0 and 1.
+
+        Returns NaN when the sketch is empty.
+        """
+        q = np.asarray(q, dtype=np.float64)
+        if np.any((q < 0) | (q > 1)):
+            raise ValueError("Quantiles must be between 0 and 1")
+        if self.count == 0:
+            return np.full(q.shape, np.nan)[()]
+
+        negative_keys, negative_counts = self.negative.items()
+        positive_keys, positive_counts = self.positive.items()
+        # Buckets from the most negative value to the most positive one
+        values = np.concatenate([
+            -self._bucket_value(negative_keys[::-1]),
+            [0.0],
+            self._bucket_value(positive_keys)
+        ])
+        counts = np.concatenate([negative_counts[::-1], [self.zero_count], positive_counts])
+        cumulative = np.cumsum(counts)
+        index = np.searchsorted(cumulative, q * (self.count - 1), side='right')
+        return np.clip(values[index], self.min, self.max)[()]
+
+    def _keys(self, magnitudes: np.ndarray) -> np.ndarray:
+        """Bucket keys of positive magnitudes."""
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype(np.int64)
+
+    def _bucket_value(self, keys: np.ndarray) -> np.ndarray:
+        """Value within relative accuracy of every magnitude in a bucket."""
+        return 2 * self.gamma ** keys.astype(np.float64) / (self.gamma + 1)
+
+
+class StreamingStatistics:
+    """
+    Single-pass column statistics that can be fed chunk by chunk.
+
+    Count, mean, variance, minimum and maximum are accumulated exactly with
+    Welford's algorithm in its block form (Chan et al.), so each chunk is
+    reduced once and never kept. Medians and other quantiles come from one
+    QuantileSketch per column. Accumulators of different chunks or workers
+    can be merged, and are picklable.
+    """
+
+    def __init__(self, columns: list, relative_accuracy: float = 0.01):
+        """Initialize empty statistics for the given columns."""
+        self.columns = list(columns)
+        self.relative_accuracy = relative_accuracy
+        n_columns = len(self.columns)
+        self.count = np.zeros(n_columns, dtype=np.int64)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+        self.sketches = [QuantileSketch(relative_accuracy) for _ in self.columns]
+
+    def update(self, chunk) -> 'StreamingStatistics':
+        """
+        Add a chunk of rows.
+
+        Args:
+            chunk: DataFrame holding the columns, or an array with one column per statistic column.
+                Missing values are skipped per column.
+        """
+        if isinstance(chunk, pd.DataFrame):
+            chunk = chunk[self.columns].to_numpy(dtype=np.float64)
+        chunk = np.asarray(chunk, dtype=np.float64).reshape(-1, len(self.columns))
+        if not len(chunk):
+            return self
+        valid = np.isfinite(chunk)
+        if valid.all():
+            count = np.full(len(self.columns), len(chunk), dtype=np.int64)
+            mean = chunk.mean(axis=0)
+            m2 = ((chunk - mean) ** 2).sum(axis=0)
+            self._combine(count, mean, m2, chunk.min(axis=0), chunk.max(axis=0))
+        else:
+            count = valid.sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = np.where(count > 0, np.where(valid, chunk, 0.0).sum(axis=0) / count, 0.0)
+            m2 = (np.where(valid, chunk - mean, 0.0) ** 2).sum(axis=0)
+            self._combine(
+                count, mean, m2,
+                np.where(valid, chunk, np.inf).min(axis=0),
+                np.where(valid, chunk, -np.inf).max(axis=0)
+            )
+        # The sketches drop missing values themselves
+        for j, sketch in enumerate(self.sketches):
+            sketch.update(chunk[:, j])
+        return self
+
+    def merge(self, other: 'StreamingStatistics') -> 'StreamingStatistics':
+        """Add the statistics of another accumulator over the same columns."""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge statistics of different columns")
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+        return self
+
+    def _combine(self, count, mean, m2, minimum, maximum) -> None:
+        """Chan's pairwise update of counts, means and sums of squared deviations."""
+        total = self.count + count
+        delta = mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(total > 0, count / total, 0.0)
+        self.mean = self.mean + delta * weight
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * weight
+        self.count = total
+        self.min = np.minimum(self.min, minimum)
+        self.max = np.maximum(self.max, maximum)
+
+    def quantile(self, column: str, q):
+        """Approximate quantile(s) of a column, within the relative accuracy of the sketch."""
+        return self.sketches[self.columns.index(column)].quantile(q)
+
+    def result(self) -> dict:
+        """
+        Statistics per column in the format of DataProcessor.calculate_statistics.
+
+        The standard deviation is the sample one (ddof=1), like pandas; the
+        median is approximate.
+        """
+        stats = {}
+        for j, col in enumerate(self.columns):
+            n = self.count[j]
+            stats[col] = {
+                'mean': self.mean[j] if n else np.nan,
+                'std': np.sqrt(self.m2[j] / (n - 1)) if n > 1 else np.nan,
+                'min': self.min[j] if n else np.nan,
+                'max': self.max[j] if n else np.nan,
+                'median': self.sketches[j].quantile(0.5)
+            }
+        return stats
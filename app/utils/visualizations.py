@@ -1,12 +1,17 @@
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
-from config.settings import THEME_COLORS, PLOT_HEIGHT, PLOT_WIDTH
+from config.settings import (
+    THEME_COLORS, PLOT_HEIGHT, PLOT_WIDTH, PLOT_MAX_POINTS, HISTOGRAM_BINS, DENSITY_BINS
+)
+from utils.downsampling import downsample_frame
+
+# Plotly is imported inside the methods, so pages pay its import cost only once they draw a figure
 
 class Visualizer:
     @staticmethod
     def plot_correlation_matrix(df: pd.DataFrame):
         """Create a correlation matrix heatmap."""
+        import plotly.express as px
         corr = df.corr()
         fig = px.imshow(
             corr,
@@ -22,6 +27,7 @@ class Visualizer:
     @staticmethod
     def plot_feature_importance(feature_names: list, importance_values: list):
         """Create a feature importance bar plot."""
+        import plotly.express as px
         fig = px.bar(
             x=importance_values,
             y=feature_names,
@@ -39,12 +45,21 @@ class Visualizer:
         return fig
     
     @staticmethod
-    def plot_actual_vs_predicted(y_true: list, y_pred: list):
-        """Create scatter plot of actual vs predicted values."""
+    def plot_actual_vs_predicted(y_true: list, y_pred: list, max_points: int = PLOT_MAX_POINTS):
+        """
+        Create scatter plot of actual vs predicted values.
+        
+        Above max_points points the scatter is drawn with WebGL, which stays
+        responsive with hundreds of thousands of markers.
+        """
+        import plotly.graph_objects as go
+        y_true = np.asarray(y_true)
+        y_pred = np.asarray(y_pred)
+        scatter = go.Scattergl if len(y_true) > max_points else go.Scatter
         fig = go.Figure()
         
         # Add scatter plot
-        fig.add_trace(go.Scatter(
+        fig.add_trace(scatter(
             x=y_true,
             y=y_pred,
             mode='markers',
@@ -56,8 +71,8 @@ class Visualizer:
         ))
         
         # Add perfect prediction line
-        min_val = min(min(y_true), min(y_pred))
-        max_val = max(max(y_true), max(y_pred))
+        min_val = min(np.nanmin(y_true), np.nanmin(y_pred))
+        max_val = max(np.nanmax(y_true), np.nanmax(y_pred))
         fig.add_trace(go.Scatter(
             x=[min_val, max_val],
             y=[min_val, max_val],
@@ -80,12 +95,28 @@ class Visualizer:
         return fig
     
     @staticmethod
-    def plot_weight_over_time(df: pd.DataFrame):
-        """Create line plot of weight progression over time."""
+    def plot_weight_over_time(df: pd.DataFrame, window: tuple = None, max_points: int = PLOT_MAX_POINTS):
+        """
+        Create line plot of weight progression over time.
+        
+        Series longer than max_points are downsampled with LTTB, which keeps
+        the peaks and dips of the curve. Passing a (start, stop) row window
+        re-renders that part of the raw data, so zooming in shows full detail
+        once the window holds max_points rows or fewer.
+        """
+        import plotly.express as px
+        if window is not None:
+            df = df.iloc[window[0]:window[1]]
+        n_points = len(df)
+        df = downsample_frame(df, 'Weight', max_points)
+        
+        title = 'Weight Progression Over Time'
+        if len(df) < n_points:
+            title += f' ({len(df):,} of {n_points:,} points)'
         fig = px.line(
             df,
             y='Weight',
-            title='Weight Progression Over Time',
+            title=title,
             markers=True
         )
         
@@ -99,20 +130,74 @@ class Visualizer:
         return fig
     
     @staticmethod
-    def plot_feature_distribution(df: pd.DataFrame, column: str):
-        """Create histogram of feature distribution."""
-        fig = px.histogram(
-            df,
-            x=column,
+    def plot_feature_distribution(df: pd.DataFrame, column: str, bins: int = HISTOGRAM_BINS):
+        """
+        Create histogram of feature distribution.
+        
+        Bin counts are computed with NumPy and only the bins are sent to the
+        browser, so the figure has the same size for any number of rows.
+        Missing and infinite values are left out.
+        """
+        import plotly.graph_objects as go
+        values = df[column].to_numpy(dtype=np.float64)
+        values = values[np.isfinite(values)]
+        counts, edges = np.histogram(values, bins=bins) if len(values) else (np.array([]), np.array([0.0]))
+        
+        fig = go.Figure(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            marker_color=THEME_COLORS['secondary'],
+            name=column
+        ))
+        
+        fig.update_layout(
             title=f'Distribution of {column}',
-            color_discrete_sequence=[THEME_COLORS['secondary']]
+            height=PLOT_HEIGHT,
+            width=PLOT_WIDTH,
+            xaxis_title=column,
+            yaxis_title='Count',
+            bargap=0
         )
         
+        return fig
+    
+    @staticmethod
+    def plot_density_heatmap(df: pd.DataFrame, x: str, y: str, bins: int = DENSITY_BINS):
+        """
+        Create 2D binned density heatmap of two columns.
+        
+        An alternative to a scatter plot for large datasets: rows are counted
+        into a bins x bins grid on the server, so the payload does not grow
+        with the number of rows. Empty cells are left blank.
+        """
+        import plotly.graph_objects as go
+        values = df[[x, y]].to_numpy(dtype=np.float64)
+        values = values[np.isfinite(values).all(axis=1)]
+        counts, x_edges, y_edges = np.histogram2d(values[:, 0], values[:, 1], bins=bins)
+        counts[counts == 0] = np.nan
+        
+        fig = go.Figure(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            # histogram2d counts are indexed [x, y]; heatmap rows run along y
+            z=counts.T,
+            colorscale='Viridis',
+            colorbar=dict(title='Count'),
+            hovertemplate=f'{x}: %{{x:.2f}}<br>{y}: %{{y:.2f}}<br>Count: %{{z}}<extra></extra>'
+        ))
+        
         fig.update_layout(
+            title=f'{x} vs {y} (density)',
             height=PLOT_HEIGHT,
             width=PLOT_WIDTH,
-            xaxis_title=column,
-            yaxis_title='Count'
+            xaxis_title=x,
+            yaxis_title=y
         )
         
-        return fig
\ No newline at end of file
+        return fig
+    
+    @staticmethod
+    def payload_size(fig) -> int:
+        """Size in bytes of the JSON a figure is sent to the browser as."""
+        return len(fig.to_json().encode('utf-8'))
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Compare loading a saved model as a joblib pickle and as a compact artifact.
+
+Usage (from the repository root):
+    python benchmarks/artifact_load.py --repeats 50
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app')
+sys.path.insert(0, APP_DIR)
+
+from config.settings import FEATURE_COLUMNS, TARGET_COLUMN  # noqa: E402
+from models.artifact import ModelArtifact  # noqa: E402
+from models.polynomial_regression import PoultryWeightPredictor  # noqa: E402
+from utils.data_processor import DataProcessor  # noqa: E402
+from synthetic import make_dataset  # noqa: E402
+
+COLD_LOAD_SCRIPTS = {
+    'joblib': "import joblib; joblib.load({path!r})['model']",
+    'artifact': "from models.artifact import ModelArtifact; ModelArtifact.load({path!r}).predictor",
+}
+
+
+def train_model(n_rows: int, seed: int = 0):
+    """Train a model on synthetic poultry data."""
+    df = make_dataset(n_rows, seed)
+    data_processor = DataProcessor()
+    data_processor.scaler.fit(df[FEATURE_COLUMNS])
+    data_processor.is_fitted = True
+    model = PoultryWeightPredictor().train(data_processor.scale_features(df), df[TARGET_COLUMN])
+    return model, data_processor
+
+
+def time_call(func, repeats: int) -> float:
+    """Median wall time of func in milliseconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def time_cold_load(kind: str, path: str, repeats: int) -> float:
+    """Median time in milliseconds to load a model in a fresh interpreter, imports included."""
+    code = f"import sys; sys.path.insert(0, {APP_DIR!r}); " + COLD_LOAD_SCRIPTS[kind].format(path=path)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True, capture_output=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10_000, help="Rows of synthetic training data")
+    parser.add_argument('--repeats', type=int, default=50, help="Warm load repetitions")
+    parser.add_argument('--cold-repeats', type=int, default=5, help="Fresh-interpreter load repetitions")
+    args = parser.parse_args()
+
+    import joblib
+
+    model, data_processor = train_model(args.rows)
+    with tempfile.TemporaryDirectory() as directory:
+        joblib_path = os.path.join(directory, 'model.joblib')
+        artifact_path = os.path.join(directory, 'model.pwm')
+        joblib.dump({'model': model, 'data_processor': data_processor}, joblib_path)
+        ModelArtifact.from_model(model, data_processor).save(artifact_path)
+
+        results = {
+            'file_size_bytes': {
+                'joblib': os.path.getsize(joblib_path),
+                'artifact': os.path.getsize(artifact_path),
+            },
+            'warm_load_ms': {
+                'joblib': time_call(lambda: joblib.load(joblib_path), args.repeats),
+                'artifact': time_call(lambda: ModelArtifact.load(artifact_path).predictor, args.repeats),
+                'artifact_no_mmap': time_call(
+                    lambda: ModelArtifact.load(artifact_path, mmap=False).predictor, args.repeats
+                ),
+            },
+            'cold_load_ms': {
+                kind: time_cold_load(kind, path, args.cold_repeats)
+                for kind, path in (('joblib', joblib_path), ('artifact', artifact_path))
+            },
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Compare the default float64 training pipeline with compact (float32) mode.
+
+For each dataset size, both modes preprocess, split and scale the same
+synthetic data, train the model and evaluate it on the test split. The
+script reports the bytes of the scaled feature matrices, the peak traced
+memory and wall time of preparing them, and the relative change of each
+test metric. It exits with status 1 if any metric changes by more than the
+tolerance.
+
+Usage (from the repository root):
+    python benchmarks/compact_memory.py --sizes 100000 1000000
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app')
+sys.path.insert(0, APP_DIR)
+
+from config.settings import COMPACT_METRICS_RTOL  # noqa: E402
+from synthetic import make_dataset  # noqa: E402
+from models.model_utils import compare_metrics  # noqa: E402
+from models.polynomial_regression import PoultryWeightPredictor  # noqa: E402
+from utils.data_processor import DataProcessor  # noqa: E402
+
+
+def run_mode(df, compact: bool) -> dict:
+    """Prepare, train and evaluate in one mode; returns memory, timings and test metrics."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        data_processor = DataProcessor()
+        df_processed = data_processor.preprocess_data(df, fast=True, compact=compact)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            X_train, X_test, y_train, y_test = data_processor.prepare_features(df_processed, compact=compact)
+            prepare_ms = (time.perf_counter() - start) * 1000
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        start = time.perf_counter()
+        model = PoultryWeightPredictor().train(X_train, y_train)
+        train_ms = (time.perf_counter() - start) * 1000
+        metrics, _ = model.evaluate(X_test, y_test)
+
+    return {
+        'processed_feature_bytes': data_processor.preprocessing_report['memory']['after_bytes'] if compact else None,
+        'matrix_bytes': data_processor.memory_report['bytes'],
+        'prepare_peak_bytes': peak,
+        'prepare_ms': prepare_ms,
+        'train_ms': train_ms,
+        'metrics': {name: float(value) for name, value in metrics.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000], help="Dataset sizes in rows")
+    parser.add_argument('--rtol', type=float, default=COMPACT_METRICS_RTOL, help="Largest accepted relative metric change")
+    args = parser.parse_args()
+
+    results = {}
+    passed = True
+    for n_rows in args.sizes:
+        df = make_dataset(n_rows)
+        default = run_mode(df, compact=False)
+        compact = run_mode(df, compact=True)
+        comparison = compare_metrics(default['metrics'], compact['metrics'], args.rtol)
+        passed = passed and comparison['within_tolerance']
+        results[n_rows] = {
+            'default': default,
+            'compact': compact,
+            'matrix_bytes_saved': default['matrix_bytes'] - compact['matrix_bytes'],
+            'metric_differences': comparison['differences'],
+            'within_tolerance': comparison['within_tolerance'],
+        }
+    print(json.dumps(results, indent=2))
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""
+Time and measure peak memory of the data, model and visualization hot paths.
+
+Every benchmark runs on synthetic poultry datasets of each requested size and
+reports the median wall time and the peak traced allocation. Results are
+written as JSON so runs can be compared over time.
+
+Usage (from the repository root):
+    python benchmarks/hot_paths.py --output results.json
+    python benchmarks/hot_paths.py --sizes 1000 100000 --baseline results.json
+    python benchmarks/hot_paths.py --include-10m
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+import numpy as np
+import pandas as pd
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app')
+sys.path.insert(0, APP_DIR)
+
+from config.settings import FEATURE_COLUMNS, TARGET_COLUMN  # noqa: E402
+from models.polynomial_regression import PoultryWeightPredictor  # noqa: E402
+from utils.data_processor import DataProcessor  # noqa: E402
+from utils.visualizations import Visualizer  # noqa: E402
+from synthetic import make_dataset  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+LARGE_SIZE = 10_000_000
+
+
+def measure(func, repeats: int) -> dict:
+    """
+    Median and minimum wall time of func in milliseconds, and its peak memory.
+
+    Peak memory comes from a first traced run, which also warms up lazy
+    imports and caches; the timed runs that follow are not traced, so
+    tracemalloc overhead does not distort the timings.
+    """
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'median_ms': float(np.median(timings)),
+        'min_ms': float(np.min(timings)),
+        'peak_mb': peak / 1024 ** 2,
+        'repeats': repeats
+    }
+
+
+def benchmark_size(n_rows: int, repeats: int, plot_max_rows: int) -> list:
+    """Run every benchmark on a dataset of n_rows rows."""
+    df = make_dataset(n_rows)
+    with contextlib.redirect_stdout(io.StringIO()):
+        data_processor = DataProcessor()
+        df_processed = data_processor.preprocess_data(df)
+        X_train, X_test, y_train, y_test = data_processor.prepare_features(df_processed)
+        model = PoultryWeightPredictor().train(X_train, y_train)
+    y_pred = model.predict(X_test)
+    importance = model.get_feature_importance(FEATURE_COLUMNS)
+
+    benchmarks = {
+        'preprocess_data': lambda: DataProcessor().preprocess_data(df),
+        'preprocess_data_fast': lambda: DataProcessor().preprocess_data(df, fast=True),
+        'prepare_features': lambda: data_processor.prepare_features(df_processed),
+        'train': lambda: PoultryWeightPredictor().train(X_train, y_train),
+        'predict': lambda: model.predict(X_test),
+        'evaluate': lambda: model.evaluate(X_test, y_test),
+        'calculate_statistics': lambda: DataProcessor.calculate_statistics(df_processed),
+        'calculate_statistics_approximate': lambda: DataProcessor.calculate_statistics(
+            df_processed, approximate=True
+        ),
+        'detect_outliers': lambda: DataProcessor.detect_outliers(df_processed, TARGET_COLUMN),
+    }
+    plots = {
+        'plot_correlation_matrix': lambda: Visualizer.plot_correlation_matrix(df_processed),
+        'plot_feature_importance': lambda: Visualizer.plot_feature_importance(
+            list(importance.keys()), list(importance.values())
+        ),
+        'plot_actual_vs_predicted': lambda: Visualizer.plot_actual_vs_predicted(y_test, y_pred),
+        'plot_weight_over_time': lambda: Visualizer.plot_weight_over_time(df_processed),
+        'plot_feature_distribution': lambda: Visualizer.plot_feature_distribution(df_processed, TARGET_COLUMN),
+        'plot_density_heatmap': lambda: Visualizer.plot_density_heatmap(df_processed, 'Feed Intake', TARGET_COLUMN),
+    }
+
+    results = []
+    for name, func in {**benchmarks, **plots}.items():
+        record = {'benchmark': name, 'rows': n_rows}
+        if name in plots and n_rows > plot_max_rows:
+            record['skipped'] = f"more than {plot_max_rows} rows"
+        else:
+            record.update(measure(func, repeats))
+        results.append(record)
+        print(f"{name:<34} {n_rows:>10} rows  "
+              + (record.get('skipped') or f"{record['median_ms']:>10.2f} ms  {record['peak_mb']:>9.2f} MB"),
+              file=sys.stderr)
+    return results
+
+
+def environment() -> dict:
+    """Versions and machine details recorded with every run."""
+    import plotly
+    import sklearn
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(APP_DIR), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': pd.Timestamp.now().isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'scikit-learn': sklearn.__version__,
+        'plotly': plotly.__version__,
+    }
+
+
+def compare(results: list, baseline_path: str) -> None:
+    """Print the speed-up of each benchmark relative to a previous run."""
+    with open(baseline_path) as f:
+        baseline = {
+            (r['benchmark'], r['rows']): r for r in json.load(f)['results'] if 'median_ms' in r
+        }
+    print(f"\n{'benchmark':<34} {'rows':>10}  {'baseline ms':>12}  {'current ms':>12}  {'speed-up':>8}",
+          file=sys.stderr)
+    for record in results:
+        previous = baseline.get((record['benchmark'], record['rows']))
+        if previous is None or 'median_ms' not in record:
+            continue
+        print(f"{record['benchmark']:<34} {record['rows']:>10}  {previous['median_ms']:>12.2f}  "
+              f"{record['median_ms']:>12.2f}  {previous['median_ms'] / record['median_ms']:>7.2f}x",
+              file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="Dataset sizes in rows")
+    parser.add_argument('--include-10m', action='store_true', help="Also run the 10M-row dataset")
+    parser.add_argument('--repeats', type=int, default=3, help="Timed repetitions below 1M rows")
+    parser.add_argument('--plot-max-rows', type=int, default=1_000_000,
+                        help="Skip Visualizer benchmarks on larger datasets")
+    parser.add_argument('--output', help="Write the JSON results to this file instead of stdout")
+    parser.add_argument('--baseline', help="Previous JSON results to compare against")
+    args = parser.parse_args()
+    # Deprecation notices from the libraries would drown out the progress lines
+    warnings.simplefilter('ignore', FutureWarning)
+    warnings.simplefilter('ignore', DeprecationWarning)
+
+    sizes = sorted(set(args.sizes) | ({LARGE_SIZE} if args.include_10m else set()))
+    results = []
+    for n_rows in sizes:
+        repeats = args.repeats if n_rows < 1_000_000 else 1
+        results.extend(benchmark_size(n_rows, repeats, args.plot_max_rows))
+
+    report = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Compare the full polynomial expansion with selective expansions.
+
+For each degree, the model is trained with every term up to that degree and
+with each selective mode: interaction terms only, and every feature capped
+at the given maximum power. The script reports the number of terms, the
+bytes of the training design matrix, the peak traced memory and wall time
+of train(), and the test R² of each mode.
+
+Usage (from the repository root):
+    python benchmarks/selective_expansion.py --rows 200000 --degrees 3 4 5
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app')
+sys.path.insert(0, APP_DIR)
+
+from synthetic import make_dataset  # noqa: E402
+from models.polynomial_regression import PoultryWeightPredictor  # noqa: E402
+from utils.data_processor import DataProcessor  # noqa: E402
+
+
+def run_mode(X_train, X_test, y_train, y_test, **options) -> dict:
+    """Train and evaluate one expansion mode; returns its size, memory, timing and test R²."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = PoultryWeightPredictor(**options)
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            model.train(X_train, y_train)
+            train_ms = (time.perf_counter() - start) * 1000
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        metrics, _ = model.evaluate(X_test, y_test)
+
+    n_terms = len(model.model.named_steps['poly'].powers_)
+    return {
+        'terms': n_terms,
+        'design_bytes': len(X_train) * n_terms * 8,
+        'train_peak_bytes': peak,
+        'train_ms': train_ms,
+        'test_r2': float(metrics['r2']),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200_000, help="Dataset size in rows")
+    parser.add_argument('--degrees', type=int, nargs='+', default=[3, 4, 5], help="Polynomial degrees to compare")
+    parser.add_argument('--max-power', type=int, default=2, help="Per-feature power cap of the capped mode")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        data_processor = DataProcessor()
+        df_processed = data_processor.preprocess_data(make_dataset(args.rows), fast=True)
+        X_train, X_test, y_train, y_test = data_processor.prepare_features(df_processed)
+
+    results = {}
+    for degree in args.degrees:
+        results[degree] = {
+            'full': run_mode(X_train, X_test, y_train, y_test, degree=degree),
+            'interaction_only': run_mode(X_train, X_test, y_train, y_test, degree=degree, interaction_only=True),
+            f'max_power_{args.max_power}': run_mode(
+                X_train, X_test, y_train, y_test, degree=degree, max_power=args.max_power
+            ),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Profile the import cost of the app's entry points at cold start.
+
+Each target is imported in a fresh interpreter run with `python -X importtime`.
+For every target the script reports the total import time, the slowest
+modules by cumulative time, the import time per top-level package, and which
+heavy optional libraries were loaded. Page modules are executed up to their
+imports (app() is not called), just as Streamlit's first render does, so the
+pages need streamlit to be installed.
+
+The prediction path must load neither scikit-learn nor plotly; the script
+exits with status 1 if it does.
+
+Usage (from the repository root):
+    python benchmarks/startup_profile.py
+    python benchmarks/startup_profile.py --targets prediction main --top 15 --output startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+import numpy as np
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app')
+PAGES_DIR = os.path.join(APP_DIR, 'pages')
+
+HEAVY_PACKAGES = ('sklearn', 'scipy', 'plotly', 'joblib', 'statsmodels', 'streamlit')
+
+# Code run in the child interpreter for each target
+TARGETS = {
+    'prediction': (
+        "import models.artifact, models.registry, models.inference, models.batch_prediction"
+    ),
+    'training': (
+        "import models.polynomial_regression, models.model_selection, models.cross_validation, "
+        "utils.data_processor; models.polynomial_regression.PoultryWeightPredictor()"
+    ),
+    'main': "import main",
+}
+for _name in sorted(os.listdir(PAGES_DIR)):
+    if _name.endswith('.py') and _name[0].isdigit():
+        TARGETS[f'pages/{_name[:-3]}'] = (
+            "import importlib.util; "
+            f"spec = importlib.util.spec_from_file_location('page', {os.path.join(PAGES_DIR, _name)!r}); "
+            "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+        )
+
+# Libraries each target must not import
+FORBIDDEN = {
+    'prediction': ('sklearn', 'plotly'),
+}
+
+REPORT_LOADED = (
+    "; import sys, json; "
+    f"print(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}} & set({list(HEAVY_PACKAGES)!r}))))"
+)
+
+
+def parse_importtime(stderr: str) -> list:
+    """(module, self_us, cumulative_us, depth) for every line of -X importtime output."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        records.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return records
+
+
+def profile_target(code: str) -> dict:
+    """Import time records and loaded heavy packages of one run of code."""
+    env = dict(os.environ, PYTHONPATH=APP_DIR + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code + REPORT_LOADED],
+        cwd=APP_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()
+        return {'error': error[-1] if error else f"exit status {result.returncode}"}
+    return {
+        'records': parse_importtime(result.stderr),
+        'loaded': json.loads(result.stdout.strip().splitlines()[-1]),
+    }
+
+
+def summarize(runs: list, top: int) -> dict:
+    """Median import times over repeated runs of one target."""
+    totals = [sum(record[1] for record in run['records']) for run in runs]
+    cumulative = defaultdict(list)
+    packages = defaultdict(list)
+    for run in runs:
+        per_package = defaultdict(int)
+        for name, self_us, cumulative_us, _ in run['records']:
+            cumulative[name].append(cumulative_us)
+            per_package[name.split('.')[0]] += self_us
+        for package, self_us in per_package.items():
+            packages[package].append(self_us)
+
+    def median_ms(values):
+        return float(np.median(values)) / 1000
+
+    slowest = sorted(cumulative, key=lambda name: median_ms(cumulative[name]), reverse=True)[:top]
+    by_package = sorted(packages, key=lambda package: median_ms(packages[package]), reverse=True)[:top]
+    return {
+        'total_ms': median_ms(totals),
+        'slowest_modules_ms': {name: median_ms(cumulative[name]) for name in slowest},
+        'packages_ms': {package: median_ms(packages[package]) for package in by_package},
+        'loaded': runs[-1]['loaded'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--targets', nargs='+', choices=list(TARGETS), default=list(TARGETS),
+                        help="Entry points to profile")
+    parser.add_argument('--repeats', type=int, default=3, help="Fresh interpreter runs per target")
+    parser.add_argument('--top', type=int, default=10, help="Modules and packages listed per target")
+    parser.add_argument('--output', help="Write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {}
+    violations = []
+    for target in args.targets:
+        runs = [profile_target(TARGETS[target]) for _ in range(args.repeats)]
+        failed = [run for run in runs if 'error' in run]
+        if failed:
+            results[target] = {'error': failed[0]['error']}
+            print(f"{target:<28} failed: {failed[0]['error']}")
+            continue
+        summary = summarize(runs, args.top)
+        results[target] = summary
+
+        print(f"{target:<28} {summary['total_ms']:>9.1f} ms   loaded: {', '.join(summary['loaded']) or '-'}")
+        for package, ms in summary['packages_ms'].items():
+            print(f"    {package:<40} {ms:>9.1f} ms")
+        forbidden = [package for package in FORBIDDEN.get(target, ()) if package in summary['loaded']]
+        if forbidden:
+            violations.append(f"{target} imports {', '.join(forbidden)}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    for violation in violations:
+        print(f"ERROR: {violation}")
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == '__main__':
+    main()
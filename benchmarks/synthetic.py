@@ -0,0 +1,26 @@
+"""
+Synthetic poultry datasets shared by the benchmarks and the test suite.
+
+Importers put the app directory on sys.path first, as the benchmark scripts
+and tests/conftest.py do.
+"""
+import numpy as np
+import pandas as pd
+from config.settings import TARGET_COLUMN
+
+
+def make_dataset(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic poultry dataset with the columns of the required data format."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Int Temp': rng.normal(30, 2, n_rows),
+        'Int Humidity': rng.normal(65, 5, n_rows),
+        'Air Temp': rng.normal(28, 3, n_rows),
+        'Wind Speed': rng.uniform(0, 8, n_rows),
+        'Feed Intake': rng.normal(150, 10, n_rows),
+    })
+    df[TARGET_COLUMN] = (
+        1000 + 5 * df['Int Temp'] - 2 * df['Int Humidity'] + 3 * df['Feed Intake']
+        + 0.05 * (df['Feed Intake'] - 150) ** 2 + rng.normal(0, 10, n_rows)
+    )
+    return df
@@ -0,0 +1,34 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The app modules import each other from the app directory, like Streamlit runs them
+APP_DIR = os.path.join(ROOT_DIR, 'app')
+sys.path.insert(0, APP_DIR)
+# The synthetic datasets are shared with the benchmarks
+sys.path.insert(0, os.path.join(ROOT_DIR, 'benchmarks'))
+
+from utils.data_processor import DataProcessor  # noqa: E402
+from synthetic import make_dataset  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def poultry_data():
+    """Raw data, its fitted DataProcessor, the scaled train/test split and the unscaled test rows."""
+    raw = make_dataset(4000)
+    data_processor = DataProcessor()
+    processed = data_processor.preprocess_data(raw, fast=True)
+    X_train, X_test, y_train, y_test = data_processor.prepare_features(processed)
+    return SimpleNamespace(
+        raw=raw,
+        processed=processed,
+        data_processor=data_processor,
+        X_train=X_train,
+        X_test=X_test,
+        y_train=y_train.to_numpy(),
+        y_test=y_test.to_numpy(),
+        test_rows=processed.loc[y_test.index].reset_index(drop=True)
+    )
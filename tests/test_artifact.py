@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from config.settings import FEATURE_COLUMNS
+from models.artifact import ModelArtifact
+from models.inference import CompiledPredictor
+from models.model_utils import SufficientStatistics
+from models.polynomial_regression import PoultryWeightPredictor
+
+
+@pytest.fixture(scope='module')
+def trained_model(poultry_data):
+    return PoultryWeightPredictor(degree=3).train(poultry_data.X_train, poultry_data.y_train)
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_artifact_round_trip(tmp_path, poultry_data, trained_model, mmap):
+    artifact = ModelArtifact.from_model(
+        trained_model, poultry_data.data_processor, metadata={'training_metrics': {'r2': 0.9}}
+    )
+    loaded = ModelArtifact.load(artifact.save(str(tmp_path / 'model.pwm')), mmap=mmap)
+
+    assert loaded.metadata == {'training_metrics': {'r2': 0.9}}
+    assert loaded.feature_columns == FEATURE_COLUMNS
+    assert set(loaded.arrays) == set(artifact.arrays)
+    for name, array in artifact.arrays.items():
+        np.testing.assert_array_equal(loaded.arrays[name], array)
+
+    expected = CompiledPredictor.from_model(trained_model, poultry_data.data_processor).predict(poultry_data.test_rows)
+    np.testing.assert_array_equal(loaded.predictor.predict(poultry_data.test_rows), expected)
+
+
+def test_artifact_keeps_training_statistics(tmp_path, poultry_data, trained_model):
+    path = ModelArtifact.from_model(trained_model, poultry_data.data_processor).save(str(tmp_path / 'model.pwm'))
+    statistics = SufficientStatistics.from_dict(ModelArtifact.load(path).statistics_dict())
+
+    coef, intercept = statistics.solve()
+    regressor = trained_model.model.named_steps['regressor']
+    np.testing.assert_allclose(coef[1:], regressor.coef_[1:], rtol=1e-8)
+    assert intercept == pytest.approx(regressor.intercept_, rel=1e-10)
+
+
+def test_loading_rejects_other_files(tmp_path):
+    path = tmp_path / 'model.pwm'
+    path.write_bytes(b'not an artifact')
+    with pytest.raises(ValueError, match='not a valid model artifact'):
+        ModelArtifact.load(str(path))
+    with pytest.raises(FileNotFoundError):
+        ModelArtifact.load(str(tmp_path / 'missing.pwm'))
@@ -0,0 +1,96 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.settings import FEATURE_COLUMNS
+from models.batch_prediction import (
+    INTERVAL_COLUMNS,
+    OUTPUT_PREFIX,
+    PREDICTION_COLUMN,
+    BatchPredictionEngine,
+    remove_stale_outputs
+)
+from models.inference import CompiledPredictor
+from models.polynomial_regression import PoultryWeightPredictor
+
+
+@pytest.fixture(scope='module')
+def predictor(poultry_data):
+    model = PoultryWeightPredictor(degree=2).train(poultry_data.X_train, poultry_data.y_train)
+    return CompiledPredictor.from_model(model, poultry_data.data_processor)
+
+
+@pytest.fixture
+def input_csv(tmp_path, poultry_data):
+    path = tmp_path / 'input.csv'
+    poultry_data.test_rows.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize('chunksize', [1, 7, 100, 10_000])
+def test_chunked_output_matches_predict(tmp_path, predictor, poultry_data, input_csv, chunksize):
+    progress = []
+    engine = BatchPredictionEngine(predictor, chunksize=chunksize, preview_rows=25)
+    result = engine.run(str(input_csv), str(tmp_path / 'out.csv'), progress_callback=progress.append)
+
+    rows = poultry_data.test_rows
+    output = pd.read_csv(result['output_path'])
+    np.testing.assert_allclose(output[PREDICTION_COLUMN], predictor.predict(rows), rtol=1e-12)
+    pd.testing.assert_frame_equal(output[rows.columns], rows, check_exact=False, rtol=1e-12)
+    assert result['rows'] == len(rows)
+    assert result['chunks'] == -(-len(rows) // chunksize)
+    assert progress[-1] == len(rows)
+    assert len(result['preview']) == 25
+    assert result['statistics']['count'] == len(rows)
+    assert result['statistics']['mean'] == pytest.approx(output[PREDICTION_COLUMN].mean(), rel=1e-12)
+
+
+def test_invalid_rows_are_written_as_nan(tmp_path, predictor, poultry_data):
+    rows = poultry_data.test_rows.head(20).astype({'Feed Intake': object, 'Int Temp': object})
+    rows.loc[3, 'Feed Intake'] = 'n/a'
+    rows.loc[11, 'Int Temp'] = np.nan
+    path = tmp_path / 'input.csv'
+    rows.to_csv(path, index=False)
+
+    result = BatchPredictionEngine(predictor, chunksize=8).run(str(path), str(tmp_path / 'out.csv'))
+    predictions = pd.read_csv(result['output_path'])[PREDICTION_COLUMN]
+
+    assert result['invalid_rows'] == 2
+    assert predictions.isna().tolist() == [i in (3, 11) for i in range(20)]
+    assert result['statistics']['count'] == 18
+
+
+def test_interval_columns(tmp_path, predictor, poultry_data, input_csv):
+    engine = BatchPredictionEngine(predictor, chunksize=64, interval_level=0.9)
+    output = pd.read_csv(engine.run(str(input_csv), str(tmp_path / 'out.csv'))['output_path'])
+
+    expected = predictor.predict_interval(poultry_data.test_rows, 0.9)
+    np.testing.assert_allclose(output[PREDICTION_COLUMN], expected['prediction'], rtol=1e-12)
+    for key, column in INTERVAL_COLUMNS.items():
+        np.testing.assert_allclose(output[column], expected[key], rtol=1e-12)
+
+
+def test_missing_columns_remove_the_output(tmp_path, predictor, poultry_data):
+    path = tmp_path / 'input.csv'
+    poultry_data.test_rows.drop(columns=['Wind Speed']).to_csv(path, index=False)
+    output_path = tmp_path / 'out.csv'
+
+    with pytest.raises(ValueError, match='Wind Speed'):
+        BatchPredictionEngine(predictor).run(str(path), str(output_path))
+    assert not output_path.exists()
+
+
+def test_remove_stale_outputs(tmp_path):
+    old, new, other = (tmp_path / f"{OUTPUT_PREFIX}old.csv", tmp_path / f"{OUTPUT_PREFIX}new.csv",
+                       tmp_path / 'other.csv')
+    for path in (old, new, other):
+        path.write_text(','.join(FEATURE_COLUMNS))
+    an_hour_ago = time.time() - 3600
+    os.utime(old, (an_hour_ago, an_hour_ago))
+    os.utime(other, (an_hour_ago, an_hour_ago))
+
+    assert remove_stale_outputs(str(tmp_path), max_age_s=60) == 1
+    assert not old.exists() and new.exists() and other.exists()
@@ -0,0 +1,113 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.cache import DatasetCache, copy_processor
+
+
+def make_entry(n_rows: int = 100) -> dict:
+    return {'data': pd.DataFrame({'value': np.arange(n_rows, dtype=np.float64)})}
+
+
+def test_evicts_least_recently_used_entries():
+    cache = DatasetCache(max_bytes=10 ** 9, max_entries=2)
+    cache.put('a', make_entry())
+    cache.put('b', make_entry())
+    assert cache.get('a') is not None
+    cache.put('c', make_entry())
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    assert cache.stats()['entries'] == 2
+
+
+def test_evicts_entries_over_the_byte_budget():
+    entry_bytes = DatasetCache._entry_size(make_entry())
+    cache = DatasetCache(max_bytes=2 * entry_bytes, max_entries=10)
+    for key in 'abc':
+        cache.put(key, make_entry())
+
+    assert cache.get('a') is None
+    assert cache.stats()['bytes'] == 2 * entry_bytes
+    # An entry larger than the whole budget is returned but not kept
+    large = make_entry(1000)
+    assert cache.put('large', large) is large
+    assert cache.get('large') is None
+
+
+def test_make_key_depends_on_data_and_settings():
+    key = DatasetCache.make_key(b'data', {'fast': True, 'compact': False})
+    assert key == DatasetCache.make_key(b'data', {'compact': False, 'fast': True})
+    assert key != DatasetCache.make_key(b'data', {'fast': True, 'compact': True})
+    assert key != DatasetCache.make_key(b'other', {'fast': True, 'compact': False})
+
+
+def test_get_or_compute_computes_once_for_concurrent_callers():
+    cache = DatasetCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return make_entry()
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_compute('key', compute)))
+    leader.start()
+    assert started.wait(5)
+    waiters = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute('key', compute)))
+        for _ in range(4)
+    ]
+    for thread in waiters:
+        thread.start()
+    release.set()
+    for thread in [leader, *waiters]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 5
+    assert all(entry is results[0][0] for entry, _ in results)
+    assert sorted(hit for _, hit in results) == [False, True, True, True, True]
+
+
+def test_failed_computation_lets_the_next_caller_retry():
+    cache = DatasetCache()
+
+    def fail():
+        raise RuntimeError('parse error')
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute('key', fail)
+    entry, hit = cache.get_or_compute('key', make_entry)
+
+    assert not hit
+    assert cache.get('key') is entry
+
+
+def test_failed_validation_recomputes():
+    cache = DatasetCache()
+    stale, _ = cache.get_or_compute('key', make_entry)
+
+    entry, hit = cache.get_or_compute('key', make_entry, validate=lambda cached: cached is not stale)
+    assert not hit
+    assert entry is not stale
+    assert cache.get_or_compute('key', make_entry, validate=lambda cached: True) == (entry, True)
+
+
+def test_copy_processor_returns_an_independent_copy(poultry_data):
+    entry = {'data_processor': poultry_data.data_processor}
+    processor = copy_processor(entry)
+    mean = poultry_data.data_processor.scaler.mean_.copy()
+
+    assert processor is not poultry_data.data_processor
+    np.testing.assert_array_equal(processor.scaler.mean_, mean)
+    processor.scaler.mean_ += 1
+    processor.preprocessing_report = {}
+    np.testing.assert_array_equal(poultry_data.data_processor.scaler.mean_, mean)
+    assert poultry_data.data_processor.preprocessing_report != {}
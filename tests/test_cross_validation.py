@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures
+
+from config.settings import FEATURE_COLUMNS
+from models.cross_validation import cross_validate_polynomial, kfold_indices
+from models.features import SelectivePolynomialFeatures
+
+
+def refit_folds(X, y, n_splits, poly):
+    """Test metrics of every fold, refitted from scratch by scikit-learn."""
+    folds = kfold_indices(len(X), n_splits)
+    records = []
+    for rows in folds:
+        train = np.setdiff1d(np.arange(len(X)), rows)
+        model = make_pipeline(poly, LinearRegression()).fit(X[train], y[train])
+        y_pred = model.predict(X[rows])
+        records.append((mean_squared_error(y[rows], y_pred), r2_score(y[rows], y_pred)))
+    return np.array(records)
+
+
+@pytest.mark.parametrize('degree', [1, 2, 3])
+def test_downdated_folds_match_refits(poultry_data, degree):
+    X, y = poultry_data.X_train, poultry_data.y_train
+    results = cross_validate_polynomial(X, y, n_splits=5, degree=degree)
+
+    expected = refit_folds(X, y, 5, PolynomialFeatures(degree=degree))
+    np.testing.assert_allclose(results['folds']['mse'], expected[:, 0], rtol=1e-7)
+    np.testing.assert_allclose(results['folds']['r2'], expected[:, 1], rtol=1e-7)
+    assert results['folds']['n_test'].sum() == len(X)
+
+
+def test_selected_powers_match_selective_refits(poultry_data):
+    X, y = poultry_data.X_train, poultry_data.y_train
+    poly = SelectivePolynomialFeatures(degree=3, max_power=2, feature_names=FEATURE_COLUMNS)
+    powers = poly.fit(X[:1]).powers_
+    results = cross_validate_polynomial(X, y, n_splits=4, powers=powers)
+
+    expected = refit_folds(X, y, 4, poly)
+    np.testing.assert_allclose(results['folds']['mse'], expected[:, 0], rtol=1e-7)
+
+
+def test_kfold_needs_two_folds():
+    with pytest.raises(ValueError):
+        kfold_indices(10, 1)
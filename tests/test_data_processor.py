@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.settings import COMPACT_METRICS_RTOL, FEATURE_COLUMNS, REQUIRED_COLUMNS, TARGET_COLUMN
+from models.model_utils import compare_metrics
+from models.polynomial_regression import PoultryWeightPredictor
+from utils.data_processor import DataProcessor
+from synthetic import make_dataset
+
+
+def messy_data() -> pd.DataFrame:
+    """Poultry rows as read from a hand-edited export: padded and broken strings, extra columns."""
+    df = make_dataset(200, seed=5)
+    # Columns with any unparseable cell are read from CSV as strings throughout
+    df = df.astype({'Int Temp': str, 'Feed Intake': str, TARGET_COLUMN: str})
+    df.loc[0:9, 'Int Temp'] = [f"  {value} " for value in df.loc[0:9, 'Int Temp']]
+    df.loc[10, 'Int Temp'] = 'abc'
+    df.loc[11, 'Feed Intake'] = ''
+    df.loc[12, TARGET_COLUMN] = 'missing'
+    df.loc[13, TARGET_COLUMN] = np.nan
+    df['House'] = np.arange(len(df)) % 3
+    df['Note'] = 'ok'
+    df.loc[14, 'Note'] = np.nan
+    return df
+
+
+def preprocess_both(df: pd.DataFrame, **kwargs) -> tuple:
+    regular, fast = DataProcessor(), DataProcessor()
+    expected = regular.preprocess_data(df, **kwargs)
+    result = fast.preprocess_data(df, fast=True, **kwargs)
+    return regular, expected, fast, result
+
+
+def test_fast_path_matches_regular_path():
+    df = messy_data()
+    regular, expected, fast, result = preprocess_both(df)
+
+    pd.testing.assert_frame_equal(result, expected)
+    # Unparseable values and a null in any column drop the row, like dropna()
+    assert set(range(10, 15)).isdisjoint(result.index)
+    assert len(result) == len(df) - 5
+    np.testing.assert_allclose(fast.scaler.mean_, regular.scaler.mean_)
+    np.testing.assert_allclose(fast.scaler.scale_, regular.scaler.scale_)
+
+
+def test_fast_path_matches_regular_path_without_target():
+    df = messy_data().drop(columns=[TARGET_COLUMN])
+    fitted = DataProcessor()
+    fitted.preprocess_data(make_dataset(50), fast=True)
+
+    expected = fitted.preprocess_data(df, is_training=False)
+    result = fitted.preprocess_data(df, is_training=False, fast=True)
+    pd.testing.assert_frame_equal(result, expected)
+    assert list(fitted.preprocessing_report['columns']) == FEATURE_COLUMNS
+
+
+def test_prediction_data_needs_a_fitted_scaler():
+    with pytest.raises(ValueError, match='fitted'):
+        DataProcessor().preprocess_data(make_dataset(10).drop(columns=[TARGET_COLUMN]),
+                                        is_training=False, fast=True)
+
+
+def test_preprocessing_report():
+    df = messy_data()
+    processor = DataProcessor()
+    processor.preprocess_data(df, fast=True)
+    report = processor.preprocessing_report
+
+    assert report['initial_shape'] == df.shape
+    assert report['final_shape'] == (len(df) - 5, df.shape[1])
+    assert report['rows_dropped'] == 5
+    assert report['copied'] is True
+    assert list(report['columns']) == REQUIRED_COLUMNS
+    assert report['columns']['Int Temp'] == {'dtype_before': 'object', 'dtype_after': 'float64', 'null_values': 1}
+    assert report['columns'][TARGET_COLUMN]['null_values'] == 2
+    assert report['columns']['Air Temp']['dtype_before'] == 'float64'
+
+
+def test_copy_false_converts_in_place_without_a_copy():
+    df = make_dataset(100)
+    values = df['Int Temp'].to_numpy()
+    result = DataProcessor().preprocess_data(df, fast=True, copy=False)
+
+    assert result is df
+    assert np.shares_memory(result['Int Temp'].to_numpy(), values)
+    assert DataProcessor().preprocess_data(df, fast=True, copy=True) is not df
+
+
+def test_copy_true_leaves_the_input_unchanged():
+    df = messy_data()
+    original = df.copy()
+    DataProcessor().preprocess_data(df, fast=True)
+    pd.testing.assert_frame_equal(df, original)
+
+
+def test_compact_features_keep_the_split_and_metrics():
+    df = make_dataset(4000)
+    default, compact = DataProcessor(), DataProcessor()
+    X_train, X_test, y_train, y_test = default.prepare_features(default.preprocess_data(df, fast=True))
+    X_train32, X_test32, y_train32, y_test32 = compact.prepare_features(
+        compact.preprocess_data(df, fast=True, compact=True), compact=True
+    )
+
+    assert X_train32.dtype == X_test32.dtype == np.float32
+    assert y_train32.dtype == np.float64
+    pd.testing.assert_index_equal(y_train32.index, y_train.index)
+    pd.testing.assert_index_equal(y_test32.index, y_test.index)
+    np.testing.assert_allclose(X_train32, X_train, atol=1e-5)
+    assert compact.memory_report['bytes'] == default.memory_report['bytes'] // 2
+
+    metrics, _ = PoultryWeightPredictor().train(X_train, y_train).evaluate(X_test, y_test)
+    metrics32, _ = PoultryWeightPredictor().train(X_train32, y_train32).evaluate(X_test32, y_test32)
+    assert compare_metrics(metrics, metrics32, COMPACT_METRICS_RTOL)['within_tolerance']
+
+
+def test_downcast_keeps_columns_that_do_not_fit_float32():
+    df = make_dataset(100)
+    df['Int Humidity'] = np.arange(100, dtype=np.int64) + 2 ** 24
+    df['Air Temp'] = np.arange(100, dtype=np.int64)
+    df.loc[0, 'Wind Speed'] = 1e39
+    report = DataProcessor()._downcast_features(df)
+
+    assert report['converted_columns'] == ['Int Temp', 'Air Temp', 'Feed Intake']
+    assert df['Int Humidity'].dtype == np.int64
+    assert df['Wind Speed'].dtype == np.float64
+    assert df['Air Temp'].dtype == df['Int Temp'].dtype == np.float32
+    assert df[TARGET_COLUMN].dtype == np.float64
+    assert report['saved_bytes'] == 3 * 100 * 4
+
+    # One feature that does not fit keeps the whole compact matrix in float64
+    X_train, _, _, _ = DataProcessor().prepare_features(df, compact=True)
+    assert X_train.dtype == np.float64
@@ -0,0 +1,129 @@
+import gc
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from config.settings import REQUIRED_COLUMNS
+from utils.dataset_store import CSV_BLOCK_BYTES, DatasetStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DatasetStore(str(tmp_path / 'datasets'))
+
+
+def test_put_csv_keeps_types_that_change_after_the_first_block(tmp_path, store):
+    # Whole numbers fill the first blocks; later chunks hold floats and text group labels,
+    # as written chunk by chunk by preprocess_csv_in_chunks
+    n_rows = 150_000
+    first = pd.DataFrame({col: np.arange(n_rows) % 90 for col in REQUIRED_COLUMNS})
+    first['House'] = np.arange(n_rows) % 4
+    later = pd.DataFrame({col: np.full(1000, 53.5) for col in REQUIRED_COLUMNS})
+    later['House'] = 'H7'
+    csv_path = tmp_path / 'processed.csv'
+    first.to_csv(csv_path, index=False)
+    later.to_csv(csv_path, mode='a', header=False, index=False)
+    assert csv_path.stat().st_size > 2 * CSV_BLOCK_BYTES
+
+    handle = store.put_csv('mixed', str(csv_path), float_columns=REQUIRED_COLUMNS, batch_bytes=CSV_BLOCK_BYTES)
+    df = handle.read()
+
+    assert handle.n_rows == len(df) == n_rows + 1000
+    for col in REQUIRED_COLUMNS:
+        assert df[col].dtype == np.float64
+        np.testing.assert_array_equal(df[col].to_numpy(), np.concatenate([first[col], later[col]]))
+    assert df['House'].tolist() == first['House'].astype(str).tolist() + ['H7'] * 1000
+
+
+def make_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Int Temp': rng.normal(30, 2, n_rows),
+        'Feed Intake': rng.integers(100, 200, n_rows),
+        'House': rng.choice(['H1', 'H2'], n_rows)
+    })
+
+
+def test_put_get_round_trip(store):
+    df = make_frame(100).iloc[::2]
+    handle = store.put('frame', df)
+
+    assert handle.columns == list(df.columns)
+    assert len(handle) == 50
+    assert store.get('frame').path == handle.path
+    assert store.get('unknown') is None
+    pd.testing.assert_frame_equal(store.get('frame').read(), df.reset_index(drop=True))
+    # A key already stored is not written again
+    assert store.put('frame', make_frame(10)).n_rows == 50
+
+
+def test_read_columns(store):
+    df = make_frame(100)
+    handle = store.put('frame', df)
+
+    subset = handle.read(columns=['Feed Intake', 'Int Temp'])
+    assert list(subset.columns) == ['Feed Intake', 'Int Temp']
+    pd.testing.assert_frame_equal(subset, df[['Feed Intake', 'Int Temp']])
+    with pytest.raises(ValueError, match='Rainfall'):
+        handle.read(columns=['Int Temp', 'Rainfall'])
+
+
+def test_numeric_columns_are_read_only_views(store):
+    df = store.put('frame', make_frame(100)).read()
+    values = df['Int Temp'].to_numpy()
+
+    assert not values.flags.writeable
+    assert not values.flags.owndata
+    with pytest.raises(ValueError):
+        values[0] = 0.0
+    assert df['House'].tolist() == make_frame(100)['House'].tolist()
+
+
+def test_head_reads_across_batches(store):
+    df = make_frame(100)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    os.makedirs(store.directory)
+    with pa.ipc.new_file(store.path('batches'), table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=30):
+            writer.write_batch(batch)
+
+    handle = store.get('batches')
+    pd.testing.assert_frame_equal(handle.head(), df.head())
+    pd.testing.assert_frame_equal(handle.head(75), df.head(75))
+    pd.testing.assert_frame_equal(handle.head(500), df)
+
+
+def test_prune_evicts_least_recently_used_files_without_handles(store):
+    paths = {}
+    for age, key in enumerate(['newest', 'live', 'oldest']):
+        paths[key] = store.put(key, make_frame(1000, seed=age)).path
+        # Spread the last uses over time; older files are evicted first
+        os.utime(paths[key], (1_000_000 - age * 1000,) * 2)
+    live = store.get('live')
+    os.utime(paths['live'], (1_000_000 - 5000,) * 2)
+    gc.collect()
+
+    store.max_bytes = os.path.getsize(paths['newest']) + os.path.getsize(paths['live'])
+    store.prune()
+
+    assert not os.path.exists(paths['oldest'])
+    assert live.exists()
+    assert os.path.exists(paths['newest'])
+    assert len(live.read()) == 1000
+
+
+def test_evicted_dataset_raises_file_not_found(store):
+    handle = store.put('frame', make_frame(100))
+    # Another process sharing the directory does not know about this handle
+    other = DatasetStore(store.directory, max_bytes=1)
+    other.prune()
+
+    assert not handle.exists()
+    with pytest.raises(FileNotFoundError, match='frame'):
+        handle.read()
+    with pytest.raises(FileNotFoundError, match='frame'):
+        handle.head()
+    assert store.get('frame') is None
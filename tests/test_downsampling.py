@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.downsampling import downsample_frame, lttb_indices
+
+
+@pytest.mark.parametrize('n, n_out', [(10, 3), (1000, 50), (1001, 7), (100_000, 1000)])
+def test_lttb_keeps_endpoints_and_one_point_per_bucket(n, n_out):
+    rng = np.random.default_rng(0)
+    keep = lttb_indices(np.arange(n), rng.normal(size=n), n_out)
+
+    assert len(keep) == n_out
+    assert keep[0] == 0 and keep[-1] == n - 1
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_lttb_keeps_spikes():
+    y = np.zeros(10_000)
+    y[[1234, 5678, 9000]] = [50.0, -80.0, 30.0]
+    keep = lttb_indices(np.arange(len(y)), y, 100)
+    assert {1234, 5678, 9000} <= set(keep.tolist())
+
+
+def test_lttb_returns_every_point_of_short_series():
+    np.testing.assert_array_equal(lttb_indices(np.arange(5), np.arange(5), 10), np.arange(5))
+
+
+def test_lttb_rejects_fewer_than_three_points():
+    with pytest.raises(ValueError):
+        lttb_indices(np.arange(10), np.arange(10), 2)
+
+
+def test_downsample_frame_keeps_first_and_last_rows():
+    df = pd.DataFrame({'Weight': np.sin(np.linspace(0, 20, 5000))}, index=np.arange(5000) * 2)
+    sampled = downsample_frame(df, 'Weight', 200)
+
+    assert len(sampled) == 200
+    assert sampled.index[0] == df.index[0] and sampled.index[-1] == df.index[-1]
+    small = df.head(100)
+    assert downsample_frame(small, 'Weight', 200) is small
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from sklearn.preprocessing import PolynomialFeatures
+
+from config.settings import FEATURE_COLUMNS
+from models.ensemble import BootstrapEnsemble, bootstrap_counts
+from tests.test_models import sklearn_fit
+
+
+@pytest.fixture(scope='module')
+def ensemble(poultry_data):
+    return BootstrapEnsemble(degree=2, n_estimators=6, random_state=3).train(
+        poultry_data.X_train, poultry_data.y_train, n_jobs=1
+    )
+
+
+def test_replica_equals_refit_on_its_resample(poultry_data, ensemble):
+    X, y = poultry_data.X_train, poultry_data.y_train
+    seed = np.random.SeedSequence(3).spawn(6)[0]
+    rows = np.repeat(np.arange(len(y)), bootstrap_counts(len(y), seed))
+
+    reference = sklearn_fit(X[rows], y[rows])
+    regression = reference[-1]
+    np.testing.assert_allclose(ensemble.coef[0][1:], regression.coef_[1:], rtol=1e-7)
+    assert ensemble.intercept[0] == pytest.approx(regression.intercept_, rel=1e-9)
+    assert ensemble.summary['oob_rows'][0] == len(y) - len(np.unique(rows))
+
+
+def test_replicas_do_not_depend_on_n_jobs(poultry_data, ensemble):
+    parallel = BootstrapEnsemble(degree=2, n_estimators=6, random_state=3).train(
+        poultry_data.X_train, poultry_data.y_train, n_jobs=2
+    )
+    np.testing.assert_array_equal(parallel.coef, ensemble.coef)
+    np.testing.assert_array_equal(parallel.intercept, ensemble.intercept)
+
+
+def test_predict_with_std(poultry_data, ensemble):
+    X_test = poultry_data.X_test
+    mean, std = ensemble.predict(X_test, return_std=True)
+
+    assert mean.shape == std.shape == (len(X_test),)
+    assert np.all(std > 0)
+    replicas = PolynomialFeatures(degree=2).fit_transform(X_test) @ ensemble.coef.T + ensemble.intercept
+    np.testing.assert_allclose(mean, replicas.mean(axis=1), rtol=1e-10)
+    np.testing.assert_allclose(std, replicas.std(axis=1, ddof=1), rtol=1e-8)
+    np.testing.assert_allclose(ensemble.predict(X_test), mean, rtol=1e-10)
+
+
+def test_out_of_bag_scores_and_coefficient_summary(poultry_data, ensemble):
+    summary = ensemble.summary
+    n_rows = len(poultry_data.y_train)
+    assert len(summary) == 6
+    # About a third of the rows are left out of every resample
+    assert summary['oob_rows'].between(0.3 * n_rows, 0.4 * n_rows).all()
+    assert (summary['oob_r2'] > 0.9).all()
+    assert (summary['oob_rmse'] > 0).all()
+
+    coefficients = ensemble.coefficient_summary(FEATURE_COLUMNS)
+    assert len(coefficients) == ensemble.coef.shape[1] - 1
+    assert '1' not in set(coefficients['term'])
+    assert (coefficients['lower'] <= coefficients['mean']).all()
+    assert (coefficients['mean'] <= coefficients['upper']).all()
+    assert (coefficients['std'] > 0).all()
+
+
+def test_ensemble_needs_two_replicas():
+    with pytest.raises(ValueError):
+        BootstrapEnsemble(n_estimators=1)
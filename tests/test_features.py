@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import PolynomialFeatures
+
+from config.settings import FEATURE_COLUMNS
+from models.artifact import ModelArtifact
+from models.features import SelectivePolynomialFeatures
+from models.inference import CompiledPredictor
+from models.model_utils import parse_term, polynomial_powers, selected_powers
+from models.polynomial_regression import PoultryWeightPredictor
+
+
+@pytest.mark.parametrize('degree', [2, 3])
+def test_interaction_only_matches_polynomial_features(poultry_data, degree):
+    X = poultry_data.X_test
+    expected = PolynomialFeatures(degree=degree, interaction_only=True).fit(X)
+    selective = SelectivePolynomialFeatures(degree=degree, interaction_only=True).fit(X)
+
+    np.testing.assert_array_equal(selective.powers_, expected.powers_)
+    np.testing.assert_allclose(selective.transform(X), expected.transform(X), rtol=1e-12)
+    np.testing.assert_array_equal(
+        selective.get_feature_names_out(FEATURE_COLUMNS), expected.get_feature_names_out(FEATURE_COLUMNS)
+    )
+
+
+def test_terms_by_name_and_by_exponent_rows(poultry_data):
+    names = ['Int Temp^2 Feed Intake', 'Wind Speed', 'Int Humidity Air Temp']
+    by_name = SelectivePolynomialFeatures(degree=3, terms=names, feature_names=FEATURE_COLUMNS)
+    rows = [parse_term(name, FEATURE_COLUMNS) for name in names]
+    by_row = SelectivePolynomialFeatures(degree=3, terms=rows)
+
+    X = poultry_data.X_test
+    np.testing.assert_array_equal(by_name.fit(X).powers_, by_row.fit(X).powers_)
+    assert list(by_name.get_feature_names_out()) == ['1', 'Wind Speed', 'Int Humidity Air Temp',
+                                                    'Int Temp^2 Feed Intake']
+
+    design = by_name.transform(X)
+    np.testing.assert_allclose(design[:, 0], 1)
+    np.testing.assert_allclose(design[:, 3], X[:, 0] ** 2 * X[:, 4], rtol=1e-12)
+
+
+def test_parse_term():
+    np.testing.assert_array_equal(parse_term('Int Temp^2 Feed Intake', FEATURE_COLUMNS), [2, 0, 0, 0, 1])
+    np.testing.assert_array_equal(parse_term('Air Temp Air Temp', FEATURE_COLUMNS), [0, 0, 2, 0, 0])
+    with pytest.raises(ValueError, match='Unknown feature'):
+        parse_term('Int Temp Rainfall', FEATURE_COLUMNS)
+    with pytest.raises(ValueError, match='Invalid power'):
+        parse_term('Int Temp^x', FEATURE_COLUMNS)
+
+
+def test_max_power_by_feature_name(poultry_data):
+    X = pd.DataFrame(poultry_data.X_test, columns=FEATURE_COLUMNS)
+    poly = SelectivePolynomialFeatures(degree=3, max_power={'Int Temp': 1, 'Wind Speed': 0}).fit(X)
+
+    all_powers = polynomial_powers(5, 3)
+    keep = (all_powers[:, 0] <= 1) & (all_powers[:, 3] == 0)
+    np.testing.assert_array_equal(poly.powers_, all_powers[keep])
+    np.testing.assert_array_equal(poly.powers_, selected_powers(5, 3, max_power=[1, 3, 3, 0, 3]))
+
+
+def test_selected_powers_rejects_terms_above_degree():
+    with pytest.raises(ValueError, match='degree of at most 2'):
+        selected_powers(5, 2, terms=[[2, 0, 0, 0, 1]])
+    with pytest.raises(ValueError, match='degree of at most 2'):
+        SelectivePolynomialFeatures(degree=2, terms=['Int Temp^3'], feature_names=FEATURE_COLUMNS).fit(
+            np.zeros((1, 5))
+        )
+
+
+def test_unknown_feature_names_are_rejected():
+    X = np.zeros((1, 5))
+    with pytest.raises(ValueError, match='Unknown features'):
+        SelectivePolynomialFeatures(max_power={'Rainfall': 1}, feature_names=FEATURE_COLUMNS).fit(X)
+    with pytest.raises(ValueError, match='Unknown feature in term'):
+        SelectivePolynomialFeatures(terms=['Rainfall'], feature_names=FEATURE_COLUMNS).fit(X)
+    with pytest.raises(ValueError, match='Feature names are needed'):
+        SelectivePolynomialFeatures(terms=['Int Temp']).fit(X)
+
+
+SELECTIVE_OPTIONS = {
+    'degree': 3,
+    'max_power': 2,
+    'terms': ['Int Temp', 'Int Humidity', 'Air Temp', 'Wind Speed', 'Feed Intake', 'Feed Intake^2',
+              'Int Temp Feed Intake', 'Int Temp^2 Feed Intake'],
+    'feature_names': FEATURE_COLUMNS
+}
+
+
+def test_selective_partial_fit_matches_train(poultry_data):
+    X, y = poultry_data.X_train, poultry_data.y_train
+    trained = PoultryWeightPredictor(**SELECTIVE_OPTIONS).train(X, y)
+    incremental = PoultryWeightPredictor(**SELECTIVE_OPTIONS)
+    for batch in np.array_split(np.arange(len(X)), 3):
+        incremental.partial_fit(X[batch], y[batch])
+
+    assert incremental.selective
+    assert incremental.model.named_steps['poly'].n_output_features_ == 9
+    np.testing.assert_allclose(
+        incremental.predict(poultry_data.X_test), trained.predict(poultry_data.X_test), rtol=1e-9
+    )
+
+
+def test_selective_model_artifact_round_trip(tmp_path, poultry_data):
+    model = PoultryWeightPredictor(**SELECTIVE_OPTIONS).train(poultry_data.X_train, poultry_data.y_train)
+    path = ModelArtifact.from_model(model, poultry_data.data_processor).save(str(tmp_path / 'model.pwm'))
+    loaded = ModelArtifact.load(path)
+
+    np.testing.assert_array_equal(loaded.arrays['powers'], model.model.named_steps['poly'].powers_)
+    expected = CompiledPredictor.from_model(model, poultry_data.data_processor).predict(poultry_data.test_rows)
+    np.testing.assert_array_equal(loaded.predictor.predict(poultry_data.test_rows), expected)
+    np.testing.assert_allclose(expected, model.predict(poultry_data.X_test), rtol=1e-9)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import r2_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures
+
+from models.artifact import ModelArtifact
+from models.grouped import GroupedPoultryWeightPredictor, group_labels
+from models.inference import GroupedCompiledPredictor
+
+# House 3 has too few rows for its own model and falls back to the global one
+HOUSE_SIZES = {0: 1200, 1: 1000, 2: 980, 3: 20}
+
+
+def houses(n_rows: int) -> np.ndarray:
+    return np.repeat(list(HOUSE_SIZES), list(HOUSE_SIZES.values()))[:n_rows]
+
+
+@pytest.fixture(scope='module')
+def grouped(poultry_data):
+    groups = houses(len(poultry_data.y_train))
+    model = GroupedPoultryWeightPredictor('House', min_group_size=50).train(
+        poultry_data.X_train, poultry_data.y_train, groups, n_jobs=1
+    )
+    return model, groups
+
+
+def test_group_models_match_per_group_refits(poultry_data, grouped):
+    model, groups = grouped
+    X, y = poultry_data.X_train, poultry_data.y_train
+    everyone = make_pipeline(PolynomialFeatures(degree=2), LinearRegression()).fit(X, y)
+
+    for house in HOUSE_SIZES:
+        rows = groups == house
+        expected = everyone if rows.sum() < 50 else make_pipeline(
+            PolynomialFeatures(degree=2), LinearRegression()
+        ).fit(X[rows], y[rows])
+        test_groups = np.full(len(poultry_data.X_test), house)
+        np.testing.assert_allclose(
+            model.predict(poultry_data.X_test, test_groups), expected.predict(poultry_data.X_test), rtol=1e-9
+        )
+    assert model.summary.set_index('group')['model'].to_dict() == {
+        '0': 'group', '1': 'group', '2': 'group', '3': 'global'
+    }
+
+
+def test_unseen_groups_use_the_global_model(poultry_data, grouped):
+    model, _ = grouped
+    X = poultry_data.X_test[:10]
+    np.testing.assert_array_equal(model.predict(X, ['new'] * 10), model.predict(X, [3] * 10))
+
+
+def test_float_and_integer_labels_route_alike(poultry_data, grouped):
+    model, _ = grouped
+    X = poultry_data.X_test[:4]
+    float_groups = pd.Series([0.0, 1.0, 2.0, np.nan])
+    np.testing.assert_array_equal(model.predict(X, float_groups), model.predict(X, [0, 1, 2, 'unseen']))
+    np.testing.assert_array_equal(group_labels(np.array([1.0, 2.5])), ['1', '2.5'])
+
+
+@pytest.mark.parametrize('from_artifact', [False, True])
+def test_compiled_routing_matches_model(tmp_path, poultry_data, grouped, from_artifact):
+    model, _ = grouped
+    if from_artifact:
+        artifact = ModelArtifact.from_grouped_model(model, poultry_data.data_processor)
+        predictor = ModelArtifact.load(artifact.save(str(tmp_path / 'grouped.pwm'))).predictor
+    else:
+        predictor = GroupedCompiledPredictor.from_model(model, poultry_data.data_processor)
+
+    test_groups = np.arange(len(poultry_data.test_rows)) % 5
+    rows = poultry_data.test_rows.assign(House=test_groups)
+    expected = model.predict(poultry_data.X_test, test_groups)
+    np.testing.assert_allclose(predictor.predict(rows), expected, rtol=1e-9)
+    np.testing.assert_allclose(predictor.predict(rows, test_groups.astype(float)), expected, rtol=1e-9)
+
+
+def test_per_group_metrics_match_scikit_learn(poultry_data, grouped):
+    model, _ = grouped
+    test_groups = np.arange(len(poultry_data.y_test)) % 3
+    # A large offset makes sum(y²) - sum(y)²/n lose most of its digits
+    y = poultry_data.y_test + 1e7
+    X = poultry_data.X_test
+    _, per_group, y_pred = model.evaluate(X, y, test_groups)
+
+    for house in range(3):
+        rows = test_groups == house
+        assert per_group.set_index('group').loc[str(house), 'r2'] == pytest.approx(
+            r2_score(y[rows], y_pred[rows]), rel=1e-9
+        )
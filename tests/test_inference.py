@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from config.settings import FEATURE_COLUMNS
+from models.inference import CompiledPredictor
+from models.polynomial_regression import PoultryWeightPredictor
+
+
+@pytest.mark.parametrize('options', [
+    {'degree': 2},
+    {'degree': 4},
+    {'degree': 3, 'max_power': 2, 'feature_names': FEATURE_COLUMNS},
+])
+def test_compiled_predictor_matches_pipeline(poultry_data, options):
+    model = PoultryWeightPredictor(**options).train(poultry_data.X_train, poultry_data.y_train)
+    compiled = CompiledPredictor.from_model(model, poultry_data.data_processor)
+
+    rows = poultry_data.test_rows
+    expected = model.predict(poultry_data.data_processor.scaler.transform(rows[FEATURE_COLUMNS]))
+    np.testing.assert_allclose(compiled.predict(rows), expected, rtol=1e-9)
+    # Matrices in feature order and reordered DataFrame columns give the same result
+    np.testing.assert_allclose(compiled.predict(rows[FEATURE_COLUMNS].to_numpy()), expected, rtol=1e-9)
+    np.testing.assert_allclose(compiled.predict(rows[FEATURE_COLUMNS[::-1]]), expected, rtol=1e-9)
+
+
+def test_compiled_predictor_rejects_missing_columns(poultry_data):
+    model = PoultryWeightPredictor().train(poultry_data.X_train, poultry_data.y_train)
+    compiled = CompiledPredictor.from_model(model, poultry_data.data_processor)
+    with pytest.raises(ValueError, match='Missing required feature columns'):
+        compiled.predict(poultry_data.test_rows.drop(columns=['Feed Intake']))
+
+
+def test_compiling_requires_a_trained_model(poultry_data):
+    with pytest.raises(ValueError):
+        CompiledPredictor.from_model(PoultryWeightPredictor(), poultry_data.data_processor)
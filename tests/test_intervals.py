@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from models.artifact import ModelArtifact
+from models.inference import CompiledPredictor
+from models.polynomial_regression import PoultryWeightPredictor
+
+NOISE = 10.0
+
+
+def true_mean(X):
+    """Quadratic ground truth, within the terms of a degree 2 model."""
+    return 1500 + 30 * X[:, 0] - 12 * X[:, 1] + 8 * X[:, 0] * X[:, 2] + 5 * X[:, 3] ** 2
+
+
+def simulate(rng, n_rows):
+    X = rng.normal(size=(n_rows, 5))
+    return X, true_mean(X) + rng.normal(0, NOISE, n_rows)
+
+
+@pytest.mark.parametrize('level', [0.8, 0.95])
+def test_prediction_intervals_cover_new_observations(level):
+    rng = np.random.default_rng(0)
+    model = PoultryWeightPredictor(degree=2).train(*simulate(rng, 2000))
+    X_new, y_new = simulate(rng, 20_000)
+    bounds = model.predict_interval(X_new, level)
+
+    covered = (bounds['prediction_lower'] <= y_new) & (y_new <= bounds['prediction_upper'])
+    assert covered.mean() == pytest.approx(level, abs=0.01)
+
+
+def test_confidence_intervals_cover_the_true_mean():
+    rng = np.random.default_rng(1)
+    X_point = rng.normal(size=(5, 5))
+    covered = []
+    for _ in range(400):
+        model = PoultryWeightPredictor(degree=2).train(*simulate(rng, 150))
+        bounds = model.predict_interval(X_point, 0.95)
+        mean = true_mean(X_point)
+        covered.append((bounds['confidence_lower'] <= mean) & (mean <= bounds['confidence_upper']))
+    assert np.mean(covered) == pytest.approx(0.95, abs=0.02)
+
+
+def test_compiled_and_saved_intervals_match_model(tmp_path, poultry_data):
+    model = PoultryWeightPredictor(degree=3).train(poultry_data.X_train, poultry_data.y_train)
+    expected = model.predict_interval(poultry_data.X_test, 0.9)
+
+    compiled = CompiledPredictor.from_model(model, poultry_data.data_processor)
+    artifact = ModelArtifact.from_model(model, poultry_data.data_processor)
+    loaded = ModelArtifact.load(artifact.save(str(tmp_path / 'model.pwm'))).predictor
+    for predictor in (compiled, loaded):
+        result = predictor.predict_interval(poultry_data.test_rows, 0.9)
+        for key, values in expected.items():
+            np.testing.assert_allclose(result[key], values, rtol=1e-9)
+
+
+def test_intervals_widen_with_the_level(poultry_data):
+    model = PoultryWeightPredictor().train(poultry_data.X_train, poultry_data.y_train)
+    narrow = model.predict_interval(poultry_data.X_test, 0.8)
+    wide = model.predict_interval(poultry_data.X_test, 0.99)
+    assert np.all(wide['prediction_lower'] < narrow['prediction_lower'])
+    assert np.all(narrow['confidence_upper'] - narrow['confidence_lower']
+                  < narrow['prediction_upper'] - narrow['prediction_lower'])
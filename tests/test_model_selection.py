@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from config.settings import FEATURE_COLUMNS, RANDOM_STATE
+from models.model_selection import select_polynomial_degree
+from tests.test_models import sklearn_fit
+
+
+def sequential_scores(X, y, degrees, subsets, validation_size=0.2) -> dict:
+    """Validation RMSE of every candidate, each refitted from scratch on the same split."""
+    n_validation = int(round(len(X) * validation_size))
+    order = np.random.RandomState(RANDOM_STATE).permutation(len(X))
+    validation_rows, train_rows = order[:n_validation], order[n_validation:]
+    scores = {}
+    for degree in degrees:
+        for subset in subsets:
+            columns = [FEATURE_COLUMNS.index(name) for name in subset]
+            model = sklearn_fit(X[train_rows][:, columns], y[train_rows], degree=degree)
+            residuals = y[validation_rows] - model.predict(X[validation_rows][:, columns])
+            scores[(degree, ', '.join(subset))] = float(np.sqrt(np.mean(residuals ** 2)))
+    return scores
+
+
+def test_leaderboard_matches_sequential_fits(poultry_data):
+    X, y = poultry_data.X_train, poultry_data.y_train
+    degrees = [1, 2, 3, 4]
+    leaderboard = select_polynomial_degree(X, y, degrees=degrees, n_jobs=1)
+    expected = sequential_scores(X, y, degrees, [FEATURE_COLUMNS])
+
+    ranked = sorted(expected, key=expected.get)
+    assert list(zip(leaderboard['degree'], leaderboard['features'])) == ranked
+    np.testing.assert_allclose(leaderboard['val_rmse'], [expected[key] for key in ranked], rtol=1e-6)
+    assert list(leaderboard['rank']) == [1, 2, 3, 4]
+
+
+def test_feature_subsets_match_sequential_fits(poultry_data):
+    X, y = poultry_data.X_train, poultry_data.y_train
+    subsets = [['Feed Intake'], ['Int Temp', 'Feed Intake'], FEATURE_COLUMNS]
+    leaderboard = select_polynomial_degree(X, y, degrees=[1, 2], feature_subsets=subsets, n_jobs=2)
+    expected = sequential_scores(X, y, [1, 2], subsets)
+
+    assert len(leaderboard) == 6
+    assert list(zip(leaderboard['degree'], leaderboard['features'])) == sorted(expected, key=expected.get)
+    for _, row in leaderboard.iterrows():
+        assert row['val_rmse'] == pytest.approx(expected[(row['degree'], row['features'])], rel=1e-6)
+
+
+def test_invalid_candidates_are_rejected(poultry_data):
+    X, y = poultry_data.X_train, poultry_data.y_train
+    with pytest.raises(ValueError, match='Degrees'):
+        select_polynomial_degree(X, y, degrees=[0, 1])
+    with pytest.raises(ValueError, match='Rainfall'):
+        select_polynomial_degree(X, y, feature_subsets=[['Rainfall']])
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import PolynomialFeatures
+
+from models.polynomial_regression import PoultryWeightPredictor
+
+
+def sklearn_fit(X, y, degree=2):
+    """Reference polynomial regression refitted from scratch by scikit-learn."""
+    return make_pipeline(PolynomialFeatures(degree=degree), LinearRegression()).fit(X, y)
+
+
+def test_partial_fit_matches_full_refit(poultry_data):
+    X, y = poultry_data.X_train, poultry_data.y_train
+    model = PoultryWeightPredictor(degree=2)
+    for batch in np.array_split(np.arange(len(X)), 4):
+        model.partial_fit(X[batch], y[batch])
+
+    reference = sklearn_fit(X, y)
+    np.testing.assert_allclose(
+        model.predict(poultry_data.X_test), reference.predict(poultry_data.X_test), rtol=1e-9
+    )
+    assert model.statistics.n_samples == len(X)
+
+
+def test_partial_fit_continues_after_train(poultry_data):
+    X, y = poultry_data.X_train, poultry_data.y_train
+    half = len(X) // 2
+    model = PoultryWeightPredictor(degree=3).train(X[:half], y[:half])
+    model.partial_fit(X[half:], y[half:])
+
+    reference = sklearn_fit(X, y, degree=3)
+    np.testing.assert_allclose(
+        model.predict(poultry_data.X_test), reference.predict(poultry_data.X_test), rtol=1e-8
+    )
+
+
+def test_partial_fit_rejects_empty_batch():
+    with pytest.raises(ValueError):
+        PoultryWeightPredictor().partial_fit(np.empty((0, 5)), np.empty(0))
+
+
+@pytest.mark.parametrize('n_jobs, n_shards', [(1, 3), (2, 4)])
+def test_train_parallel_matches_full_refit(poultry_data, n_jobs, n_shards):
+    X, y = poultry_data.X_train, poultry_data.y_train
+    model = PoultryWeightPredictor(degree=2).train_parallel(X, y, n_jobs=n_jobs, n_shards=n_shards)
+
+    reference = sklearn_fit(X, y)
+    np.testing.assert_allclose(
+        model.predict(poultry_data.X_test), reference.predict(poultry_data.X_test), rtol=1e-9
+    )
+    assert model.statistics.n_samples == len(X)
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.settings import FEATURE_COLUMNS, REQUIRED_COLUMNS
+from utils.data_processor import DataProcessor
+from utils.outliers import MahalanobisDetector, build_outlier_report, iqr_outliers
+
+
+def test_iqr_outliers_match_detect_outliers(poultry_data):
+    df = poultry_data.processed.copy()
+    # Extreme values in a few columns, and a missing value the quantiles must skip
+    df.loc[df.index[:5], 'Wind Speed'] = 50.0
+    df.loc[df.index[5], 'Feed Intake'] = -1000.0
+    df.loc[df.index[6], 'Air Temp'] = np.nan
+    flags, bounds = iqr_outliers(df)
+
+    assert list(flags.columns) == REQUIRED_COLUMNS
+    assert flags['Wind Speed'].iloc[:5].all()
+    for col in REQUIRED_COLUMNS:
+        pd.testing.assert_series_equal(flags[col], DataProcessor.detect_outliers(df, col), check_names=False)
+        assert bounds.loc[col, 'q1'] == pytest.approx(df[col].quantile(0.25))
+        assert bounds.loc[col, 'q3'] == pytest.approx(df[col].quantile(0.75))
+
+
+def test_iqr_outliers_rejects_unknown_columns(poultry_data):
+    with pytest.raises(ValueError, match='Rainfall'):
+        iqr_outliers(poultry_data.processed, ['Int Temp', 'Rainfall'])
+    with pytest.raises(ValueError):
+        iqr_outliers(pd.DataFrame())
+
+
+def test_multivariate_outlier_is_flagged(poultry_data):
+    df = poultry_data.raw.copy()
+    columns = ['Int Temp', 'Air Temp']
+    # Correlated columns, and one row that is typical in each column but not together
+    df['Air Temp'] = df['Int Temp'] - 2 + np.random.default_rng(1).normal(0, 0.2, len(df))
+    df.loc[0, ['Int Temp', 'Air Temp']] = [32.0, 26.0]
+
+    report = build_outlier_report(df, columns)
+    threshold = report['detector'].threshold(0.001)
+    flagged = report['distances'] > threshold
+
+    assert not report['flags'].loc[0].any()
+    assert flagged[0]
+    assert flagged.mean() < 0.005
+    assert threshold == pytest.approx(13.8155, rel=1e-4)
+
+
+def test_singular_covariance_uses_the_pseudo_inverse(poultry_data):
+    df = poultry_data.raw[FEATURE_COLUMNS].copy()
+    # A column that is an exact combination of others makes the covariance singular
+    df['Total Temp'] = df['Int Temp'] + df['Air Temp']
+    columns = FEATURE_COLUMNS + ['Total Temp']
+    assert np.linalg.matrix_rank(np.cov(df.to_numpy(), rowvar=False)) == len(FEATURE_COLUMNS)
+
+    distances = MahalanobisDetector().fit(df, columns).distances(df)
+    expected = MahalanobisDetector().fit(df, FEATURE_COLUMNS).distances(df)
+    assert np.isfinite(distances).all()
+    # The redundant column adds no information to the distance
+    np.testing.assert_allclose(distances, expected, rtol=1e-6)
+
+
+def test_detector_needs_enough_rows_and_a_fit():
+    df = pd.DataFrame({'a': [1.0, 2.0, np.nan], 'b': [1.0, 3.0, 2.0]})
+    with pytest.raises(ValueError, match='complete rows'):
+        MahalanobisDetector().fit(df, ['a', 'b'])
+    with pytest.raises(ValueError, match='fitted'):
+        MahalanobisDetector().distances(df)
+    with pytest.raises(ValueError):
+        MahalanobisDetector().threshold(1.5)
@@ -0,0 +1,170 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from api.prediction_server import MAX_BODY_BYTES, MAX_HEADER_BYTES, STREAM_LIMIT, PredictionClient, PredictionServer
+from config.settings import FEATURE_COLUMNS
+from models.grouped import GroupedPoultryWeightPredictor
+from models.inference import CompiledPredictor, GroupedCompiledPredictor
+from models.polynomial_regression import PoultryWeightPredictor
+
+
+@pytest.fixture(scope='module')
+def predictor(poultry_data):
+    model = PoultryWeightPredictor().train(poultry_data.X_train, poultry_data.y_train)
+    return CompiledPredictor.from_model(model, poultry_data.data_processor)
+
+
+@pytest.fixture(scope='module')
+def grouped_predictor(poultry_data):
+    groups = np.arange(len(poultry_data.y_train)) % 3
+    model = GroupedPoultryWeightPredictor('House', min_group_size=10).train(
+        poultry_data.X_train, poultry_data.y_train, groups, n_jobs=1
+    )
+    return GroupedCompiledPredictor.from_model(model, poultry_data.data_processor)
+
+
+def feature_payloads(rows) -> list:
+    return [{col: float(row[col]) for col in FEATURE_COLUMNS} for _, row in rows.iterrows()]
+
+
+def serve(predictor, scenario):
+    """Run scenario(server) against a server on a free loopback port."""
+    async def main():
+        server = PredictionServer(predictor, host='127.0.0.1', port=0, max_latency_ms=20)
+        await server.start()
+        try:
+            return await scenario(server)
+        finally:
+            await server.stop()
+    return asyncio.run(main())
+
+
+async def raw_request(port: int, data: bytes, close_write: bool = False) -> tuple:
+    """Send raw bytes and return (status, decoded JSON body) of the response."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(data)
+    await writer.drain()
+    if close_write:
+        writer.write_eof()
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b'\r\n\r\n', 1)
+    return int(head.split(b' ')[1]), json.loads(body)
+
+
+def test_concurrent_clients_get_batched_predictions(predictor, poultry_data):
+    rows = poultry_data.test_rows.head(40)
+
+    async def scenario(server):
+        clients = [PredictionClient('127.0.0.1', server.port) for _ in range(len(rows))]
+        try:
+            predictions = await asyncio.gather(*[
+                client.predict(payload) for client, payload in zip(clients, feature_payloads(rows))
+            ])
+            return predictions, await clients[0].stats()
+        finally:
+            for client in clients:
+                await client.close()
+
+    predictions, stats = serve(predictor, scenario)
+    np.testing.assert_allclose(predictions, predictor.predict(rows), rtol=1e-12)
+    assert stats['requests'] == len(rows)
+    assert stats['errors'] == 0
+    assert stats['mean_batch_size'] > 1
+
+
+def test_keep_alive_client_reuses_its_connection(predictor, poultry_data):
+    payloads = feature_payloads(poultry_data.test_rows.head(3))
+
+    async def scenario(server):
+        client = PredictionClient('127.0.0.1', server.port)
+        try:
+            predictions = [await client.predict(payload) for payload in payloads]
+            health = await client.request('GET', '/health')
+            return predictions, health
+        finally:
+            await client.close()
+
+    predictions, health = serve(predictor, scenario)
+    np.testing.assert_allclose(predictions, predictor.predict(poultry_data.test_rows.head(3)), rtol=1e-12)
+    assert health == (200, {'status': 'ok'})
+
+
+def test_request_errors(predictor, poultry_data):
+    payload = feature_payloads(poultry_data.test_rows.head(1))[0]
+
+    async def scenario(server):
+        client = PredictionClient('127.0.0.1', server.port)
+        try:
+            return [
+                await client.request('GET', '/predict'),
+                await client.request('POST', '/unknown', payload),
+                await client.request('POST', '/predict', [1, 2, 3]),
+                await client.request('POST', '/predict', {'Int Temp': 30.0}),
+                await client.request('POST', '/predict', {**payload, 'Feed Intake': 'lots'}),
+                await client.request('POST', '/predict', {**payload, 'Feed Intake': float('nan')}),
+                await client.request('POST', '/predict', {**payload, 'Feed Intake': float('inf')}),
+            ]
+        finally:
+            await client.close()
+
+    statuses = [status for status, _ in serve(predictor, scenario)]
+    assert statuses == [405, 404, 400, 400, 400, 400, 400]
+
+
+@pytest.mark.parametrize('content_length, status', [
+    (b'abc', 400),
+    (b'-1', 400),
+    (str(MAX_BODY_BYTES + 1).encode(), 413),
+])
+def test_invalid_content_length(predictor, content_length, status):
+    request = b'POST /predict HTTP/1.1\r\nContent-Length: ' + content_length + b'\r\n\r\n'
+
+    async def scenario(server):
+        return await raw_request(server.port, request)
+
+    assert serve(predictor, scenario)[0] == status
+
+
+@pytest.mark.parametrize('header_bytes', [MAX_HEADER_BYTES + 1024, STREAM_LIMIT + 1024])
+def test_oversized_headers(predictor, header_bytes):
+    request = b'GET /health HTTP/1.1\r\nX-Padding: ' + b'a' * header_bytes + b'\r\n\r\n'
+
+    async def scenario(server):
+        return await raw_request(server.port, request)
+
+    assert serve(predictor, scenario) == (413, {'error': 'Headers too large'})
+
+
+def test_truncated_body(predictor):
+    request = b'POST /predict HTTP/1.1\r\nContent-Length: 100\r\n\r\n{"Int Temp": 1'
+
+    async def scenario(server):
+        return await raw_request(server.port, request, close_write=True)
+
+    assert serve(predictor, scenario)[0] == 400
+
+
+def test_grouped_requests_are_validated_one_by_one(grouped_predictor, poultry_data):
+    rows = poultry_data.test_rows.head(6)
+    payloads = [{**payload, 'House': i % 3} for i, payload in enumerate(feature_payloads(rows))]
+    bad_payloads = [{**payloads[0], 'House': [0]}, {**payloads[0], 'House': None}]
+
+    async def scenario(server):
+        clients = [PredictionClient('127.0.0.1', server.port) for _ in payloads + bad_payloads]
+        try:
+            return await asyncio.gather(*[
+                client.request('POST', '/predict', payload)
+                for client, payload in zip(clients, payloads + bad_payloads)
+            ])
+        finally:
+            for client in clients:
+                await client.close()
+
+    responses = serve(grouped_predictor, scenario)
+    expected = grouped_predictor.predict(rows, np.arange(len(rows)) % 3)
+    assert [status for status, _ in responses] == [200] * len(payloads) + [400] * len(bad_payloads)
+    np.testing.assert_allclose([body['prediction'] for _, body in responses[:len(payloads)]], expected, rtol=1e-12)
@@ -0,0 +1,96 @@
+import json
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from utils.profiling import StageProfiler
+
+
+@pytest.fixture
+def profiler():
+    profiler = StageProfiler(enabled=True, trace_memory=True)
+    yield profiler
+    profiler.configure(False)
+
+
+def test_nested_stages_report_allocations_but_no_inner_peak(profiler):
+    with profiler.stage('outer', rows=10):
+        outer_data = np.ones(100_000)
+        with profiler.stage('inner', rows=5):
+            inner_data = np.ones(200_000)
+        del inner_data
+
+    inner, outer = profiler.records
+    assert [inner['stage'], outer['stage']] == ['inner', 'outer']
+    assert outer['wall_ms'] >= inner['wall_ms']
+    assert inner['rows'] == 5
+    assert 'peak_kb' not in inner
+    assert inner['allocated_kb'] >= 200_000 * 8 / 1024
+    # The inner array was freed, so the outer peak is above what the outer stage still holds
+    assert outer['peak_kb'] >= (100_000 + 200_000) * 8 / 1024
+    assert outer['allocated_kb'] < outer['peak_kb']
+    del outer_data
+
+
+def test_overlapping_stages_of_two_profilers(profiler):
+    other = StageProfiler(enabled=True, trace_memory=True)
+    try:
+        first = profiler.stage('first')
+        first.__enter__()
+        with other.stage('second'):
+            pass
+        first.__exit__(None, None, None)
+        with other.stage('third'):
+            pass
+    finally:
+        other.configure(False)
+
+    assert 'peak_kb' in profiler.records[0]
+    second, third = other.records
+    assert 'peak_kb' not in second and 'allocated_kb' in second
+    assert 'peak_kb' in third
+
+
+def test_tracer_stops_with_the_last_profiler():
+    assert not tracemalloc.is_tracing()
+    first = StageProfiler(enabled=True, trace_memory=True)
+    second = StageProfiler(enabled=True, trace_memory=True)
+    first.configure(False)
+    assert tracemalloc.is_tracing()
+    del second
+    assert not tracemalloc.is_tracing()
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = StageProfiler(enabled=False)
+    with profiler.stage('load') as stage:
+        stage.set_rows(10)
+    assert not profiler.records
+    assert profiler.to_frame().empty
+
+
+def test_json_lines_export(tmp_path):
+    profiler = StageProfiler(enabled=True, max_records=2)
+    profiler.context = {'page': 'Upload'}
+    for name in ['parse', 'preprocess']:
+        with profiler.stage(name, rows=100, source='csv'):
+            pass
+    with pytest.raises(KeyError):
+        with profiler.stage('store') as stage:
+            stage.set_rows(3)
+            raise KeyError('column')
+
+    lines = profiler.to_json_lines().splitlines()
+    records = [json.loads(line) for line in lines]
+    # Only the newest max_records stages are kept
+    assert [record['stage'] for record in records] == ['preprocess', 'store']
+    assert records[0] == {**records[0], 'page': 'Upload', 'rows': 100, 'source': 'csv'}
+    assert records[1]['error'] == 'KeyError'
+    assert records[1]['rows'] == 3
+    assert 'allocated_kb' not in records[0]
+
+    path = tmp_path / 'stages.jsonl'
+    profiler.write_json_lines(str(path))
+    profiler.write_json_lines(str(path))
+    assert path.read_text().splitlines() == lines * 2
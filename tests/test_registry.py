@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from models.artifact import ModelArtifact
+from models.polynomial_regression import PoultryWeightPredictor
+from models.registry import ModelRegistry
+
+
+@pytest.fixture(scope='module')
+def trained_models(poultry_data):
+    return [
+        PoultryWeightPredictor(degree=degree).train(poultry_data.X_train, poultry_data.y_train)
+        for degree in (1, 2)
+    ]
+
+
+@pytest.fixture
+def registry(tmp_path, poultry_data, trained_models):
+    registry = ModelRegistry(str(tmp_path / 'models'))
+    for name, r2 in [('alpha', 0.91), ('beta', None), ('gamma', 0.95)]:
+        metadata = {'training_date': '2024-01-01'}
+        if r2 is not None:
+            metadata['training_metrics'] = {'r2': r2}
+        registry.save_artifact(trained_models[0], poultry_data.data_processor, name, metadata)
+    return registry
+
+
+def names(records) -> list:
+    return [record['name'] for record in records]
+
+
+def test_list_filters_by_name_and_r2(registry):
+    assert names(registry.list_models(name_contains='AM', sort_by='name', descending=False)) == [
+        'gamma.pwm'
+    ]
+    assert names(registry.list_models(min_r2=0.93)) == ['gamma.pwm']
+
+
+@pytest.mark.parametrize('descending, expected', [
+    (True, ['gamma.pwm', 'alpha.pwm', 'beta.pwm']),
+    (False, ['alpha.pwm', 'gamma.pwm', 'beta.pwm']),
+])
+def test_records_without_the_sort_field_come_last(registry, descending, expected):
+    assert names(registry.list_models(sort_by='r2', descending=descending)) == expected
+
+
+def test_metadata_cannot_override_file_fields(registry, poultry_data, trained_models):
+    path = registry.save_artifact(
+        trained_models[0], poultry_data.data_processor, 'delta',
+        {'name': 'evil', 'size': 1, 'sha256': 'forged'}
+    )
+    record = {r['name']: r for r in registry.list_models()}['delta.pwm']
+    assert record['size'] == os.path.getsize(path)
+    assert record['sha256'] != 'forged'
+    assert isinstance(registry.load('delta.pwm'), ModelArtifact)
+
+
+def test_load_by_name_is_cached_until_the_file_changes(registry, poultry_data, trained_models):
+    first = registry.load('alpha.pwm')
+    assert registry.load('alpha.pwm') is first
+
+    # A new modification time with the same content keeps the cached model
+    path = registry.model_path('alpha.pwm')
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    assert registry.load('alpha.pwm') is first
+
+    # New content is loaded again
+    registry.save_artifact(trained_models[1], poultry_data.data_processor, 'alpha')
+    reloaded = registry.load('alpha.pwm')
+    assert reloaded is not first
+    assert reloaded.arrays['coef'].shape != first.arrays['coef'].shape
+
+
+def test_missing_models(registry):
+    os.remove(registry.model_path('beta.pwm'))
+    assert 'beta.pwm' not in names(registry.list_models())
+    with pytest.raises(FileNotFoundError):
+        registry.load('beta.pwm')
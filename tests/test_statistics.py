@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.statistics import QuantileSketch, StreamingStatistics
+
+QUANTILES = np.linspace(0, 1, 101)
+
+
+def lower_quantiles(values, q):
+    """Exact quantiles as the sorted value at rank floor(q * (n - 1))."""
+    ordered = np.sort(values)
+    return ordered[np.floor(q * (len(values) - 1)).astype(int)]
+
+
+@pytest.mark.parametrize('alpha', [0.01, 0.05])
+@pytest.mark.parametrize('values', [
+    np.random.default_rng(0).lognormal(3, 1.5, 100_000),
+    np.random.default_rng(1).normal(0, 10, 50_000),
+    np.concatenate([np.zeros(500), np.random.default_rng(2).normal(1500, 300, 20_000)]),
+], ids=['lognormal', 'signed', 'zeros'])
+def test_sketch_quantiles_are_within_relative_accuracy(values, alpha):
+    estimates = QuantileSketch(alpha).update(values).quantile(QUANTILES)
+    exact = lower_quantiles(values, QUANTILES)
+    assert np.all(np.abs(estimates - exact) <= alpha * np.abs(exact) + 1e-12)
+
+
+def test_merged_sketches_equal_one_sketch():
+    values = np.random.default_rng(3).lognormal(5, 1, 30_000)
+    merged = QuantileSketch()
+    for part in np.array_split(values, 7):
+        merged.merge(QuantileSketch().update(part))
+    np.testing.assert_array_equal(merged.quantile(QUANTILES), QuantileSketch().update(values).quantile(QUANTILES))
+
+
+def test_sketch_ignores_missing_values_and_rejects_bad_input():
+    sketch = QuantileSketch().update([1.0, np.nan, np.inf, 3.0])
+    assert sketch.count == 2
+    assert np.isnan(QuantileSketch().quantile(0.5))
+    with pytest.raises(ValueError):
+        sketch.quantile(1.5)
+    with pytest.raises(ValueError):
+        sketch.merge(QuantileSketch(0.05))
+
+
+def test_streaming_statistics_match_pandas():
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({'a': rng.normal(30, 2, 10_000), 'b': rng.uniform(0, 8, 10_000)})
+    df.loc[::17, 'b'] = np.nan
+
+    statistics = StreamingStatistics(['a', 'b'])
+    for start in range(0, len(df), 1200):
+        statistics.update(df.iloc[start:start + 1200])
+    result = statistics.result()
+
+    for col in df.columns:
+        assert result[col]['mean'] == pytest.approx(df[col].mean(), rel=1e-12)
+        assert result[col]['std'] == pytest.approx(df[col].std(), rel=1e-10)
+        assert result[col]['min'] == df[col].min()
+        assert result[col]['max'] == df[col].max()
+        assert result[col]['median'] == pytest.approx(df[col].median(), rel=0.01)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from config.settings import DENSITY_BINS, HISTOGRAM_BINS, TARGET_COLUMN
+from synthetic import make_dataset
+from utils.visualizations import Visualizer
+
+
+@pytest.fixture(scope='module')
+def large_data():
+    df = make_dataset(200_000, seed=2)
+    df.loc[:9, 'Feed Intake'] = np.nan
+    df.loc[10, TARGET_COLUMN] = np.inf
+    return df
+
+
+def test_histogram_counts_every_finite_row(large_data):
+    bar = Visualizer.plot_feature_distribution(large_data, 'Feed Intake').data[0]
+
+    assert len(bar.y) == HISTOGRAM_BINS
+    assert np.sum(bar.y) == len(large_data) - 10
+    np.testing.assert_allclose(np.sum(bar.width), np.nanmax(large_data['Feed Intake'])
+                               - np.nanmin(large_data['Feed Intake']))
+
+
+def test_density_heatmap_counts_every_complete_row(large_data):
+    heatmap = Visualizer.plot_density_heatmap(large_data, 'Feed Intake', TARGET_COLUMN).data[0]
+    z = np.array(heatmap.z, dtype=np.float64)
+
+    assert z.shape == (DENSITY_BINS, DENSITY_BINS)
+    assert np.nansum(z) == len(large_data) - 11
+    # Empty cells are blank rather than zero
+    assert np.isnan(z).any() and not (z == 0).any()
+
+
+def test_empty_column_histogram():
+    df = make_dataset(10)
+    df['Feed Intake'] = np.nan
+    bar = Visualizer.plot_feature_distribution(df, 'Feed Intake').data[0]
+    assert len(bar.y) == 0
+
+
+@pytest.mark.parametrize('plot', [
+    lambda df: Visualizer.plot_feature_distribution(df, 'Feed Intake'),
+    lambda df: Visualizer.plot_density_heatmap(df, 'Feed Intake', TARGET_COLUMN),
+])
+def test_payload_does_not_grow_with_rows(large_data, plot):
+    small = len(plot(large_data.iloc[:1000]).to_json())
+    large = len(plot(large_data).to_json())
+    # Only bin counts grow, by a few digits each
+    assert large < 1.2 * small